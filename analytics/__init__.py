@@ -0,0 +1,2 @@
+# Pustaka analisis kualitas udara PRSA yang dipakai oleh dashboard.py,
+# benchmark.py dan skrip lain; modul di sini tidak bergantung pada Streamlit
@@ -0,0 +1,112 @@
+# Agregasi untuk grafik dan tabel dashboard
+#
+# Semua fungsi mengembalikan struktur data pandas (tanpa Streamlit/matplotlib)
+# sehingga bisa dipakai ulang oleh dashboard, benchmark maupun laporan batch.
+import numpy as np
+import pandas as pd
+
+YEARLY_POLLUTANTS = ['PM2.5', 'PM10', 'CO', 'NO2', 'SO2', 'O3']
+TEMPERATURE_POLLUTANTS = ['SO2', 'NO2', 'O3']
+
+
+def yearly_means(data_cube, columns=YEARLY_POLLUTANTS):
+    # rata-rata per tahun kalender, index berupa angka tahun
+    means = data_cube.mean('year', columns)
+    means.index = pd.Index(means.index.year, name='Tahun')
+    return means
+
+
+def daily_mean_ci(data_cube, column='PM2.5'):
+    # rata-rata harian dan setengah lebar interval kepercayaan 95%
+    return data_cube.mean('day', column), data_cube.ci('day', column)
+
+
+def daily_means(data_cube, columns=None):
+    return data_cube.mean('day', columns)
+
+
+def monthly_pattern(data_cube, column='RAIN'):
+    # rata-rata per bulan dalam setahun (1-12)
+    return data_cube.seasonal('month', column)
+
+
+def hourly_window(data_cube, start, end, columns=None):
+    # rata-rata per jam dalam [start, end]; biaya sebanding panjang jendela, bukan riwayat
+    return data_cube.window_mean('hour', start, end, columns)
+
+
+def last_period(data_cube, offset, columns=None):
+    # rata-rata per jam dalam rentang `offset` (pd.DateOffset) terakhir dari data
+    _, end = data_cube.time_range('hour')
+    return hourly_window(data_cube, end - offset, end, columns)
+
+
+class _SortedRun:
+    # potongan baris yang diurutkan menurut suhu beserta jumlah kumulatif dan
+    # hitungan nilai terisi per polutan; baris ke-k = k nilai dengan suhu terendah
+    def __init__(self, temps, values):
+        order = np.argsort(temps, kind='stable')
+        self.temps = temps[order]
+        self.values = values[order]
+        present = ~np.isnan(self.values)
+        cols = self.values.shape[1]
+        self.cum_sum = np.vstack([np.zeros(cols), np.cumsum(np.where(present, self.values, 0.0), axis=0, dtype='float64')])
+        self.cum_count = np.vstack([np.zeros(cols, dtype='int32'), np.cumsum(present, axis=0, dtype='int32')])
+
+    def __len__(self):
+        return len(self.temps)
+
+    def merge(self, other):
+        # argsort stabil (timsort) atas dua deret yang sudah terurut hampir linear
+        return _SortedRun(np.concatenate([self.temps, other.temps]), np.concatenate([self.values, other.values]))
+
+
+class TemperatureSplit:
+    # baris diurutkan menurut TEMP, lalu disimpan jumlah kumulatif dan hitungan
+    # nilai terisi per polutan. Rata-rata di bawah/di atas ambang mana pun
+    # didapat dari searchsorted (O(log n)), tanpa memfilter data. Baris baru
+    # menjadi run terurut tersendiri; run yang bersebelahan digabung saat
+    # ukurannya sebanding (seperti pencacah biner), sehingga update() sebanding
+    # dengan jumlah baris baru (teramortisasi) dan jumlah run tetap O(log n).
+    def __init__(self, data, columns=TEMPERATURE_POLLUTANTS, by='TEMP'):
+        self.columns = list(columns)
+        self.by = by
+        self._runs = []
+        self.update(data)
+
+    def update(self, rows, data=None):
+        # `data` (frame lengkap) tidak diperlukan: hanya baris baru yang diurutkan
+        temps = rows[self.by].to_numpy(dtype='float64')
+        valid = ~np.isnan(temps)
+        if not valid.any():
+            return self
+        # nilai disimpan float32 seperti di penyimpanan; jumlah kumulatif tetap float64
+        runs = self._runs + [_SortedRun(temps[valid], rows[self.columns].to_numpy(dtype='float32')[valid])]
+        while len(runs) > 1 and len(runs[-2]) <= len(runs[-1]):
+            last = runs.pop()
+            runs.append(runs.pop().merge(last))
+        # daftar run diganti sekaligus agar sweep() yang sedang berjalan tetap melihat versi utuh
+        self._runs = runs
+        return self
+
+    def sweep(self, thresholds):
+        # rata-rata TEMP <= ambang dan TEMP > ambang untuk banyak ambang sekaligus
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype='float64'))
+        size = (len(thresholds), len(self.columns))
+        low_sum, low_count = np.zeros(size), np.zeros(size, dtype='int64')
+        total_sum, total_count = np.zeros(len(self.columns)), np.zeros(len(self.columns), dtype='int64')
+        for run in self._runs:
+            k = np.searchsorted(run.temps, thresholds, side='right')
+            low_sum += run.cum_sum[k]
+            low_count += run.cum_count[k]
+            total_sum += run.cum_sum[-1]
+            total_count += run.cum_count[-1]
+        high_sum, high_count = total_sum - low_sum, total_count - low_count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            low = pd.DataFrame(low_sum / low_count, index=thresholds, columns=self.columns)
+            high = pd.DataFrame(high_sum / high_count, index=thresholds, columns=self.columns)
+        return low, high
+
+    def means(self, threshold):
+        low, high = self.sweep([threshold])
+        return low.iloc[0], high.iloc[0]
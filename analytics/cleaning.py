@@ -0,0 +1,77 @@
+# Tahap pembersihan data
+#
+# Forward fill dilakukan sekali per versi dataset. Frame bersih tidak menyimpan
+# kolom kalender (year/month/day/hour) maupun tanggal_jam karena semuanya sudah
+# ada di index waktu; kolom itu diturunkan dari index saat sebuah tampilan
+# memintanya. Tampilan numerik, arah angin (wd) dan per jam adalah proyeksi
+# kolom dari frame bersih yang sama (tanpa menyalin data); kolom turunan yang
+# sudah ada di frame (lihat with_derived) dipakai langsung.
+import pandas as pd
+
+# kolom kalender turunan index beserta tipe penyimpanannya (lihat storage.DTYPES)
+CALENDAR = {'year': 'int16', 'month': 'int8', 'day': 'int8', 'hour': 'int8'}
+DERIVED = list(CALENDAR) + ['tanggal_jam']
+
+
+def clean_dataset(df_Data):
+    df_Data = df_Data.drop(columns=[col for col in CALENDAR if col in df_Data.columns])
+    # forward fill per stasiun agar nilai satu stasiun tidak bocor ke stasiun lain
+    if 'station' in df_Data.columns and df_Data['station'].nunique() > 1:
+        data = df_Data.groupby('station', observed=True, sort=False).ffill()
+        data.insert(df_Data.columns.get_loc('station'), 'station', df_Data['station'])
+    else:
+        data = df_Data.ffill()
+    return data
+
+
+def derived_column(data, column):
+    # kolom kalender atau tanggal_jam dari index waktu (index sudah per jam, tanpa pd.to_datetime)
+    if column == 'tanggal_jam':
+        return pd.Series(data.index, index=data.index, name=column)
+    return pd.Series(getattr(data.index, column).to_numpy(dtype=CALENDAR[column]), index=data.index, name=column)
+
+
+def with_calendar(columns):
+    # urutan kolom seperti CSV asli: kolom kalender tepat setelah No
+    columns = [col for col in columns if col not in CALENDAR]
+    at = columns.index('No') + 1 if 'No' in columns else 0
+    return columns[:at] + list(CALENDAR) + columns[at:]
+
+
+def _project(data, columns):
+    # DataFrame dari Series dengan copy=False berbagi memori dengan frame sumber;
+    # kolom yang tidak disimpan diturunkan dari index
+    return pd.DataFrame({col: data[col] if col in data.columns else derived_column(data, col) for col in columns},
+                        copy=False)
+
+
+def with_derived(data):
+    # frame bersih beserta semua kolom turunan index, agar tampilan cukup memilih kolom
+    return _project(data, list(data.columns) + [col for col in DERIVED if col not in data.columns])
+
+
+def numeric_columns(data):
+    # dari dtypes saja; select_dtypes akan menyalin seluruh frame sementara
+    return [col for col, dtype in data.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+
+
+def numeric_view(data):
+    # pengganti cleaning_data: hanya kolom numerik
+    return _project(data, with_calendar(numeric_columns(data)))
+
+
+def wd_view(data):
+    # pengganti cleaning_data_wd: semua kolom asli termasuk wd dan station
+    return _project(data, with_calendar([col for col in data.columns if col != 'tanggal_jam']))
+
+
+def hourly_view(data):
+    # pengganti cleaning_data_hourly: kolom numerik + tanggal_jam
+    return _project(data, with_calendar(numeric_columns(data)) + ['tanggal_jam'])
+
+
+def clean_append(last_rows, new_rows):
+    # forward fill melintasi batas append: baris bersih terakhir tiap stasiun dipakai sebagai benih
+    seed = last_rows[[col for col in new_rows.columns if col not in CALENDAR]]
+    cleaned = clean_dataset(pd.concat([seed, new_rows]))
+    return cleaned.iloc[len(seed):]
@@ -0,0 +1,146 @@
+# Layanan clustering (StandardScaler + KMeans)
+#
+# Model dan label disimpan di cache per (fitur, k, metode, fingerprint data)
+# sehingga rerun dashboard tidak melatih ulang. Untuk data besar tersedia
+# MiniBatchKMeans dan mode streaming (partial_fit per potongan data).
+# scikit-learn baru diimpor saat model pertama kali dilatih. Cache dipakai
+# bersama semua sesi; sesi yang meminta kunci yang sedang dilatih menunggu
+# hasil yang sama alih-alih melatih ulang, sedangkan hit cache dan kunci lain
+# tidak menunggu pelatihan yang sedang berjalan.
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+FEATURES = ('TEMP', 'PRES', 'WSPM')
+METHODS = ('kmeans', 'minibatch')
+# di atas jumlah baris ini metode 'auto' memakai MiniBatchKMeans
+MINIBATCH_THRESHOLD = 200_000
+
+ClusterResult = namedtuple('ClusterResult', ['scaler', 'model', 'labels', 'inertia'])
+
+_CACHE_SIZE = 16
+_results = OrderedDict()
+_sweeps = OrderedDict()
+# _lock hanya menjaga dict cache; pelatihan diserialkan per kunci lewat _key_locks
+_lock = threading.Lock()
+_key_locks = {}
+
+
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+def _cached(cache, key, compute):
+    with _lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        key_lock = _key_locks.setdefault((id(cache), key), threading.Lock())
+    with key_lock:
+        # sesi yang menunggu kunci yang sama memakai hasil sesi pertama
+        with _lock:
+            if key in cache:
+                return cache[key]
+        try:
+            value = compute()
+            with _lock:
+                return _remember(cache, key, value)
+        finally:
+            with _lock:
+                _key_locks.pop((id(cache), key), None)
+
+
+def _make_model(method, k, random_state):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if method == 'minibatch':
+        return MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=4096, n_init=3)
+    return KMeans(n_clusters=k, random_state=random_state)
+
+
+def _feature_matrix(data, features):
+    X = data[list(features)].to_numpy(dtype='float64')
+    return X, np.isfinite(X).all(axis=1)
+
+
+def resolve_method(method, n_rows):
+    if method == 'auto':
+        return 'minibatch' if n_rows > MINIBATCH_THRESHOLD else 'kmeans'
+    if method not in METHODS:
+        raise ValueError(f'Metode clustering tidak dikenal: {method}')
+    return method
+
+
+def fit_clusters(data, fingerprint, features=FEATURES, k=3, method='auto', random_state=0):
+    # label baris yang fiturnya tidak lengkap bernilai -1; data masukan tidak diubah
+    method = resolve_method(method, len(data))
+    key = (tuple(features), k, method, random_state, fingerprint)
+
+    def compute():
+        from sklearn.preprocessing import StandardScaler
+
+        X, valid = _feature_matrix(data, features)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X[valid])
+        model = _make_model(method, k, random_state)
+        labels = np.full(len(X), -1, dtype='int16')
+        labels[valid] = model.fit_predict(X_scaled)
+        return ClusterResult(scaler, model, labels, float(model.inertia_))
+    return _cached(_results, key, compute)
+
+
+def fit_clusters_streaming(chunks, features=FEATURES, k=3, random_state=0):
+    # chunks: fungsi tanpa argumen yang menghasilkan iterator DataFrame (dipanggil dua kali);
+    # memori puncak sebesar satu potongan, bukan seluruh riwayat
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    for chunk in chunks():
+        X, valid = _feature_matrix(chunk, features)
+        if valid.any():
+            scaler.partial_fit(X[valid])
+
+    model = _make_model('minibatch', k, random_state)
+    for chunk in chunks():
+        X, valid = _feature_matrix(chunk, features)
+        if valid.sum() >= k:
+            model.partial_fit(scaler.transform(X[valid]))
+    return scaler, model
+
+
+def predict_clusters(scaler, model, data, features=FEATURES):
+    X, valid = _feature_matrix(data, features)
+    labels = np.full(len(X), -1, dtype='int16')
+    if valid.any():
+        labels[valid] = model.predict(scaler.transform(X[valid]))
+    return labels
+
+
+def sweep_k(data, fingerprint, features=FEATURES, ks=range(2, 9), sample_size=5000, random_state=0):
+    # inertia dan silhouette untuk beberapa k, dihitung pada sampel acak agar murah
+    key = (tuple(features), tuple(ks), sample_size, random_state, fingerprint)
+
+    def compute():
+        from sklearn.metrics import silhouette_score
+        from sklearn.preprocessing import StandardScaler
+
+        X, valid = _feature_matrix(data, features)
+        X = X[valid]
+        rng = np.random.default_rng(random_state)
+        if len(X) > sample_size:
+            X = X[rng.choice(len(X), sample_size, replace=False)]
+        X_scaled = StandardScaler().fit_transform(X)
+
+        rows = []
+        for k in ks:
+            model = _make_model('kmeans', k, random_state)
+            labels = model.fit_predict(X_scaled)
+            rows.append({'k': k, 'inertia': model.inertia_, 'silhouette': silhouette_score(X_scaled, labels)})
+        return pd.DataFrame(rows).set_index('k')
+    return _cached(_sweeps, key, compute)
@@ -0,0 +1,153 @@
+# Matriks korelasi antar variabel polutan dan cuaca
+#
+# CorrelationEngine menghitung matriks penuh polutan x cuaca sekali per
+# dataset untuk tiap (metode, pengelompokan) lalu menyimpannya; heatmap dan
+# pemilih variabel cukup mengambil irisan matriks tersebut tanpa memindai
+# data lagi. CorrelationStats mengakumulasi co-moment per potongan data
+# sehingga matriks korelasi Pearson bisa dihitung tanpa memuat seluruh
+# riwayat sekaligus; engine memakainya untuk Pearson sehingga baris baru
+# cukup ditambahkan ke co-moment (update). Spearman bergantung pada peringkat
+# seluruh data, jadi matriksnya dihitung ulang saat diminta sesudah update.
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics.storage import POLLUTANTS, WEATHER
+
+METHODS = ('pearson', 'spearman')
+GROUPINGS = (None, 'month', 'season')
+SEASONS = {'DJF': (12, 1, 2), 'MAM': (3, 4, 5), 'JJA': (6, 7, 8), 'SON': (9, 10, 11)}
+_MONTH_SEASON = {month: season for season, months in SEASONS.items() for month in months}
+
+
+def correlation_matrix(data, columns, method='pearson'):
+    return data[list(columns)].corr(method=method)
+
+
+def group_keys(index, by):
+    # kunci pengelompokan untuk DatetimeIndex: bulan (1-12) atau musim (DJF/MAM/JJA/SON)
+    if by == 'month':
+        return index.month
+    if by == 'season':
+        return index.month.map(_MONTH_SEASON)
+    raise ValueError(f'Pengelompokan tidak dikenal: {by}')
+
+
+class CorrelationEngine:
+    def __init__(self, data, columns=None):
+        self.columns = list(columns or [col for col in POLLUTANTS + WEATHER if col in data.columns])
+        self._data = data
+        self._matrices = {}
+        # pengelompokan -> {kelompok: CorrelationStats} untuk Pearson
+        self._stats = {}
+        # naik setiap update; hasil yang dihitung dari versi lama tidak disimpan
+        self.version = 0
+        # _lock hanya menjaga dict; perhitungan diserialkan per (metode, pengelompokan)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @staticmethod
+    def groups(by):
+        if by is None:
+            return [None]
+        if by == 'month':
+            return list(range(1, 13))
+        if by == 'season':
+            return list(SEASONS)
+        raise ValueError(f'Pengelompokan tidak dikenal: {by}')
+
+    def _parts(self, data, by):
+        values = data[self.columns]
+        if by is None:
+            return [(None, values)]
+        return list(values.groupby(group_keys(values.index, by)))
+
+    def _compute(self, method, by, data, stats):
+        if method == 'pearson':
+            stats = stats or {group: CorrelationStats(self.columns).update(part) for group, part in self._parts(data, by)}
+            matrices = {group: part.matrix() for group, part in stats.items()}
+        else:
+            matrices = {group: part.corr(method=method) for group, part in self._parts(data, by)}
+        return (matrices[None] if by is None else matrices), stats
+
+    def update(self, rows, data=None):
+        # baris baru: co-moment Pearson yang sudah ada ditambah baris tersebut saja; `data` =
+        # frame lengkap sesudah penambahan (untuk Spearman), bawaan: frame lama disambung baris baru
+        with self._lock:
+            self._data = pd.concat([self._data, rows]) if data is None else data
+            stats = {}
+            for by, groups in self._stats.items():
+                # salinan kecil (ukuran kolom x kolom) agar perhitungan yang sedang berjalan melihat versi utuh
+                groups = {group: copy.deepcopy(part) for group, part in groups.items()}
+                for group, part in self._parts(rows, by):
+                    groups.setdefault(group, CorrelationStats(self.columns)).update(part)
+                stats[by] = groups
+            self._stats = stats
+            self._matrices = {}
+            self.version += 1
+        return self
+
+    def matrix(self, method='pearson', by=None, group=None):
+        if method not in METHODS:
+            raise ValueError(f'Metode korelasi tidak dikenal: {method}')
+        if by not in GROUPINGS:
+            raise ValueError(f'Pengelompokan tidak dikenal: {by}')
+        key = (method, by)
+        # satu pemindaian per (metode, pengelompokan); sesi dengan kunci yang sama menunggu
+        # hasilnya, sedangkan kunci lain dan hit cache tidak ikut menunggu
+        matrices = self._matrices.get(key)
+        if matrices is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                matrices = self._matrices.get(key)
+                if matrices is None:
+                    with self._lock:
+                        version, data, stats = self.version, self._data, self._stats.get(by)
+                    matrices, stats = self._compute(method, by, data, stats)
+                    with self._lock:
+                        if version == self.version:
+                            self._matrices[key] = matrices
+                            if method == 'pearson':
+                                self._stats[by] = stats
+        return matrices if by is None else matrices[group]
+
+    def slice(self, columns, method='pearson', by=None, group=None):
+        columns = list(columns)
+        return self.matrix(method, by, group).loc[columns, columns]
+
+
+class CorrelationStats:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        # nilai digeser dengan rata-rata potongan pertama agar jumlah kuadrat tidak kehilangan presisi
+        self.shift = None
+        # [i, j] dihitung hanya pada baris di mana kolom i dan j sama-sama terisi (seperti DataFrame.corr)
+        self.n = np.zeros((size, size))
+        self.sum_x = np.zeros((size, size))
+        self.sum_xx = np.zeros((size, size))
+        self.sum_xy = np.zeros((size, size))
+
+    def update(self, data):
+        if self.shift is None:
+            self.shift = data[self.columns].mean().fillna(0).to_numpy(dtype='float64')
+        values = data[self.columns].to_numpy(dtype='float64') - self.shift
+        present = ~np.isnan(values)
+        mask = present.astype('float64')
+        values = np.where(present, values, 0.0)
+        self.n += mask.T @ mask
+        self.sum_x += values.T @ mask
+        self.sum_xx += (values * values).T @ mask
+        self.sum_xy += values.T @ values
+        return self
+
+    def matrix(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = np.where(self.n > 1, self.n, np.nan)
+            cov = self.sum_xy - self.sum_x * self.sum_x.T / n
+            var = self.sum_xx - self.sum_x ** 2 / n
+            corr = cov / np.sqrt(var * var.T)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
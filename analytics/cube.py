@@ -0,0 +1,203 @@
+# Kubus agregat multi-resolusi (jam/hari/bulan/tahun x kolom)
+#
+# Untuk setiap kolom polutan dan cuaca disimpan count, sum, sum of squares,
+# min dan max. Rata-rata, simpangan baku dan interval kepercayaan diturunkan
+# dari statistik tersebut, dan resolusi kasar dibentuk dari resolusi yang
+# lebih halus sehingga data mentah hanya dipindai sekali. Resolusi yang tidak
+# dibutuhkan (misal 'hour' pada mode streaming) boleh tidak disimpan.
+# Index tiap tabel selalu terurut dan unik per periode, sehingga rentang waktu
+# diambil dengan binary search (searchsorted) seharga ukuran jendelanya saja.
+# Tabel per jam (tabel terbesar, satu baris per jam) hanya dipakai untuk
+# rata-rata jendela waktu, sehingga hanya count dan sum yang disimpan, dalam
+# float32; resolusi lain tetap lengkap dalam float64. Setiap tabel disimpan
+# dalam array berkapasitas (frames.grow): saat append, periode yang sudah ada
+# digabung di tempat dan periode baru ditulis di ekor, tanpa menyalin tabel.
+import numpy as np
+import pandas as pd
+
+from analytics.frames import grow
+from analytics.storage import POLLUTANTS, WEATHER
+
+GRAINS = ('hour', 'day', 'month', 'year')
+STATS = ('count', 'sum', 'sumsq', 'min', 'max')
+
+_ROLLUP = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+# padanan _ROLLUP untuk dua nilai; fmin/fmax mengabaikan NaN seperti groupby
+_COMBINE = {'sum': np.add, 'min': np.fmin, 'max': np.fmax}
+# statistik dan tipe yang disimpan per resolusi (bawaan: semua STATS, float64)
+GRAIN_STATS = {'hour': ('count', 'sum')}
+GRAIN_DTYPES = {'hour': 'float32'}
+
+
+def grain_key(index, grain):
+    # kunci waktu (awal periode) untuk DatetimeIndex pada resolusi tertentu
+    if grain == 'hour':
+        return index.floor('h')
+    if grain == 'day':
+        return index.normalize()
+    if grain == 'month':
+        return index.to_period('M').to_timestamp()
+    if grain == 'year':
+        return index.to_period('Y').to_timestamp()
+    raise ValueError(f'Resolusi tidak dikenal: {grain}')
+
+
+def hourly_stats(data, columns):
+    # satu pemindaian data mentah -> statistik per jam
+    values = data[columns].astype('float64')
+    grouped = values.groupby(grain_key(values.index, 'hour'))
+    tables = {
+        'count': grouped.count().astype('float64'),
+        'sum': grouped.sum(),
+        'sumsq': (values ** 2).groupby(grain_key(values.index, 'hour')).sum(),
+        'min': grouped.min(),
+        'max': grouped.max(),
+    }
+    return pd.concat(tables, axis=1, names=['stat', 'kolom'])
+
+
+def rollup(stats, key):
+    # gabungkan statistik ke kunci yang lebih kasar tanpa menyentuh data mentah
+    parts = {stat: stats[stat].groupby(key).agg(_ROLLUP[stat]) for stat in STATS if stat in stats.columns.unique('stat')}
+    return pd.concat(parts, axis=1, names=['stat', 'kolom'])
+
+
+def _compact(table, grain):
+    # hanya statistik yang disimpan untuk resolusi ini, dengan tipe penyimpanannya
+    stats = GRAIN_STATS.get(grain, STATS)
+    if len(stats) < len(STATS):
+        table = table[[col for col in table.columns if col[0] in stats]]
+    return table.astype(GRAIN_DTYPES.get(grain, 'float64'), copy=False)
+
+
+class _TableBuffer:
+    # satu tabel kubus: array nilai (baris x kolom) dan array index berkapasitas lebih;
+    # `frame` adalah DataFrame tanpa salinan atas baris yang sudah terisi
+    def __init__(self, table):
+        self.columns = table.columns
+        self.index_name = table.index.name
+        self._load(table)
+
+    def _load(self, table):
+        self.values = table.to_numpy(copy=True)
+        self.index = table.index.to_numpy(copy=True)
+        self.size = len(table)
+        self._publish()
+
+    def _publish(self):
+        index = pd.Index(self.index[:self.size], name=self.index_name, copy=False)
+        self.frame = pd.DataFrame(self.values[:self.size], index=index, columns=self.columns, copy=False)
+
+    def merge(self, delta):
+        # periode yang sudah ada digabung statistiknya di tempat, periode baru ditambahkan di ekor
+        delta = delta[self.columns]
+        stamps = delta.index.to_numpy()
+        new_values = delta.to_numpy()
+        index = self.index[:self.size]
+        # index tabel terurut: posisi lewat binary search, tanpa tabel hash atas seluruh index
+        positions = np.searchsorted(index, stamps)
+        overlap = positions < self.size
+        overlap[overlap] = index[positions[overlap]] == stamps[overlap]
+        if overlap.any():
+            rows = positions[overlap]
+            stats = self.columns.get_level_values('stat')
+            for stat in stats.unique():
+                cols = np.flatnonzero(stats == stat)
+                self.values[np.ix_(rows, cols)] = _COMBINE[_ROLLUP[stat]](self.values[np.ix_(rows, cols)],
+                                                                          new_values[overlap][:, cols])
+        if overlap.all():
+            return
+        fresh = ~overlap
+        if self.size and stamps[fresh][0] < index[-1]:
+            # potongan dari stasiun lain bisa dimulai lebih awal dari periode terakhir tabel
+            self._load(pd.concat([self.frame, delta[fresh]]).sort_index())
+            return
+        n, k = self.size, int(fresh.sum())
+        self.values = grow(self.values, n + k)
+        self.index = grow(self.index, n + k)
+        self.values[n:n + k] = new_values[fresh]
+        self.index[n:n + k] = stamps[fresh]
+        self.size = n + k
+        self._publish()
+
+
+class AggregateCube:
+    def __init__(self, tables):
+        self._buffers = {grain: _TableBuffer(table) for grain, table in tables.items()}
+        self.tables = {grain: buffer.frame for grain, buffer in self._buffers.items()}
+
+    @classmethod
+    def from_frame(cls, data, columns=None, grains=GRAINS):
+        columns = columns or [col for col in POLLUTANTS + WEATHER if col in data.columns]
+        tables = {'hour': hourly_stats(data, columns)}
+        for finer, grain in zip(GRAINS, GRAINS[1:]):
+            finer_table = tables[finer]
+            tables[grain] = rollup(finer_table, grain_key(finer_table.index, grain))
+        # resolusi kasar dibentuk dari statistik per jam yang lengkap, baru kemudian diringkas
+        return cls({grain: _compact(tables[grain], grain) for grain in GRAINS if grain in grains})
+
+    def append(self, data):
+        # perbarui kubus hanya dengan baris baru: statistik per jam baris baru digabung ke
+        # tiap resolusi, sehingga biayanya sebanding dengan jumlah baris baru
+        delta = hourly_stats(data, self.columns)
+        for grain in GRAINS:
+            if grain != 'hour':
+                delta = rollup(delta, grain_key(delta.index, grain))
+            if grain in self._buffers:
+                self._buffers[grain].merge(_compact(delta, grain))
+                self.tables[grain] = self._buffers[grain].frame
+
+    @property
+    def columns(self):
+        return list(next(iter(self.tables.values()))['count'].columns)
+
+    def stat(self, grain, stat, columns=None):
+        table = self.tables[grain][stat]
+        table = table if columns is None else table[columns]
+        return table.astype('float64', copy=False)
+
+    def count(self, grain, columns=None):
+        return self.stat(grain, 'count', columns)
+
+    def mean(self, grain, columns=None):
+        count = self.count(grain, columns)
+        return self.stat(grain, 'sum', columns) / count.where(count > 0)
+
+    def time_range(self, grain='hour'):
+        index = self.tables[grain].index
+        return index[0], index[-1]
+
+    def window(self, grain, start=None, end=None):
+        # baris tabel dalam [start, end] (inklusif) lewat binary search pada index terurut
+        table = self.tables[grain]
+        lo = 0 if start is None else table.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(table) if end is None else table.index.searchsorted(pd.Timestamp(end), side='right')
+        return table.iloc[lo:hi]
+
+    def window_mean(self, grain, start=None, end=None, columns=None):
+        table = self.window(grain, start, end).astype('float64', copy=False)
+        count = table['count'] if columns is None else table['count'][columns]
+        total = table['sum'] if columns is None else table['sum'][columns]
+        return total / count.where(count > 0)
+
+    def std(self, grain, columns=None):
+        # simpangan baku sampel (ddof=1) dari sum dan sum of squares
+        count = self.count(grain, columns)
+        total = self.stat(grain, 'sum', columns)
+        var = (self.stat(grain, 'sumsq', columns) - total ** 2 / count.where(count > 0)) / (count - 1).where(count > 1)
+        return np.sqrt(var.clip(lower=0))
+
+    def ci(self, grain, columns=None, z=1.96):
+        # setengah lebar interval kepercayaan rata-rata (pendekatan normal)
+        return z * self.std(grain, columns) / np.sqrt(self.count(grain, columns))
+
+    def seasonal(self, by='month', columns=None):
+        # rata-rata per bulan dalam setahun (1-12) atau per jam dalam sehari (0-23)
+        if by not in ('month', 'hour'):
+            raise ValueError(f'Pola musiman tidak dikenal: {by}')
+        table = self.tables[by].astype('float64', copy=False)
+        key = getattr(table.index, by)
+        rolled = rollup(table, key)
+        count = rolled['count'] if columns is None else rolled['count'][columns]
+        total = rolled['sum'] if columns is None else rolled['sum'][columns]
+        return total / count.where(count > 0)
@@ -0,0 +1,100 @@
+# Downsampling deret waktu sebelum digambar
+#
+# Deret dikurangi menjadi sekitar satu titik per piksel lebar grafik dengan
+# tetap mempertahankan puncak dan lembah: Largest-Triangle-Three-Buckets (LTTB)
+# atau min/max per bucket. Fungsi *_indices mengembalikan posisi titik yang
+# dipilih agar deret pendamping (misal interval kepercayaan) bisa ikut dipilih.
+# Titik NaN di awal tiap celah data yang selebar minimal satu titik keluaran
+# ikut dipilih, sehingga garis tetap terputus di celah seperti grafik aslinya.
+import numpy as np
+
+# lebar grafik bawaan dalam piksel jika tidak diketahui
+DEFAULT_POINTS = 1500
+
+
+def pixel_budget(fig):
+    # jumlah titik = lebar figure dalam piksel
+    width_inch = fig.get_size_inches()[0]
+    return int(width_inch * fig.dpi)
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def lttb_indices(x, y, n_out):
+    x = _as_float(x)
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # titik pertama & terakhir selalu dipakai; sisanya dibagi ke n_out - 2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    selected = np.empty(n_out, dtype='int64')
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata bucket berikutnya)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    # posisi nilai minimum dan maksimum tiap bucket (2 titik per bucket), tanpa loop Python
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    bucket = (np.arange(n) * n_buckets) // n
+    order = np.lexsort((y, bucket))
+    boundaries = np.flatnonzero(np.diff(bucket[order])) + 1
+    first = np.concatenate(([0], boundaries))
+    last = np.concatenate((boundaries - 1, [n - 1]))
+    return np.unique(np.concatenate((order[first], order[last])))
+
+
+def gap_starts(missing, min_length=1):
+    # posisi awal tiap rangkaian nilai kosong yang panjangnya minimal min_length
+    edges = np.diff(np.concatenate([[0], missing.astype('int8'), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts[ends - starts >= min_length]
+
+
+def downsample_indices(series, n_out=DEFAULT_POINTS, method='lttb'):
+    # posisi (iloc) titik terpilih di antara nilai yang terisi, ditambah satu NaN per celah
+    # yang selebar minimal satu titik keluaran (celah yang lebih sempit tidak terlihat)
+    missing = series.isna().to_numpy()
+    valid = np.flatnonzero(~missing)
+    if method == 'lttb':
+        picked = lttb_indices(series.index.to_numpy()[valid], series.to_numpy()[valid], n_out)
+    elif method == 'minmax':
+        picked = minmax_indices(series.to_numpy()[valid], n_out)
+    else:
+        raise ValueError(f'Metode downsampling tidak dikenal: {method}')
+    gaps = gap_starts(missing, max(len(series) // max(n_out, 1), 1))
+    return np.union1d(valid[picked], gaps) if len(gaps) else valid[picked]
+
+
+def downsample(series, n_out=DEFAULT_POINTS, method='lttb'):
+    return series.iloc[downsample_indices(series, n_out, method)]
+
+
+def downsample_frame(frame, n_out=DEFAULT_POINTS):
+    # beberapa kolom sekaligus: gabungan titik min/max tiap kolom
+    if len(frame) <= n_out:
+        return frame
+    per_column = max(n_out // max(len(frame.columns), 1), 2)
+    picked = [downsample_indices(frame[col], per_column, 'minmax') for col in frame.columns]
+    return frame.iloc[np.unique(np.concatenate(picked))]
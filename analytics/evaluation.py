@@ -0,0 +1,180 @@
+# Evaluasi model prediksi PM2.5 dengan validasi silang deret waktu
+#
+# Setiap kombinasi (jenis model, hyperparameter) dievaluasi dengan
+# TimeSeriesSplit: model selalu dilatih pada data masa lalu dan diuji pada
+# periode sesudahnya, sehingga tidak ada kebocoran data masa depan. Semua
+# pasangan (konfigurasi, fold) dijalankan paralel di semua core lewat joblib,
+# hasil tiap fold disimpan di disk, dan ringkasannya berupa leaderboard
+# akurasi serta waktu latih/prediksi per model.
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from analytics import models
+from analytics.storage import CACHE_DIR
+
+EVAL_DIR = os.path.join(CACHE_DIR, 'evaluation')
+N_SPLITS = 5
+
+PARAM_GRID = {
+    'Linear Regression': [{}],
+    'Random Forest': [{'n_estimators': 100, 'max_depth': depth, 'min_samples_leaf': leaf}
+                      for depth in (10, None) for leaf in (1, 5)],
+    'HistGradientBoosting': [{'learning_rate': rate, 'max_leaf_nodes': leaves}
+                             for rate in (0.05, 0.1) for leaves in (15, 31)],
+}
+
+
+def params_label(params):
+    return ', '.join(f'{name}={value}' for name, value in sorted(params.items())) or '-'
+
+
+def fold_key(fingerprint, features, model_type, params, fold, n_splits, seed):
+    raw = f'{fingerprint}|{",".join(features)}|{model_type}|{params_label(params)}|{fold}/{n_splits}|{seed}'
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _fold_path(cache_dir, key):
+    return os.path.join(cache_dir, key + '.json')
+
+
+def _read_fold(cache_dir, key):
+    try:
+        with open(_fold_path(cache_dir, key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_fold(cache_dir, key, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = _fold_path(cache_dir, key) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(result, f)
+    os.replace(tmp_path, _fold_path(cache_dir, key))
+
+
+def evaluate_fold(X, y, train_idx, test_idx, model_type, params, seed=42):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+    # satu core per tugas; paralelisme ada di tingkat (konfigurasi, fold)
+    model = models.make_model(model_type, seed, n_jobs=1, **params)
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X[test_idx])
+    predict_s = time.perf_counter() - start
+    return {
+        'mse': float(mean_squared_error(y[test_idx], y_pred)),
+        'mae': float(mean_absolute_error(y[test_idx], y_pred)),
+        'fit_s': fit_s,
+        'predict_s': predict_s,
+        'n_train': int(len(train_idx)),
+        'n_test': int(len(test_idx)),
+    }
+
+
+def run_search(X, y, fingerprint, features, grid=PARAM_GRID, n_splits=N_SPLITS, seed=42,
+               n_jobs=-1, cache_dir=EVAL_DIR, progress=None):
+    # X, y harus berurutan waktu. -> DataFrame satu baris per (model, parameter, fold)
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import TimeSeriesSplit
+
+    folds = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    tasks, rows = [], []
+    for model_type, param_list in grid.items():
+        for params in param_list:
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                key = fold_key(fingerprint, features, model_type, params, fold, n_splits, seed)
+                row = {'model': model_type, 'params': params_label(params), 'fold': fold}
+                cached = _read_fold(cache_dir, key)
+                if cached is not None:
+                    rows.append({**row, **cached, 'cached': True})
+                else:
+                    tasks.append((key, row, model_type, params, train_idx, test_idx))
+
+    total = len(rows) + len(tasks)
+    if progress:
+        progress(len(rows) / total)
+    if tasks:
+        results = Parallel(n_jobs=n_jobs, return_as='generator')(
+            delayed(evaluate_fold)(X, y, train_idx, test_idx, model_type, params, seed)
+            for _, _, model_type, params, train_idx, test_idx in tasks)
+        for (key, row, *_), result in zip(tasks, results):
+            _write_fold(cache_dir, key, result)
+            rows.append({**row, **result, 'cached': False})
+            if progress:
+                progress(len(rows) / total)
+    return pd.DataFrame(rows).sort_values(['model', 'params', 'fold'], ignore_index=True)
+
+
+def leaderboard(fold_results):
+    # urut menurut MSE rata-rata; waktu prediksi dinyatakan per baris agar bisa dibandingkan
+    grouped = fold_results.assign(
+        predict_us_per_row=fold_results['predict_s'] / fold_results['n_test'] * 1e6,
+    ).groupby(['model', 'params'], sort=False)
+    board = grouped.agg(
+        mse=('mse', 'mean'), mse_std=('mse', 'std'), mae=('mae', 'mean'),
+        fit_s=('fit_s', 'mean'), predict_us_per_row=('predict_us_per_row', 'mean'),
+        folds=('fold', 'count'), cached=('cached', 'sum'),
+    )
+    board['rmse'] = np.sqrt(board['mse'])
+    board = board.sort_values('mse').reset_index()
+    board.index = pd.RangeIndex(1, len(board) + 1, name='peringkat')
+    return board[['model', 'params', 'rmse', 'mse', 'mse_std', 'mae', 'fit_s', 'predict_us_per_row', 'folds', 'cached']]
+
+
+class SearchJob:
+    def __init__(self, key):
+        self.key = key
+        self.progress = 0.0
+        self.error = None
+        self.result = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class EvaluationService:
+    # menjalankan pencarian di thread latar belakang (joblib memakai semua core);
+    # satu pekerjaan per kunci, hasil tetap tersimpan per fold di disk
+    def __init__(self, cache_dir=EVAL_DIR):
+        self.cache_dir = cache_dir
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-evaluation')
+
+    def job(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def submit(self, key, load_xy, fingerprint, features, grid=PARAM_GRID, n_splits=N_SPLITS):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and (not job.done or job.result is not None or job.error is not None):
+                return job
+            job = self._jobs[key] = SearchJob(key)
+
+        def run():
+            try:
+                def report(value):
+                    job.progress = value
+                X, y = load_xy()
+                folds = run_search(X, y, fingerprint, features, grid, n_splits,
+                                   cache_dir=self.cache_dir, progress=report)
+                job.result = (folds, leaderboard(folds))
+            except Exception as exc:
+                job.error = exc
+                raise
+
+        job.future = self._executor.submit(run)
+        return job
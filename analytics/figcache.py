@@ -0,0 +1,72 @@
+# Cache gambar grafik matplotlib yang sudah dirender
+#
+# Grafik yang hanya bergantung pada dataset disimpan sebagai bytes PNG/SVG
+# dengan kunci (id grafik, parameter, fingerprint data). Cache dibatasi total
+# ukuran bytes dan membuang entri yang paling lama tidak dipakai (LRU).
+# Dengan max_width, resolusi render dibatasi agar lebar gambar tidak melebihi
+# lebar tampilan, sehingga gambar dari cache bisa dikirim apa adanya.
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_width=None):
+        self.max_bytes = max_bytes
+        self.max_width = max_width
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def put(self, key, image):
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def render(self, chart_id, params, fingerprint, draw, fmt='png', dpi=200):
+        # draw() membuat dan mengembalikan Figure; hanya dipanggil jika gambar belum ada di cache
+        key = (chart_id, params, fingerprint, fmt, dpi)
+        image = self.get(key)
+        if image is not None:
+            return image
+        with self._lock:
+            self.misses += 1
+        fig = draw()
+        if self.max_width:
+            dpi = min(dpi, self.max_width / fig.get_size_inches()[0])
+        try:
+            image = figure_bytes(fig, fmt, dpi)
+        finally:
+            plt.close(fig)
+        self.put(key, image)
+        return image
+
+
+def figure_bytes(fig, fmt='png', dpi=200):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
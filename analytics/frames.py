@@ -0,0 +1,86 @@
+# Frame yang tumbuh di ekor tanpa menyalin riwayat
+#
+# Setiap kolom disimpan dalam array numpy berkapasitas lebih (kolom kategorikal
+# sebagai array kode), sehingga menambah k baris hanya menyalin k baris itu;
+# saat kapasitas habis array diperbesar GROWTH kali (teramortisasi O(baris
+# baru)). frame() membungkus awalan array yang sudah terisi sebagai DataFrame
+# tanpa menyalin. Baris yang sudah ada tidak pernah ditulis ulang, jadi frame
+# yang sudah diberikan ke pemakai tetap utuh sesudah extend().
+import numpy as np
+import pandas as pd
+
+# faktor pembesaran kapasitas; lebih kecil dari 2 agar cadangan memori untuk frame besar tetap kecil
+GROWTH = 1.25
+
+
+def grow(array, size):
+    # array dengan kapasitas minimal `size` baris; isi lama disalin hanya saat kapasitas habis
+    if size <= len(array):
+        return array
+    grown = np.empty((max(size, int(GROWTH * len(array))),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class FrameBuffer:
+    def __init__(self, data):
+        self.columns = list(data.columns)
+        self.dtypes = dict(data.dtypes)
+        self.index_name = data.index.name
+        self.size = 0
+        self._arrays = {col: np.empty(0, dtype=self._storage_dtype(dtype)) for col, dtype in self.dtypes.items()}
+        self._index = np.empty(0, dtype=data.index.dtype)
+        self._frames = {}
+        self.extend(data)
+
+    @staticmethod
+    def _storage_dtype(dtype):
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical([], dtype=dtype).codes.dtype
+        return dtype
+
+    def _codes(self, column, values):
+        # kode kategori baris baru; kategori yang belum dikenal ditambahkan di akhir sehingga kode lama tetap sah
+        dtype = self.dtypes[column]
+        if values.dtype != dtype:
+            seen = pd.Index(np.asarray(values.dropna().unique()))
+            extra = seen.difference(dtype.categories)
+            if len(extra):
+                dtype = pd.CategoricalDtype(dtype.categories.append(extra), ordered=dtype.ordered)
+                self.dtypes[column] = dtype
+                self._arrays[column] = self._arrays[column].astype(self._storage_dtype(dtype), copy=False)
+            values = values.astype(dtype)
+        return values.cat.codes.to_numpy()
+
+    def extend(self, data):
+        n, k = self.size, len(data)
+        if k == 0:
+            return self
+        for column in self.columns:
+            values = data[column]
+            if isinstance(self.dtypes[column], pd.CategoricalDtype):
+                values = self._codes(column, values)
+            else:
+                values = values.to_numpy(dtype=self.dtypes[column])
+            self._arrays[column] = grow(self._arrays[column], n + k)
+            self._arrays[column][n:n + k] = values
+        self._index = grow(self._index, n + k)
+        self._index[n:n + k] = data.index.to_numpy()
+        self.size = n + k
+        self._frames = {}
+        return self
+
+    def frame(self, columns=None):
+        # DataFrame atas `columns` (bawaan: semua kolom) yang berbagi memori dengan buffer; dibentuk sekali per ukuran
+        columns = tuple(self.columns if columns is None else columns)
+        if columns not in self._frames:
+            n = self.size
+            index = pd.Index(self._index[:n], name=self.index_name, copy=False)
+            self._frames[columns] = pd.DataFrame({col: self._column(col, n) for col in columns}, index=index, copy=False)
+        return self._frames[columns]
+
+    def _column(self, column, n):
+        dtype = self.dtypes[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(self._arrays[column][:n], dtype=dtype, validate=False)
+        return self._arrays[column][:n]
@@ -0,0 +1,86 @@
+# Prediksi PM2.5 batch tanpa Streamlit
+#
+# Predictor memuat artefak model yang disimpan ModelRegistry sekali, lalu
+# menerima batch baris fitur (TEMP/DEWP/WSPM, sesuai fitur saat dilatih)
+# sebagai array NumPy dan menjalankan inferensi tervektorisasi. Latensi tiap
+# batch dicatat untuk laporan p50/p99 dan throughput.
+import glob
+import os
+import time
+from collections import deque
+
+import joblib
+import numpy as np
+
+from analytics.models import MODEL_DIR
+
+
+def model_path(model, model_dir=MODEL_DIR):
+    # model boleh berupa path file .joblib atau kunci dari models.model_key
+    if os.path.exists(model):
+        return model
+    path = os.path.join(model_dir, model + '.joblib')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'Model tidak ditemukan: {model}')
+    return path
+
+
+def latest_model(model_dir=MODEL_DIR):
+    paths = glob.glob(os.path.join(model_dir, '*.joblib'))
+    if not paths:
+        raise FileNotFoundError(f'Belum ada model tersimpan di {model_dir}')
+    return max(paths, key=os.path.getmtime)
+
+
+class Predictor:
+    def __init__(self, model, features, model_type=None, history=10000):
+        self.model = model
+        self.features = list(features)
+        self.model_type = model_type
+        # batch kecil lebih cepat tanpa overhead thread pool joblib
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+        self._latencies = deque(maxlen=history)
+
+    @classmethod
+    def load(cls, model, features=None, model_dir=MODEL_DIR):
+        artifact = joblib.load(model_path(model, model_dir))
+        features = features or artifact.get('features')
+        if not features:
+            raise ValueError('Artefak model tidak menyimpan daftar fitur; berikan features secara eksplisit')
+        return cls(artifact['model'], features, artifact.get('model_type'))
+
+    def _matrix(self, X):
+        if hasattr(X, 'columns'):
+            X = X[self.features].to_numpy(dtype='float64')
+        X = np.ascontiguousarray(X, dtype='float64')
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.features):
+            raise ValueError(f'Jumlah kolom {X.shape[1]} tidak sesuai fitur model {self.features}')
+        return X
+
+    def predict(self, X):
+        # X: array (n, fitur) atau DataFrame dengan kolom fitur -> array (n,) estimasi PM2.5
+        X = self._matrix(X)
+        start = time.perf_counter()
+        y = self.model.predict(X)
+        self._latencies.append((time.perf_counter() - start, len(X)))
+        return y
+
+    def predict_batches(self, batches):
+        for X in batches:
+            yield self.predict(X)
+
+    def stats(self):
+        if not self._latencies:
+            return {'batches': 0, 'rows': 0}
+        seconds = np.array([latency for latency, _ in self._latencies])
+        rows = sum(n for _, n in self._latencies)
+        return {
+            'batches': len(seconds),
+            'rows': rows,
+            'p50_ms': float(np.percentile(seconds, 50) * 1e3),
+            'p99_ms': float(np.percentile(seconds, 99) * 1e3),
+            'rows_per_s': rows / seconds.sum() if seconds.sum() > 0 else float('inf'),
+        }
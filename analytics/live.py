@@ -0,0 +1,105 @@
+# Dataset yang dapat diperbarui secara inkremental
+#
+# Menyimpan frame bersih, kubus agregat, statistik cukup OLS per partisi,
+# akumulator mawar angin dan deret rata-rata bergerak untuk sekumpulan
+# stasiun. refresh() hanya membaca baris yang lebih baru dari high-water mark
+# tiap stasiun, melakukan forward fill melintasi batas, lalu memperbarui kubus
+# dengan baris baru tersebut saja. Frame bersih beserta kolom turunannya
+# disimpan dalam frames.FrameBuffer, sehingga baris baru ditulis di ekor tanpa
+# menyalin riwayat. Tampilan kolom (numerik, wd, per jam) adalah proyeksi
+# tanpa salinan atas buffer itu, dibentuk ulang per versi data; struktur
+# turunan (mesin korelasi, sebaran suhu) dibentuk sekali saat pertama diminta
+# lalu diperbarui dengan baris baru saja. Semuanya dipakai bersama oleh semua
+# pemakai dataset dan diperlakukan hanya-baca.
+import hashlib
+import threading
+
+import pandas as pd
+
+from analytics import aggregations, cleaning, correlation, frames, regression, rolling, storage, windrose
+from analytics.cube import AggregateCube
+
+# proyeksi kolom atas frame bersih beserta kolom turunannya (cleaning.with_derived)
+VIEWS = {
+    'numeric': cleaning.numeric_view,
+    'wd': cleaning.wd_view,
+    'hourly': cleaning.hourly_view,
+}
+# struktur turunan frame bersih; update(baris_baru, frame_lengkap) memperbaruinya di tempat
+STRUCTURES = {
+    'correlation': correlation.CorrelationEngine,
+    'temperature': aggregations.TemperatureSplit,
+}
+
+
+class LiveDataset:
+    def __init__(self, manifest, stations, fingerprint):
+        self.stations = list(stations)
+        self._base_fingerprint = fingerprint
+        self._lock = threading.Lock()
+
+        clean = cleaning.clean_dataset(storage.load_partitions(manifest, self.stations))
+        self._columns = list(clean.columns)
+        self._rows = frames.FrameBuffer(cleaning.with_derived(clean))
+        self.cube = AggregateCube.from_frame(clean)
+        self.ols = regression.partition_stats(clean)
+        self.wind = windrose.WindRose().update(clean)
+        self.rolling = rolling.RollingEngine().update(clean)
+        self.last_rows = None
+        self._views = {}
+        self._update_marks(clean)
+
+    def _update_marks(self, rows):
+        # baris bersih terakhir tiap stasiun = benih forward fill dan high-water mark
+        last = rows.groupby('station', observed=True).tail(1)
+        if self.last_rows is not None:
+            last = pd.concat([self.last_rows, last]).groupby('station', observed=True).tail(1)
+        self.last_rows = last
+        self.high_water_marks = {str(station): ts for ts, station in zip(self.last_rows.index, self.last_rows['station'])}
+
+    @property
+    def clean(self):
+        # frame bersih tanpa kolom turunan; berbagi memori dengan buffer
+        return self._rows.frame(self._columns)
+
+    def view(self, name):
+        # proyeksi kolom (dibentuk sekali per versi data) atau struktur turunan frame bersih
+        with self._lock:
+            if name not in self._views:
+                if name in STRUCTURES:
+                    self._views[name] = STRUCTURES[name](self.clean)
+                else:
+                    self._views[name] = VIEWS[name](self._rows.frame())
+            return self._views[name]
+
+    @property
+    def fingerprint(self):
+        marks = ';'.join(f'{station}={ts.isoformat()}' for station, ts in sorted(self.high_water_marks.items()))
+        return hashlib.sha1(f'{self._base_fingerprint}|{marks}'.encode()).hexdigest()
+
+    def append(self, rows):
+        # rows: baris mentah bertipe penyimpanan (lihat storage.type_rows)
+        with self._lock:
+            rows = rows[rows['station'].astype(str).isin(self.stations)]
+            limit = pd.DatetimeIndex(rows['station'].astype(str).map(self.high_water_marks))
+            rows = rows[rows.index > limit]
+            if rows.empty:
+                return 0
+            rows = rows.assign(station=rows['station'].astype(str).astype(self._rows.dtypes['station']))
+
+            new_clean = cleaning.clean_append(self.last_rows, rows)
+            self._rows.extend(cleaning.with_derived(new_clean))
+            # proyeksi lama dibuang (membentuknya lagi tidak menyalin data); struktur cukup diperbarui
+            self._views = {name: view.update(new_clean, self.clean)
+                           for name, view in self._views.items() if name in STRUCTURES}
+            self.cube.append(new_clean)
+            regression.merge_partition_stats(self.ols, regression.partition_stats(new_clean))
+            self.wind.update(new_clean)
+            self.rolling.update(new_clean)
+            self._update_marks(new_clean)
+            return len(new_clean)
+
+    def refresh(self, manifest):
+        # ambil baris tambahan yang sudah disimpan storage.append_rows sejak pembacaan terakhir
+        rows = storage.read_rows_since(manifest, self.high_water_marks)
+        return 0 if rows is None else self.append(rows)
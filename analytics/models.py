@@ -0,0 +1,232 @@
+# Registry model prediksi PM2.5
+#
+# Model yang sudah dilatih disimpan di disk (joblib) dengan kunci
+# (fitur, jenis model, ukuran uji, seed, fingerprint data). Pelatihan berjalan
+# di thread latar belakang dengan laporan progres, sehingga pemanggil tidak
+# pernah menunggu proses fit. scikit-learn baru diimpor saat dibutuhkan.
+# Data uji adalah bagian akhir deret waktu (tanpa pengacakan) agar model tidak
+# dilatih dengan data masa depan. Artefak hanya menyimpan metrik dan sampel
+# kecil data uji untuk grafik; registry membatasi artefak di memori (LRU
+# menurut ukuran) dan menghapus artefak di disk dari versi data yang lebih lama.
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+from analytics.storage import CACHE_DIR, atomic_path
+
+MODEL_DIR = os.path.join(CACHE_DIR, 'models')
+MODEL_TYPES = ('Linear Regression', 'Random Forest', 'HistGradientBoosting')
+# bagian dari kunci model; model lama dengan split acak tidak dipakai lagi
+SPLIT = 'chronological'
+# bagian dari kunci model; artefak lama yang menyimpan seluruh data uji tidak dipakai lagi
+ARTIFACT_FORMAT = 2
+TARGET = 'PM2.5'
+# jumlah titik data uji (berjarak sama) yang disimpan untuk grafik prediksi
+PLOT_SAMPLE = 2000
+# batas total artefak di memori, diperkirakan dari ukuran file joblib
+MAX_MEMORY_BYTES = 512 * 1024 * 1024
+
+# Random Forest dilatih bertahap (warm_start) agar progres bisa dilaporkan
+FOREST_TREES = 100
+FOREST_STEP = 10
+
+
+def model_key(features, model_type, test_size, seed, fingerprint):
+    raw = f'{",".join(features)}|{model_type}|{test_size:.4f}|{seed}|{SPLIT}|{ARTIFACT_FORMAT}|{fingerprint}'
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def make_model(model_type, seed=42, n_jobs=-1, **params):
+    if model_type == 'Linear Regression':
+        from sklearn.linear_model import LinearRegression
+        return LinearRegression(**params)
+    if model_type == 'Random Forest':
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(**{'n_estimators': FOREST_TREES, **params}, n_jobs=n_jobs, random_state=seed)
+    if model_type == 'HistGradientBoosting':
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        return HistGradientBoostingRegressor(**params, random_state=seed)
+    raise ValueError(f'Jenis model tidak dikenal: {model_type}')
+
+
+def train_model(X, y, model_type, test_size, seed=42, progress=None, features=None):
+    # latih pada bagian awal deret waktu dan uji pada `test_size` bagian terakhirnya;
+    # kembalikan artefak berisi model, MSE dan sampel hasil prediksi data uji
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, shuffle=False)
+    model = make_model(model_type, seed)
+    if model_type == 'Random Forest':
+        model.set_params(warm_start=True)
+        for n_trees in range(FOREST_STEP, FOREST_TREES + 1, FOREST_STEP):
+            model.set_params(n_estimators=n_trees)
+            model.fit(X_train, y_train)
+            if progress:
+                progress(n_trees / FOREST_TREES)
+        model.set_params(warm_start=False)
+    else:
+        model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    if progress:
+        progress(1.0)
+    sample = np.unique(np.linspace(0, len(y_test) - 1, min(PLOT_SAMPLE, len(y_test))).astype('int64'))
+    return {
+        'model': model,
+        'model_type': model_type,
+        'features': None if features is None else list(features),
+        'mse': float(mean_squared_error(y_test, y_pred)),
+        'n_test': len(y_test),
+        'X_sample': np.asarray(X_test)[sample].astype('float32'),
+        'y_sample': np.asarray(y_test)[sample].astype('float32'),
+        'y_pred_sample': y_pred[sample].astype('float32'),
+    }
+
+
+class TrainingJob:
+    def __init__(self, key):
+        self.key = key
+        self.progress = 0.0
+        self.error = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class ModelRegistry:
+    def __init__(self, model_dir=MODEL_DIR, max_workers=1, max_bytes=MAX_MEMORY_BYTES):
+        self.model_dir = model_dir
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-training')
+
+    def path(self, key):
+        return os.path.join(self.model_dir, key + '.joblib')
+
+    def _meta_path(self, key):
+        return os.path.join(self.model_dir, key + '.json')
+
+    def _remember(self, key, artifact, size):
+        # dipanggil dengan _lock; artefak terbaru selalu disimpan meski melebihi batas
+        self._forget(key)
+        self._models[key] = artifact
+        self._sizes[key] = size
+        self.size += size
+        while self.size > self.max_bytes and len(self._models) > 1:
+            old_key, _ = self._models.popitem(last=False)
+            self.size -= self._sizes.pop(old_key)
+
+    def _forget(self, key):
+        if self._models.pop(key, None) is not None:
+            self.size -= self._sizes.pop(key)
+
+    def get(self, key):
+        # dari memori, lalu dari disk; None jika belum pernah dilatih
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+        path = self.path(key)
+        try:
+            artifact = joblib.load(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._remember(key, artifact, size)
+        return artifact
+
+    def _save(self, key, artifact, group=None, version=None):
+        # direktori model dipakai bersama dashboard, report.py dan predict.py; file sementara unik
+        # mencegah dua proses yang menyimpan kunci sama saling menimpa sebelum rename
+        with atomic_path(self.path(key)) as tmp_path:
+            joblib.dump(artifact, tmp_path)
+        if group is not None:
+            with atomic_path(self._meta_path(key)) as tmp_path:
+                with open(tmp_path, 'w') as f:
+                    json.dump({'group': group, 'version': version}, f)
+            self.prune(group, version)
+        with self._lock:
+            self._remember(key, artifact, os.path.getsize(self.path(key)))
+
+    def prune(self, group, version):
+        # hapus artefak kelompok yang sama (misal pilihan stasiun yang sama) dari versi data
+        # yang lebih lama; versi harus bisa dibandingkan (misal waktu ISO baris terakhir)
+        for meta_path in glob.glob(os.path.join(self.model_dir, '*.json')):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get('group') != group or meta.get('version') is None or meta['version'] >= version:
+                continue
+            key = os.path.basename(meta_path)[:-len('.json')]
+            for path in (self.path(key), meta_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._forget(key)
+
+    def job(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def submit(self, key, load_xy, model_type, test_size, seed=42, features=None, group=None, version=None):
+        # jadwalkan pelatihan di latar belakang; load_xy() -> (X, y) juga dipanggil di thread itu.
+        # Pekerjaan dengan kunci yang sama tidak dijadwalkan dua kali. Pekerjaan yang gagal
+        # dikembalikan sekali (agar galatnya bisa ditampilkan) lalu dilepas, sehingga submit
+        # berikutnya mencoba lagi. Dengan group/version, artefak versi data yang lebih lama
+        # dalam kelompok yang sama dihapus setelah disimpan.
+        with self._lock:
+            if key in self._models:
+                return None
+            job = self._jobs.get(key)
+            if job is not None:
+                if job.error is not None:
+                    del self._jobs[key]
+                return job
+            job = self._jobs[key] = TrainingJob(key)
+
+        def run():
+            try:
+                def report(value):
+                    job.progress = value
+                X, y = load_xy()
+                artifact = train_model(X, y, model_type, test_size, seed, progress=report, features=features)
+                self._save(key, artifact, group, version)
+            except Exception as exc:
+                job.error = exc
+                raise
+            finally:
+                with self._lock:
+                    if job.error is None:
+                        self._jobs.pop(key, None)
+
+        job.future = self._executor.submit(run)
+        return job
+
+    def get_or_submit(self, key, load_xy, model_type, test_size, seed=42, features=None, group=None, version=None):
+        # (artefak, None) jika model sudah ada, (None, job) jika sedang/baru dijadwalkan dilatih
+        artifact = self.get(key)
+        if artifact is not None:
+            return artifact, None
+        job = self.submit(key, load_xy, model_type, test_size, seed, features, group, version)
+        if job is None:
+            # pelatihan baru saja selesai di antara get() dan submit()
+            return self.get(key), None
+        return None, job
@@ -0,0 +1,149 @@
+# Instrumentasi waktu per tahap komputasi
+#
+# Profiler mencatat tiap tahap (memuat data, pembersihan, komputasi tab,
+# render grafik): wall time, jumlah baris, selisih memori (RSS proses) dan
+# hit/miss cache. Profiler aktif disimpan per thread, sehingga fungsi yang
+# dibungkus stage()/profiled() cukup memanggil modul ini tanpa meneruskan
+# objek profiler; tanpa profiler aktif keduanya tidak melakukan apa pun.
+# Catatan bisa diekspor sebagai JSON lines.
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from analytics.storage import CACHE_DIR
+
+PROFILE_DIR = os.path.join(CACHE_DIR, 'profiling')
+
+_local = threading.local()
+
+
+def rss_mb():
+    # RSS proses saat ini; RSS bersifat per proses sehingga sesi lain yang berjalan
+    # bersamaan ikut terhitung. Tanpa /proc (non-Linux) dipakai psutil jika terpasang;
+    # selain itu None. ru_maxrss (resource) tidak dipakai karena itu RSS puncak, bukan
+    # RSS saat ini, sehingga selisihnya hampir selalu nol
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        return None
+
+
+class Profiler:
+    def __init__(self, run_id=None):
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.records = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name, rows=None, cached=False):
+        # record boleh dilengkapi di dalam blok, misal record['rows'] setelah data dimuat
+        record = {'run': self.run_id, 'stage': name, 'depth': len(self._stack), 'rows': rows,
+                  'cache': 'hit' if cached else None}
+        # disimpan saat tahap dimulai agar urutan catatan = urutan mulai (induk sebelum anak)
+        self.records.append(record)
+        self._stack.append(record)
+        mem_start = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['wall_ms'] = (time.perf_counter() - start) * 1e3
+            mem_end = rss_mb()
+            record['mem_delta_mb'] = None if mem_start is None or mem_end is None else mem_end - mem_start
+            self._stack.pop()
+
+    def miss(self):
+        # dipanggil dari badan fungsi ber-cache: badan itu hanya berjalan saat cache miss
+        for record in reversed(self._stack):
+            if record['cache'] is not None:
+                record['cache'] = 'miss'
+                return
+
+    def to_jsonl(self):
+        return ''.join(json.dumps(record) + '\n' for record in self.records)
+
+    def export(self, path=None):
+        path = path or os.path.join(PROFILE_DIR, 'stages.jsonl')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(self.to_jsonl())
+        return path
+
+
+def current():
+    return getattr(_local, 'profiler', None)
+
+
+@contextmanager
+def activate(profiler):
+    previous = current()
+    _local.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _local.profiler = previous
+
+
+@contextmanager
+def stage(name, rows=None, cached=False):
+    profiler = current()
+    if profiler is None:
+        yield {}
+        return
+    with profiler.stage(name, rows, cached) as record:
+        yield record
+
+
+def miss():
+    profiler = current()
+    if profiler is not None:
+        profiler.miss()
+
+
+def _rows(value):
+    shape = getattr(value, 'shape', None)
+    return int(shape[0]) if shape else None
+
+
+def profiled(fn=None, *, name=None, cached=False):
+    # dekorator: seluruh pemanggilan fungsi menjadi satu tahap; jumlah baris diambil
+    # dari argumen pertama yang berbentuk tabel/array
+    if fn is None:
+        return functools.partial(profiled, name=name, cached=cached)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if current() is None:
+            return fn(*args, **kwargs)
+        rows = next((_rows(arg) for arg in args if _rows(arg) is not None), None)
+        with stage(name or fn.__name__, rows, cached):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def capture(limit=40, sort='cumulative'):
+    # cProfile untuk satu blok; hasil[0] berisi ringkasan pstats setelah blok selesai
+    result = [None]
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield result
+    finally:
+        profile.disable()
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats(sort).print_stats(limit)
+        result[0] = out.getvalue()
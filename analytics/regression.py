@@ -0,0 +1,155 @@
+# Regresi linier (OLS) antara variabel cuaca dan PM2.5
+#
+# OLSStats menyimpan statistik cukup (XᵀX, Xᵀy, n, Σy, Σy²) untuk semua
+# kandidat fitur sekaligus. Koefisien, galat baku, interval kepercayaan dan
+# R² untuk subset fitur mana pun diturunkan dari sub-matriks Gram dalam
+# O(fitur²), tanpa memindai data lagi. Statistik disimpan per partisi
+# (stasiun, tahun) dan cukup dijumlahkan saat baris baru masuk.
+#
+# fit_ols (statsmodels) dipertahankan sebagai pembanding; statsmodels baru
+# diimpor saat fungsi itu dipanggil.
+import numpy as np
+import pandas as pd
+
+FEATURES = ['TEMP', 'PRES', 'DEWP', 'WSPM', 'RAIN']
+TARGET = 'PM2.5'
+
+
+def fit_ols(data, features=('TEMP',), target=TARGET):
+    import statsmodels.api as sm
+
+    X = sm.add_constant(data[list(features)])
+    return sm.OLS(data[target], X).fit()
+
+
+class OLSStats:
+    def __init__(self, features=FEATURES, target=TARGET):
+        self.features = list(features)
+        self.target = target
+        size = len(self.features) + 1
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros(size)
+        self.n = 0
+        self.sum_y = 0.0
+        self.sum_yy = 0.0
+
+    @property
+    def terms(self):
+        return ['const'] + self.features
+
+    def update(self, data):
+        # hanya baris dengan semua fitur dan target terisi (seperti missing='drop'),
+        # sehingga setiap subset fitur dihitung pada baris yang sama
+        values = data[self.features + [self.target]].to_numpy(dtype='float64')
+        values = values[~np.isnan(values).any(axis=1)]
+        X = np.column_stack([np.ones(len(values)), values[:, :-1]])
+        y = values[:, -1]
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.n += len(y)
+        self.sum_y += y.sum()
+        self.sum_yy += y @ y
+        return self
+
+    def merge(self, other):
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.n += other.n
+        self.sum_y += other.sum_y
+        self.sum_yy += other.sum_yy
+        return self
+
+    def coefficients(self, features=None):
+        return self.fit(features).params
+
+    def fit(self, features=None):
+        features = self.features if features is None else list(features)
+        unknown = [feature for feature in features if feature not in self.features]
+        if unknown:
+            raise KeyError(f'Fitur tidak ada di statistik OLS: {unknown}')
+        idx = [0] + [self.terms.index(feature) for feature in features]
+        return OLSFit(self.xtx[np.ix_(idx, idx)], self.xty[idx], self.n, self.sum_y, self.sum_yy,
+                      ['const'] + features, self.target)
+
+
+class OLSFit:
+    def __init__(self, xtx, xty, n, sum_y, sum_yy, terms, target):
+        import scipy.stats
+
+        self.terms = terms
+        self.target = target
+        self.nobs = n
+        self.df_resid = n - len(terms)
+        if self.df_resid <= 0:
+            raise ValueError(f'Observasi tidak cukup untuk {len(terms)} parameter: {n}')
+
+        xtx_inv = np.linalg.inv(xtx)
+        beta = xtx_inv @ xty
+        # RSS = Σy² - βᵀXᵀy, TSS = Σy² - (Σy)²/n
+        ssr = max(sum_yy - beta @ xty, 0.0)
+        centered_tss = sum_yy - sum_y ** 2 / n
+        self.ssr = ssr
+        self.scale = ssr / self.df_resid
+        self.rsquared = 1 - ssr / centered_tss
+        self.rsquared_adj = 1 - (1 - self.rsquared) * (n - 1) / self.df_resid
+
+        bse = np.sqrt(np.diag(xtx_inv) * self.scale)
+        self.params = pd.Series(beta, index=terms)
+        self.bse = pd.Series(bse, index=terms)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * scipy.stats.t.sf(np.abs(self.tvalues), self.df_resid), index=terms)
+        self._t_dist = scipy.stats.t(self.df_resid)
+
+    def conf_int(self, alpha=0.05):
+        half = self._t_dist.ppf(1 - alpha / 2) * self.bse
+        return pd.DataFrame({'lower': self.params - half, 'upper': self.params + half})
+
+    def predict(self, data):
+        features = self.terms[1:]
+        return self.params['const'] + data[features].to_numpy(dtype='float64') @ self.params[features].to_numpy()
+
+    def table(self, alpha=0.05):
+        ci = self.conf_int(alpha)
+        return pd.DataFrame({
+            'coef': self.params, 'std err': self.bse, 't': self.tvalues, 'P>|t|': self.pvalues,
+            f'[{alpha / 2:g}': ci['lower'], f'{1 - alpha / 2:g}]': ci['upper'],
+        })
+
+    def summary(self, alpha=0.05):
+        header = [
+            'OLS Regression Results',
+            f'Dep. Variable:    {self.target:<16} R-squared:       {self.rsquared:.3f}',
+            f'No. Observations: {self.nobs:<16} Adj. R-squared:  {self.rsquared_adj:.3f}',
+            f'Df Residuals:     {self.df_resid:<16} Df Model:        {len(self.terms) - 1}',
+            f'Residual SE:      {np.sqrt(self.scale):<16.3f}',
+            '',
+        ]
+        return '\n'.join(header) + self.table(alpha).to_string(float_format=lambda x: f'{x:.4f}')
+
+
+def partition_stats(data, features=FEATURES, target=TARGET):
+    # statistik cukup per partisi (stasiun, tahun)
+    if 'station' in data.columns:
+        groups = data.groupby([data['station'].astype(str), data.index.year], observed=True, sort=False)
+    else:
+        # dikelompokkan per tahun saja (kunci skalar); stasiun dicatat sebagai None
+        groups = (((None, year), part) for year, part in data.groupby(data.index.year, sort=False))
+    return {(station, int(year)): OLSStats(features, target).update(part) for (station, year), part in groups}
+
+
+def merge_partition_stats(stats, new_stats):
+    # tambahkan statistik baris baru ke partisi yang sesuai (in place)
+    for key, part in new_stats.items():
+        if key in stats:
+            stats[key].merge(part)
+        else:
+            stats[key] = part
+    return stats
+
+
+def combine(stats, years=None, features=FEATURES, target=TARGET):
+    total = OLSStats(features, target)
+    for (_, year), part in stats.items():
+        if years is None or year in years:
+            total.merge(part)
+    return total
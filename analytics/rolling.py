@@ -0,0 +1,215 @@
+# Rata-rata bergerak dan pelampauan baku mutu (PM2.5 24 jam, O3 8 jam)
+#
+# Deret per jam tiap polutan (rata-rata semua stasiun pada jam itu) disimpan
+# pada grid jam yang teratur beserta jumlah kumulatifnya (prefix sum), sehingga
+# rata-rata jendela mana pun adalah selisih dua prefix sum: satu operasi
+# vektor untuk seluruh deret, tanpa rolling() pandas. Deret turunan (rata-rata
+# bergerak dan maksimum hariannya) di-cache per polutan. Baris baru hanya
+# mengubah jam yang disentuhnya dan jam sesudahnya, jadi saat append hanya
+# bagian ekor tersebut yang dihitung ulang (sebanding dengan jumlah baris
+# baru). Jam/hari di atas ambang, kategori AQI dan episode pelampauan dihitung
+# tervektorisasi dari deret yang sudah di-cache; ukurannya sebanding jumlah
+# jam, bukan jumlah baris data.
+import threading
+
+import numpy as np
+import pandas as pd
+
+HOUR = pd.Timedelta(hours=1)
+# panjang jendela rata-rata bergerak (jam) per polutan sesuai baku mutunya
+WINDOWS = {'PM2.5': 24, 'PM10': 24, 'O3': 8}
+# jendela dianggap sah jika minimal 75% jamnya berdata (18 dari 24, 6 dari 8)
+MIN_COVERAGE = 0.75
+# ambang (µg/m³) untuk metrik di atas: GB 3095-2012 kelas II dan pedoman WHO 2021
+STANDARDS = {
+    'GB 3095-2012': {'PM2.5': 75.0, 'PM10': 150.0, 'O3': 160.0},
+    'WHO 2021': {'PM2.5': 15.0, 'PM10': 45.0, 'O3': 100.0},
+}
+# batas atas tiap kategori AQI (HJ 633-2012) untuk metrik yang sama; kategori terakhir terbuka
+AQI_EDGES = {
+    'PM2.5': (35.0, 75.0, 115.0, 150.0, 250.0),
+    'PM10': (50.0, 150.0, 250.0, 350.0, 420.0),
+    'O3': (100.0, 160.0, 215.0, 265.0, 800.0),
+}
+AQI_CATEGORIES = ('Sangat baik', 'Baik', 'Tercemar ringan', 'Tercemar sedang', 'Tercemar berat', 'Tercemar parah')
+
+
+def min_hours(window):
+    return int(np.ceil(MIN_COVERAGE * window))
+
+
+def _grow(array, size):
+    # kapasitas dilipatduakan agar penambahan jam di ekor teramortisasi O(jam baru)
+    if size <= len(array):
+        return array
+    grown = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def episodes(series, threshold):
+    # rangkaian periode berturut-turut dengan nilai > threshold; NaN memutus rangkaian
+    values = series.to_numpy(dtype='float64')
+    above = values > threshold
+    edges = np.diff(np.concatenate([[0], above.astype('int8'), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # maksimum per rangkaian: nilai di luar rangkaian dibuat -inf lalu reduceat dari tiap awal rangkaian
+    peaks = np.maximum.reduceat(np.where(above, values, -np.inf), starts) if len(starts) else np.empty(0)
+    return pd.DataFrame({'start': series.index[starts], 'end': series.index[ends - 1],
+                         'length': ends - starts, 'peak': peaks})
+
+
+class RollingEngine:
+    def __init__(self, columns=tuple(WINDOWS)):
+        self.columns = list(columns)
+        self.start = None
+        self.size = 0
+        self.version = 0
+        cols = len(self.columns)
+        self._sum = np.zeros((0, cols))
+        self._count = np.zeros((0, cols), dtype='int32')
+        # baris ke-k = jumlah rata-rata per jam dan jumlah jam berdata pada k jam pertama
+        self._cum_mean = np.zeros((1, cols))
+        self._cum_hours = np.zeros((1, cols), dtype='int32')
+        # (jenis, kolom, jendela) -> [array, jumlah posisi yang masih sah]
+        self._series = {}
+        self._summaries = {}
+        self._index = None
+        self._lock = threading.RLock()
+
+    def update(self, data):
+        # akumulasikan baris (index DatetimeIndex) ke jam masing-masing
+        if data.empty:
+            return self
+        hours = data.index.floor('h')
+        with self._lock:
+            first = hours.min()
+            if self.start is None:
+                self.start = first
+            elif first < self.start:
+                self._shift((self.start - first) // HOUR)
+            pos = np.asarray((hours - self.start) // HOUR, dtype='int64')
+            lo, hi = int(pos.min()), int(pos.max()) + 1
+            old_size = self.size
+            self._resize(max(hi, self.size))
+
+            pos -= lo
+            for j, column in enumerate(self.columns):
+                values = data[column].to_numpy(dtype='float64')
+                present = ~np.isnan(values)
+                self._sum[lo:hi, j] += np.bincount(pos[present], weights=values[present], minlength=hi - lo)
+                self._count[lo:hi, j] += np.bincount(pos[present], minlength=hi - lo).astype('int32')
+            # jam kosong di antara ekor lama dan baris baru juga perlu prefix sum
+            self._refresh(min(lo, old_size))
+        return self
+
+    def _resize(self, size):
+        self._sum = _grow(self._sum, size)
+        self._count = _grow(self._count, size)
+        self._cum_mean = _grow(self._cum_mean, size + 1)
+        self._cum_hours = _grow(self._cum_hours, size + 1)
+        self.size = size
+
+    def _shift(self, hours):
+        # baris lebih awal dari awal grid (potongan stasiun lain); grid digeser, cache dibuang
+        self._sum = np.concatenate([np.zeros((hours, len(self.columns))), self._sum[:self.size]])
+        self._count = np.concatenate([np.zeros((hours, len(self.columns)), dtype='int32'), self._count[:self.size]])
+        self._cum_mean = np.zeros((1, len(self.columns)))
+        self._cum_hours = np.zeros((1, len(self.columns)), dtype='int32')
+        self.start -= hours * HOUR
+        self._resize(self.size + hours)
+        self._series = {}
+        self._refresh(0)
+
+    def _refresh(self, lo):
+        # prefix sum dihitung ulang dari jam `lo`; deret turunan sebelum `lo` tetap sah
+        n = self.size
+        count = self._count[lo:n]
+        hourly = np.divide(self._sum[lo:n], count, out=np.zeros(count.shape), where=count > 0)
+        self._cum_mean[lo + 1:n + 1] = self._cum_mean[lo] + np.cumsum(hourly, axis=0)
+        self._cum_hours[lo + 1:n + 1] = self._cum_hours[lo] + np.cumsum(count > 0, axis=0, dtype='int32')
+        for key, entry in self._series.items():
+            entry[1] = min(entry[1], lo if key[0] == 'mean' else self._day(lo))
+        self._summaries = {}
+        self._index = None
+        self.version += 1
+
+    def _day(self, position):
+        # posisi hari kalender dari posisi jam pada grid
+        return (position + self.start.hour) // 24
+
+    def index(self):
+        with self._lock:
+            if self._index is None:
+                self._index = pd.date_range(self.start, periods=self.size, freq='h')
+            return self._index
+
+    def hourly(self, column):
+        # rata-rata per jam semua stasiun; NaN pada jam tanpa data
+        with self._lock:
+            j = self.columns.index(column)
+            count = self._count[:self.size, j]
+            values = np.divide(self._sum[:self.size, j], count, out=np.full(self.size, np.nan), where=count > 0)
+            return pd.Series(values, index=self.index(), name=column)
+
+    def _mean_array(self, column, window):
+        key = ('mean', column, window)
+        array, valid = self._series.get(key, (np.empty(0), 0))
+        if valid < self.size:
+            n, j = self.size, self.columns.index(column)
+            array = _grow(array, n)
+            end = np.arange(valid + 1, n + 1)
+            begin = np.maximum(end - window, 0)
+            total = self._cum_mean[end, j] - self._cum_mean[begin, j]
+            hours = self._cum_hours[end, j] - self._cum_hours[begin, j]
+            array[valid:n] = np.where(hours >= min_hours(window), total / np.maximum(hours, 1), np.nan)
+            self._series[key] = [array, n]
+        return array[:self.size]
+
+    def mean(self, column, window=None):
+        # rata-rata bergerak `window` jam yang berakhir pada tiap jam (bawaan: WINDOWS)
+        window = window or WINDOWS[column]
+        with self._lock:
+            return pd.Series(self._mean_array(column, window).copy(), index=self.index(), name=column)
+
+    def daily_max(self, column, window=None):
+        # maksimum harian rata-rata bergerak (untuk O3: rata-rata 8 jam maksimum harian)
+        window = window or WINDOWS[column]
+        with self._lock:
+            means = self._mean_array(column, window)
+            key = ('daily_max', column, window)
+            days = self._day(self.size - 1) + 1
+            array, valid = self._series.get(key, (np.empty(0), 0))
+            if valid < days:
+                array = _grow(array, days)
+                first = max(valid * 24 - self.start.hour, 0)
+                day = self._day(np.arange(first, self.size))
+                bounds = np.flatnonzero(np.diff(day, prepend=-1))
+                # fmax mengabaikan NaN; hari tanpa jendela sah tetap NaN
+                array[valid:days] = np.fmax.reduceat(means[first:], bounds)
+                self._series[key] = [array, days]
+            index = pd.date_range(self.start.normalize(), periods=days, freq='D')
+            return pd.Series(array[:days].copy(), index=index, name=column)
+
+    def category_hours(self, column):
+        # jumlah jam per kategori AQI menurut rata-rata bergerak polutan
+        values = self.mean(column).dropna().to_numpy()
+        codes = np.searchsorted(AQI_EDGES[column], values, side='left')
+        return pd.Series(np.bincount(codes, minlength=len(AQI_CATEGORIES)), index=AQI_CATEGORIES, name=column)
+
+    def summary(self, column, threshold):
+        # ringkasan pelampauan satu polutan; di-cache sampai ada baris baru
+        key = (column, float(threshold))
+        with self._lock:
+            if key not in self._summaries:
+                means = self.mean(column)
+                found = episodes(means, threshold)
+                self._summaries[key] = {
+                    'hours': int(found['length'].sum()),
+                    'days': int((self.daily_max(column) > threshold).sum()),
+                    'valid_hours': int(means.notna().sum()),
+                    'episodes': found,
+                    'categories': self.category_hours(column),
+                }
+            return self._summaries[key]
@@ -0,0 +1,350 @@
+# Penyimpanan kolumnar (Feather) untuk dataset PRSA
+#
+# Setiap CSV stasiun dikonversi sekali menjadi partisi Feather tanpa kompresi
+# per (stasiun, tahun) dengan tipe data yang ringkas, lalu dibaca
+# memory-mapped. Partisi sebuah CSV hanya dibangun ulang jika hash file
+# sumbernya berubah; beberapa CSV dikonversi paralel di process pool.
+#
+# Baris baru dari sensor ditambahkan lewat append_rows ke pohon partisi
+# terpisah (appended/), sehingga tidak hilang saat partisi CSV dibangun ulang.
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CSV = os.path.join(BASE_DIR, 'PRSA_Data_Aotizhongxin_20130301-20170228.csv')
+DEFAULT_SOURCE = os.path.join(BASE_DIR, 'PRSA_Data_*.csv')
+CACHE_DIR = os.path.join(BASE_DIR, '.cache')
+
+# naikkan jika skema/tipe data penyimpanan berubah agar cache lama dibuang
+SCHEMA_VERSION = 2
+
+POLLUTANTS = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
+WEATHER = ['TEMP', 'PRES', 'DEWP', 'RAIN', 'WSPM']
+
+# 16 arah mata angin; kategori tetap agar partisi dapat digabung tanpa jadi object
+WIND_DIRECTIONS = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                   'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
+
+DTYPES = {
+    'No': 'int32',
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'hour': 'int8',
+    **{col: 'float32' for col in POLLUTANTS + WEATHER},
+    'wd': pd.CategoricalDtype(WIND_DIRECTIONS),
+    'station': 'category',
+}
+
+# nama index waktu; sengaja berbeda dari kolom turunan 'tanggal_jam' (lihat cleaning.derived_column)
+TIME_INDEX = 'waktu'
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+_fingerprints = {}
+
+
+def source_fingerprint(path):
+    # hash file di-memo per (path, mtime, ukuran) agar rerun tidak membaca ulang file
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _fingerprints:
+        _fingerprints[key] = file_fingerprint(path)
+    return _fingerprints[key]
+
+
+def discover_sources(source=DEFAULT_SOURCE):
+    # source boleh berupa satu file CSV, direktori berisi PRSA_Data_*.csv, atau pola glob
+    if os.path.isdir(source):
+        source = os.path.join(source, 'PRSA_Data_*.csv')
+    paths = sorted(glob.glob(source))
+    if not paths:
+        raise FileNotFoundError(f'Tidak ada file CSV PRSA untuk: {source}')
+    return paths
+
+
+def type_rows(df):
+    # samakan tipe data dan index waktu baris mentah dengan skema penyimpanan
+    df = df.astype({col: dtype for col, dtype in DTYPES.items() if col in df.columns})
+    df.index = pd.DatetimeIndex(pd.to_datetime(df[['year', 'month', 'day', 'hour']]), name=TIME_INDEX)
+    return df
+
+
+def read_csv_typed(csv_path):
+    return type_rows(pd.read_csv(csv_path, dtype=DTYPES))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _meta_path(csv_path, cache_dir):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, 'meta', name + '.json')
+
+
+def partition_path(cache_dir, station, year):
+    return os.path.join(cache_dir, f'station={station}', f'year={year}.feather')
+
+
+def _append_dir(cache_dir):
+    return os.path.join(cache_dir, 'appended')
+
+
+@contextmanager
+def atomic_path(path):
+    # ditulis ke file sementara lalu di-rename agar pembaca tidak melihat file setengah jadi;
+    # nama sementara unik sehingga penulis bersamaan (misal dua sesi yang memulai dari cache
+    # kosong) tidak saling menimpa, dan yang terakhir selesai menang dengan file yang utuh
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_json(data, path):
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+
+
+def _write_feather(df, path):
+    with atomic_path(path) as tmp_path:
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=True), tmp_path, compression='uncompressed')
+
+
+def build_partitions(csv_path, cache_dir=CACHE_DIR, fingerprint=None):
+    # konversi satu CSV stasiun -> satu file Feather per (stasiun, tahun)
+    fingerprint = fingerprint or file_fingerprint(csv_path)
+    df = read_csv_typed(csv_path)
+
+    partitions = {}
+    for (station, year), part in df.groupby([df['station'].astype(str), df.index.year], sort=True):
+        path = partition_path(cache_dir, station, year)
+        _write_feather(part, path)
+        partitions.setdefault(station, {})[str(year)] = os.path.relpath(path, cache_dir)
+
+    _write_json({'source': os.path.basename(csv_path), 'sha1': fingerprint,
+                 'schema': SCHEMA_VERSION, 'rows': len(df), 'partitions': partitions},
+                _meta_path(csv_path, cache_dir))
+    return partitions
+
+
+def _is_current(meta, cache_dir, fingerprint):
+    if meta is None or meta.get('sha1') != fingerprint or meta.get('schema') != SCHEMA_VERSION:
+        return False
+    return all(os.path.exists(os.path.join(cache_dir, path))
+               for years in meta['partitions'].values() for path in years.values())
+
+
+def ensure_partitions(source=DEFAULT_SOURCE, cache_dir=CACHE_DIR, max_workers=None):
+    # kembalikan manifest {stasiun: {tahun: [path]}} dan fingerprint gabungan semua sumber
+    # (termasuk baris tambahan); CSV yang berubah dikonversi ulang paralel (satu proses per file)
+    paths = discover_sources(source)
+    fingerprints = {path: source_fingerprint(path) for path in paths}
+    metas = {path: _read_meta(_meta_path(path, cache_dir)) for path in paths}
+    stale = [path for path in paths if not _is_current(metas[path], cache_dir, fingerprints[path])]
+
+    if len(stale) == 1:
+        metas[stale[0]] = {'partitions': build_partitions(stale[0], cache_dir, fingerprints[stale[0]])}
+    elif stale:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            built = pool.map(build_partitions, stale, [cache_dir] * len(stale),
+                             [fingerprints[path] for path in stale])
+            for path, partitions in zip(stale, built):
+                metas[path] = {'partitions': partitions}
+
+    manifest = {}
+    for path in paths:
+        for station, years in metas[path]['partitions'].items():
+            for year, rel_path in years.items():
+                manifest.setdefault(station, {})[int(year)] = [os.path.join(cache_dir, rel_path)]
+
+    appended = _read_meta(os.path.join(_append_dir(cache_dir), 'meta.json')) or {}
+    if stale and appended:
+        appended = _prune_appended(manifest, cache_dir, appended)
+    for station, info in sorted(appended.items()):
+        if station in manifest:
+            for year, rel_path in info['partitions'].items():
+                manifest[station].setdefault(int(year), []).append(os.path.join(cache_dir, rel_path))
+
+    sha = hashlib.sha1(sources_fingerprint(paths).encode())
+    for station, info in sorted(appended.items()):
+        sha.update(f'+{station}:{info["rows"]}:{info["hwm"]};'.encode())
+    return manifest, sha.hexdigest()
+
+
+def sources_fingerprint(paths):
+    # fingerprint gabungan file CSV sumber saja (tanpa baris tambahan)
+    sha = hashlib.sha1()
+    for path in paths:
+        sha.update(f'{os.path.basename(path)}:{source_fingerprint(path)};'.encode())
+    return sha.hexdigest()
+
+
+def _last_timestamp(paths):
+    return max(read_store(path, columns=[]).index.max() for path in paths)
+
+
+def high_water_marks(manifest, stations=None):
+    # waktu pembacaan terakhir per stasiun; cukup membaca index partisi tahun terakhir
+    stations = sorted(manifest) if stations is None else stations
+    return {station: _last_timestamp(manifest[station][max(manifest[station])]) for station in stations}
+
+
+def _write_append_meta(cache_dir, appended):
+    _write_json(appended, os.path.join(_append_dir(cache_dir), 'meta.json'))
+
+
+def _prune_appended(manifest, cache_dir, appended):
+    # CSV sumber yang diperbarui bisa sudah memuat baris tambahan; buang yang kini tumpang tindih
+    for station, info in appended.items():
+        if station not in manifest:
+            continue
+        base_hwm = _last_timestamp(manifest[station][max(manifest[station])])
+        for year, rel_path in list(info['partitions'].items()):
+            path = os.path.join(cache_dir, rel_path)
+            stored = read_store(path)
+            rows = stored[stored.index > base_hwm]
+            info['rows'] -= len(stored) - len(rows)
+            if len(rows):
+                _write_feather(rows, path)
+            else:
+                os.remove(path)
+                del info['partitions'][year]
+    appended = {station: info for station, info in appended.items() if info['partitions']}
+    _write_append_meta(cache_dir, appended)
+    return appended
+
+
+def append_rows(rows, source=DEFAULT_SOURCE, cache_dir=CACHE_DIR):
+    # simpan hanya baris yang lebih baru dari high-water mark (year, month, day, hour) stasiunnya;
+    # yang ditulis ulang hanya partisi tambahan tahun berjalan, bukan seluruh riwayat
+    manifest, _ = ensure_partitions(source, cache_dir)
+    rows = type_rows(rows)
+    stations = rows['station'].astype(str)
+    unknown = sorted(set(stations) - set(manifest))
+    if unknown:
+        raise KeyError(f'Stasiun tidak ada di penyimpanan: {unknown}')
+
+    hwm = high_water_marks(manifest, sorted(set(stations)))
+    rows = rows[rows.index > pd.DatetimeIndex(stations.map(hwm))]
+    # baris ganda untuk (stasiun, jam) yang sama: pakai yang terakhir dikirim
+    duplicated = pd.MultiIndex.from_arrays([rows['station'].astype(str), rows.index]).duplicated(keep='last')
+    rows = rows[~duplicated].sort_index(kind='stable')
+    if rows.empty:
+        return rows
+
+    appended = _read_meta(os.path.join(_append_dir(cache_dir), 'meta.json')) or {}
+    for (station, year), part in rows.groupby([rows['station'].astype(str), rows.index.year], sort=True):
+        part = part.assign(station=pd.Categorical([station] * len(part)))
+        path = partition_path(_append_dir(cache_dir), station, year)
+        stored = pd.concat([read_store(path), part]) if os.path.exists(path) else part
+        _write_feather(stored, path)
+
+        info = appended.setdefault(station, {'rows': 0, 'hwm': None, 'partitions': {}})
+        info['partitions'][str(year)] = os.path.relpath(path, cache_dir)
+        info['rows'] += len(part)
+        info['hwm'] = part.index.max().isoformat()
+    _write_append_meta(cache_dir, appended)
+    return rows
+
+
+def read_rows_since(manifest, high_water_marks):
+    # baris yang lebih baru dari high-water mark per stasiun; hanya partisi tahun >= mark yang dibuka
+    parts = []
+    for station, mark in high_water_marks.items():
+        for year in sorted(manifest[station]):
+            if year < mark.year:
+                continue
+            for path in manifest[station][year]:
+                if _last_timestamp([path]) > mark:
+                    part = read_store(path)
+                    parts.append(part[part.index > mark])
+    if not parts:
+        return None
+    for part in parts:
+        part['station'] = part['station'].cat.set_categories(sorted(manifest))
+    return pd.concat(parts).sort_index(kind='stable')
+
+
+def station_fingerprint(manifest, station, years=None):
+    # fingerprint isi partisi satu stasiun (CSV dan tambahan), opsional hanya tahun tertentu;
+    # baris baru atau CSV stasiun lain tidak mengubahnya
+    sha = hashlib.sha1(f'{station}|{SCHEMA_VERSION}'.encode())
+    for year in sorted(manifest[station]):
+        if years is None or year in years:
+            for path in manifest[station][year]:
+                sha.update(f'{year}:{source_fingerprint(path)};'.encode())
+    return sha.hexdigest()
+
+
+def dataset_fingerprint(fingerprint, stations=None, years=None):
+    # fingerprint untuk subset (stasiun, tahun) tertentu dari dataset
+    if stations is None and years is None:
+        return fingerprint
+    key = f'{fingerprint}|{sorted(stations or [])}|{sorted(years or [])}'
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def read_store(data_path, columns=None):
+    # memory-mapped: kolom numerik tanpa null dipetakan langsung dari file tanpa disalin
+    if columns is not None and TIME_INDEX not in columns:
+        columns = [TIME_INDEX] + list(columns)
+    table = feather.read_table(data_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def load_partitions(manifest, stations=None, years=None, columns=None):
+    # baca hanya partisi yang diminta; satu partisi dikembalikan tanpa penyalinan
+    stations = sorted(manifest) if stations is None else list(stations)
+    missing = [station for station in stations if station not in manifest]
+    if missing:
+        raise KeyError(f'Stasiun tidak ada di penyimpanan: {missing}')
+
+    parts = [read_store(path, columns)
+             for station in stations
+             for year in sorted(manifest[station])
+             if years is None or year in years
+             for path in manifest[station][year]]
+    if not parts:
+        raise ValueError('Tidak ada partisi untuk stasiun/tahun yang dipilih')
+    if len(parts) == 1:
+        return parts[0]
+
+    # samakan kategori station agar hasil concat tetap bertipe category
+    if 'station' in parts[0].columns:
+        for part in parts:
+            part['station'] = part['station'].cat.set_categories(sorted(manifest))
+    return pd.concat(parts)
+
+
+def load_dataset(source=DEFAULT_SOURCE, stations=None, years=None, cache_dir=CACHE_DIR):
+    manifest, _ = ensure_partitions(source, cache_dir)
+    return load_partitions(manifest, stations, years)
@@ -0,0 +1,82 @@
+# Agregasi streaming (out-of-core) untuk riwayat yang lebih besar dari RAM
+#
+# Data dibaca per potongan (satu partisi Feather stasiun/tahun, atau read_csv
+# dengan chunksize), di-forward fill melintasi batas potongan memakai baris
+# bersih terakhir tiap stasiun, lalu dialirkan ke akumulator: kubus agregat
+# tanpa resolusi jam, co-moment untuk korelasi, statistik cukup OLS dan mawar angin.
+# Memori puncak sebesar satu potongan ditambah akumulator, bukan seluruh riwayat.
+from collections import namedtuple
+
+import pandas as pd
+
+from analytics import cleaning, storage
+from analytics.windrose import WindRose
+from analytics.correlation import CorrelationStats
+from analytics.cube import AggregateCube
+from analytics.regression import OLSStats
+
+DEFAULT_CHUNKSIZE = 100_000
+STREAM_GRAINS = ('day', 'month', 'year')
+
+StreamResult = namedtuple('StreamResult', ['cube', 'correlation', 'ols', 'wind', 'rows'])
+
+
+def iter_csv_chunks(csv_paths, chunksize=DEFAULT_CHUNKSIZE):
+    for csv_path in csv_paths:
+        for chunk in pd.read_csv(csv_path, dtype=storage.DTYPES, chunksize=chunksize):
+            yield storage.type_rows(chunk)
+
+
+def iter_partitions(manifest, stations=None, years=None, columns=None):
+    # per tahun lalu per stasiun agar potongan mengalir kurang lebih urut waktu
+    stations = sorted(manifest) if stations is None else list(stations)
+    all_years = sorted({year for station in stations for year in manifest[station]})
+    for year in all_years:
+        if years is not None and year not in years:
+            continue
+        for station in stations:
+            for path in manifest[station].get(year, []):
+                chunk = storage.read_store(path, columns)
+                if 'station' in chunk.columns:
+                    # kategori sama di semua potongan agar concat dengan benih tetap category
+                    chunk['station'] = chunk['station'].cat.set_categories(sorted(manifest))
+                yield chunk
+
+
+def forward_fill_chunks(chunks):
+    # hasil sama dengan cleaning.clean_dataset pada seluruh data, potongan demi potongan
+    last_rows = None
+    for chunk in chunks:
+        if last_rows is None:
+            cleaned = cleaning.clean_dataset(chunk)
+        else:
+            if not last_rows['station'].dtype == chunk['station'].dtype:
+                # potongan CSV stasiun berbeda membawa kategori sendiri; satukan sebelum digabung
+                categories = last_rows['station'].cat.categories.union(chunk['station'].cat.categories)
+                last_rows = last_rows.assign(station=last_rows['station'].cat.set_categories(categories))
+                chunk = chunk.assign(station=chunk['station'].cat.set_categories(categories))
+            cleaned = cleaning.clean_append(last_rows, chunk)
+        tail = cleaned.groupby('station', observed=True).tail(1)
+        last_rows = tail if last_rows is None else pd.concat([last_rows, tail]).groupby('station', observed=True).tail(1)
+        yield cleaned
+
+
+def stream_aggregate(chunks, columns=None, correlation_columns=None, features=('TEMP',), target='PM2.5',
+                     grains=STREAM_GRAINS):
+    cube = correlation = None
+    ols = OLSStats(features, target)
+    wind = WindRose()
+    rows = 0
+    for chunk in forward_fill_chunks(chunks):
+        if cube is None:
+            cube = AggregateCube.from_frame(chunk, columns, grains)
+            correlation = CorrelationStats(correlation_columns or cube.columns)
+        else:
+            cube.append(chunk)
+        correlation.update(chunk)
+        ols.update(chunk)
+        wind.update(chunk)
+        rows += len(chunk)
+    if cube is None:
+        raise ValueError('Tidak ada potongan data untuk diagregasi')
+    return StreamResult(cube, correlation, ols, wind, rows)
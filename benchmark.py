@@ -0,0 +1,232 @@
+# Benchmark headless untuk semua komputasi dashboard
+#
+# Mengimpor fungsi komputasi dari paket analytics tanpa Streamlit,
+# mengukur waktu (wall time) dan memori puncak tiap tahap pada CSV bawaan
+# dan pada dataset sintetis yang diperbesar (misal 10x, 100x), lalu menyimpan
+# hasilnya sebagai JSON agar bisa dibandingkan antar run.
+#
+# Contoh:
+#   python benchmark.py --scales 1 10 100
+#   python benchmark.py --scales 1 10 --compare .cache/benchmarks/lama.json
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import uuid
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from analytics import aggregations, cleaning, clustering, models, regression, rolling, storage, streaming, windrose
+from analytics.cube import AggregateCube
+
+OUTPUT_DIR = os.path.join(storage.CACHE_DIR, 'benchmarks')
+
+
+def make_synthetic(raw, scale, seed=0):
+    # salin data asli sebanyak `scale` stasiun sintetis; nilai diberi sedikit noise
+    if scale == 1:
+        return raw
+    rng = np.random.default_rng(seed)
+    names = [f'{raw["station"].iloc[0]}_{i}' for i in range(scale)]
+    numeric = storage.POLLUTANTS + storage.WEATHER
+    parts = []
+    for name in names:
+        part = raw.copy()
+        noise = rng.lognormal(0, 0.05, size=(len(part), len(numeric))).astype('float32')
+        part[numeric] = part[numeric].to_numpy() * noise
+        part['station'] = pd.Categorical([name] * len(part), categories=names)
+        parts.append(part)
+    return pd.concat(parts)
+
+
+def _stages(raw):
+    # setiap tahap: (nama, fungsi tanpa argumen); state antar tahap dibagi lewat dict
+    state = {}
+
+    def clean():
+        state['clean'] = cleaning.clean_dataset(raw)
+
+    def views():
+        data_bersih = state['clean']
+        state['data_clean'] = cleaning.numeric_view(data_bersih)
+        state['wd'] = cleaning.wd_view(data_bersih)
+        state['hourly'] = cleaning.hourly_view(data_bersih)
+
+    def cube():
+        state['cube'] = AggregateCube.from_frame(state['clean'])
+
+    def yearly_table():
+        # groupby di perbedaan_polusi, sekarang dari kubus tahunan
+        aggregations.yearly_means(state['cube'])
+
+    def rain_pattern():
+        # groupby di pola_curah_hujan
+        aggregations.monthly_pattern(state['cube'], 'RAIN')
+
+    def stream():
+        # mode out-of-core: kubus, korelasi dan statistik OLS per potongan satu tahun
+        chunks = (raw.iloc[i:i + 8760] for i in range(0, len(raw), 8760))
+        streaming.stream_aggregate(chunks)
+
+    def raw_groupby():
+        # pembanding: groupby tahunan langsung di data per jam
+        data = state['data_clean']
+        data.groupby(data.index.year)[aggregations.YEARLY_POLLUTANTS].mean()
+
+    def wind_rose():
+        # kode integer arah angin + bincount per (arah, kelas kecepatan) untuk semua polutan
+        windrose.WindRose().update(state['clean'])
+
+    def wind_groupby():
+        # pembanding: groupby string wd x kelas WSPM per polutan (rata-rata dan persentil)
+        data = state['wd']
+        speed = pd.cut(data['WSPM'], list(windrose.SPEED_EDGES) + [np.inf], right=False)
+        grouped = data.groupby([data['wd'].astype(str), speed], observed=True)
+        for column in storage.POLLUTANTS:
+            grouped[column].mean()
+            grouped[column].quantile([0.5, 0.9])
+
+    def rolling_exceedance():
+        # prefix sum di grid jam -> rata-rata bergerak, maksimum harian dan episode per polutan
+        engine = rolling.RollingEngine().update(state['clean'])
+        for column in rolling.WINDOWS:
+            engine.summary(column, rolling.STANDARDS['GB 3095-2012'][column])
+
+    def rolling_pandas():
+        # pembanding: groupby per jam lalu rolling() dan resample() pandas per polutan
+        data = state['data_clean']
+        for column, window in rolling.WINDOWS.items():
+            hourly = data[column].groupby(data.index.floor('h')).mean().asfreq('h')
+            means = hourly.rolling(window, min_periods=rolling.min_hours(window)).mean()
+            means.resample('D').max()
+            rolling.episodes(means, rolling.STANDARDS['GB 3095-2012'][column])
+
+    def ols():
+        regression.fit_ols(state['hourly']).summary()
+
+    def ols_gram():
+        # statistik cukup per partisi lalu fit dari matriks Gram (semua subset fitur)
+        stats = regression.combine(regression.partition_stats(state['clean']))
+        stats.fit(['TEMP']).summary()
+        stats.fit(regression.FEATURES).summary()
+
+    def clustering_fit():
+        # fingerprint unik agar cache layanan clustering tidak terpakai
+        clustering.fit_clusters(state['hourly'], uuid.uuid4().hex)
+
+    def train(model_type):
+        def run():
+            data = state['data_clean']
+            X = data[['TEMP', 'DEWP', 'WSPM']].to_numpy(dtype='float64')
+            y = data['PM2.5'].to_numpy(dtype='float64')
+            models.train_model(X, y, model_type, test_size=0.8)
+        return run
+
+    return [
+        ('cleaning', clean),
+        ('cleaning_views', views),
+        ('aggregate_cube', cube),
+        ('perbedaan_polusi_groupby', yearly_table),
+        ('pola_curah_hujan_groupby', rain_pattern),
+        ('raw_yearly_groupby', raw_groupby),
+        ('streaming_aggregate', stream),
+        ('wind_rose', wind_rose),
+        ('wind_rose_groupby', wind_groupby),
+        ('rolling_exceedance', rolling_exceedance),
+        ('rolling_pandas', rolling_pandas),
+        ('air_quality_regression', ols),
+        ('ols_gram', ols_gram),
+        ('perform_clustering', clustering_fit),
+        ('prediksi_linear_regression', train('Linear Regression')),
+        ('prediksi_random_forest', train('Random Forest')),
+    ]
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    # memori puncak diukur pada run terpisah karena tracemalloc memperlambat eksekusi
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'wall_min_s': min(times), 'wall_median_s': statistics.median(times),
+            'peak_mem_mb': peak / 1e6}
+
+
+def run(scales, repeat, only=None):
+    # data mentah diambil dari penyimpanan (CSV bawaan), bukan dari jaringan
+    base = storage.load_dataset(storage.DEFAULT_CSV)
+    results = []
+    for scale in scales:
+        raw = make_synthetic(base, scale)
+        for name, fn in _stages(raw):
+            if only and name not in only:
+                # tahap tetap dijalankan sekali karena tahap berikutnya bergantung padanya
+                fn()
+                continue
+            stats = measure(fn, repeat)
+            results.append({'stage': name, 'scale': scale, 'rows': len(raw), **stats})
+            print(f'{name:<28} x{scale:<4} {len(raw):>9} baris  '
+                  f'{stats["wall_median_s"]:>9.4f} s  {stats["peak_mem_mb"]:>9.1f} MB')
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=storage.BASE_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['stage'], r['scale']): r for r in json.load(f)['results']}
+    print(f'\nPerbandingan dengan {baseline_path} (rasio > 1 berarti lebih lambat/boros)')
+    for r in results:
+        old = baseline.get((r['stage'], r['scale']))
+        if old is None:
+            continue
+        ratio_time = r['wall_median_s'] / max(old['wall_median_s'], 1e-9)
+        ratio_mem = r['peak_mem_mb'] / max(old['peak_mem_mb'], 1e-9)
+        print(f'{r["stage"]:<28} x{r["scale"]:<4} waktu {ratio_time:6.2f}x  memori {ratio_mem:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark komputasi dashboard kualitas udara')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10], help='faktor pembesaran dataset')
+    parser.add_argument('--repeat', type=int, default=3, help='jumlah pengulangan pengukuran waktu')
+    parser.add_argument('--stages', nargs='+', help='hanya ukur tahap-tahap ini')
+    parser.add_argument('--output', help='file JSON hasil (bawaan: .cache/benchmarks/<waktu>.json)')
+    parser.add_argument('--compare', help='file JSON hasil run sebelumnya sebagai pembanding')
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat, args.stages)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    output = args.output or os.path.join(OUTPUT_DIR, f'{stamp}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'meta': {'timestamp': stamp, 'commit': _git_commit(), 'python': platform.python_version(),
+                     'pandas': pd.__version__, 'numpy': np.__version__, 'sklearn': sklearn.__version__,
+                     'machine': platform.machine(), 'cpus': os.cpu_count(), 'repeat': args.repeat},
+            'results': results,
+        }, f, indent=2)
+    print(f'\nHasil disimpan di {output}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,87 +1,123 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from streamlit_option_menu import option_menu
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
-from sklearn.ensemble import RandomForestRegressor
-import statsmodels.api as sm
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-
-@st.cache_data
-#Load Data CSV
-def load_data(url) :
-    df = pd.read_csv(url)
-    return df
+from analytics import aggregations, clustering, downsample, evaluation, figcache, live, models, profiling, regression, rolling, storage
 
-#pembersihn data
-def cleaning_data (df_Data):
-    data = df_Data.copy()
-    
-    data.fillna(method='ffill', inplace=True)
-    
-    non_numeric_columns = data.select_dtypes(exclude=['number']).columns
-    data = data.drop(columns=non_numeric_columns)
-    
-    return data
+@st.cache_resource
+#Load Data dari penyimpanan kolumnar (CSV per stasiun dikonversi sekali ke partisi Feather stasiun/tahun, dibaca memory-mapped)
+#hanya partisi stasiun yang dipilih yang dibaca; data dibersihkan dan diagregasi (kubus jam/hari/bulan/tahun)
+#sekali per versi CSV, baris baru dari storage.append_rows ditambahkan secara inkremental lewat refresh()
+def load_data(fingerprint, stasiun, _manifest) :
+    profiling.miss()
+    return live.LiveDataset(_manifest, stasiun, fingerprint)
 
-def cleaning_data_wd (df_Data):
-    data_wd = df_Data.copy()
-    
-    data_wd.fillna(method='ffill', inplace=True)
-    return data_wd
-
-def cleaning_data_hourly (df_Data):
-    data_hourly = df_Data.copy()
-    
-    data_hourly.fillna(method='ffill', inplace=True)
-    data_hourly['tanggal_jam'] = pd.to_datetime(df_Data[['year', 'month', 'day','hour']], format='%Y-%m-%d %H:%M:%S')
-    return data_hourly
+#pembersihn data
+# tampilan kolom dibentuk sekali per versi dataset dan dipakai bersama semua sesi
+@profiling.profiled
+def cleaning_data (dataset):
+    return dataset.view('numeric')
+
+@profiling.profiled
+def cleaning_data_wd (dataset):
+    return dataset.view('wd')
+
+@profiling.profiled
+def cleaning_data_hourly (dataset):
+    return dataset.view('hourly')
 #end pembersihn data
 
+# cache gambar grafik (PNG) yang hanya bergantung pada dataset, dipakai bersama semua sesi
+# st.image mengecilkan (decode, resize, encode ulang) setiap gambar yang lebih lebar dari
+# 2 x 730 px pada tiap tampilan; gambar di cache langsung dirender selebar itu
+LEBAR_MAKS_GAMBAR = 2 * 730
+
+@st.cache_resource
+def get_figure_cache():
+    return figcache.FigureCache(max_width=LEBAR_MAKS_GAMBAR)
+
+def tampilkan_grafik(chart_id, params, fingerprint, gambar):
+    # gambar() hanya dipanggil jika grafik belum ada di cache
+    def gambar_miss():
+        profiling.miss()
+        return gambar()
+    with profiling.stage(f'grafik:{chart_id}', cached=True):
+        st.image(get_figure_cache().render(chart_id, params, fingerprint, gambar_miss), use_column_width=True)
+
+# grafik yang bergantung pada input pengguna dirender langsung tiap rerun
+def tampilkan_pyplot(nama, fig):
+    with profiling.stage(f'pyplot:{nama}'):
+        st.pyplot(fig)
+
+# registry model prediksi dipakai bersama semua sesi; model tersimpan di disk
+@st.cache_resource
+def get_model_registry():
+    return models.ModelRegistry()
+
+# evaluasi validasi silang dijalankan di latar belakang, hasil per fold tersimpan di disk
+@st.cache_resource
+def get_evaluator():
+    return evaluation.EvaluationService()
+
+# matriks korelasi penuh (Pearson/Spearman, opsional per bulan/musim) dihitung sekali per versi data;
+# mesinnya disimpan di dataset dan dibuang saat ada baris baru
+@profiling.profiled
+def get_korelasi(dataset):
+    return dataset.view('correlation')
+
 #Proses
 #Proses Tab 1
 #pertanyaan 1
-def daily_air_pollution_comparison(data):
-    data['tanggal'] = pd.to_datetime(data[['year', 'month', 'day']], format='%Y-%m-%d')
-
+@profiling.profiled
+def daily_air_pollution_comparison(data_cube, fingerprint):
+    # rata-rata harian dan interval kepercayaan 95% diambil dari kubus (sum & sum of squares)
     # Grafik Perbandingan Tingkat PM2.5 per Hari di Aotizhongxin
     st.subheader('Grafik Perbandingan Tingkat PM2.5 per Hari')
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.lineplot(data=data, x='tanggal', y='PM2.5', ax=ax, label='PM2.5')
-    ax.set_xlabel('Tanggal')
-    ax.set_ylabel('Rata-rata Tingkat PM2.5')
-    ax.set_title('Perbandingan Tingkat PM2.5 per Hari di Aotizhongxin')
-    st.pyplot(fig)
-
-def monthly_air_pollution_comparison(data):
+    def gambar():
+        daily_pm25, daily_ci = aggregations.daily_mean_ci(data_cube, 'PM2.5')
+        fig, ax = plt.subplots(figsize=(12, 6))
+        # kurangi titik sesuai lebar grafik (LTTB), interval kepercayaan ikut titik yang terpilih
+        titik = downsample.downsample_indices(daily_pm25, downsample.pixel_budget(fig))
+        daily_pm25, daily_ci = daily_pm25.iloc[titik], daily_ci.iloc[titik]
+        sns.lineplot(x=daily_pm25.index, y=daily_pm25.values, ax=ax, label='PM2.5')
+        ax.fill_between(daily_pm25.index, daily_pm25 - daily_ci, daily_pm25 + daily_ci, alpha=0.2)
+        ax.set_xlabel('Tanggal')
+        ax.set_ylabel('Rata-rata Tingkat PM2.5')
+        ax.set_title('Perbandingan Tingkat PM2.5 per Hari di Aotizhongxin')
+        return fig
+    tampilkan_grafik('pm25_harian', (), fingerprint, gambar)
+
+@profiling.profiled
+def monthly_air_pollution_comparison(data, fingerprint):
     # Grafik Distribusi Tingkat PM2.5 per Bulan
     st.subheader('Distribusi Tingkat PM2.5 per Bulan')
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.boxplot(data=data, x='month', y='PM2.5', ax=ax)
-    ax.set_xlabel('Bulan')
-    ax.set_ylabel('Tingkat PM2.5')
-    ax.set_title('Distribusi Tingkat PM2.5 per Bulan')
-    st.pyplot(fig)
-    
-def yearly_air_pollution_comparison(data):
-    data['tanggal'] = pd.to_datetime(data[['year', 'month', 'day']], format='%Y-%m-%d')
+    def gambar():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.boxplot(data=data, x='month', y='PM2.5', ax=ax)
+        ax.set_xlabel('Bulan')
+        ax.set_ylabel('Tingkat PM2.5')
+        ax.set_title('Distribusi Tingkat PM2.5 per Bulan')
+        return fig
+    tampilkan_grafik('boxplot_bulanan', ('PM2.5',), fingerprint, gambar)
     
+@profiling.profiled
+def yearly_air_pollution_comparison(data_cube, fingerprint):
     # Grafik Perbandingan Rata-rata PM2.5 per Tahun
     st.subheader('Grafik Perbandingan Rata-rata PM2.5 per Tahun')
-    yearly_pm25_avg = data.groupby(data['tanggal'].dt.year)['PM2.5'].mean().reset_index()
-    yearly_pm25_avg.columns = ['Tahun', 'Rata-rata PM2.5']
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(data=yearly_pm25_avg, x='Tahun', y='Rata-rata PM2.5', palette='coolwarm', ax=ax)
-    ax.set_xlabel('Tahun')
-    ax.set_ylabel('Rata-rata PM2.5')
-    ax.set_title('Grafik Perbandingan Rata-rata PM2.5 per Tahun')
-    st.pyplot(fig)
-
-def air_pollution_daily_comparison(data):
+    def gambar():
+        yearly_pm25_avg = aggregations.yearly_means(data_cube, 'PM2.5').reset_index()
+        yearly_pm25_avg.columns = ['Tahun', 'Rata-rata PM2.5']
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.barplot(data=yearly_pm25_avg, x='Tahun', y='Rata-rata PM2.5', palette='coolwarm', ax=ax)
+        ax.set_xlabel('Tahun')
+        ax.set_ylabel('Rata-rata PM2.5')
+        ax.set_title('Grafik Perbandingan Rata-rata PM2.5 per Tahun')
+        return fig
+    tampilkan_grafik('pm25_tahunan', (), fingerprint, gambar)
+
+def air_pollution_daily_comparison(data_cube):
     # Perbandingan Tingkat Polusi Udara Harian
     st.subheader('Perbandingan Tingkat Polusi Udara Harian Berdasarkan PM2.5, PM10, SO2, NO2, CO, O3')
     
@@ -98,8 +134,8 @@ def air_pollution_daily_comparison(data):
     
     # Menampilkan plot perbandingan per hari
     if selected_columns:
-        daily_average = data.groupby(data['tanggal'].dt.date).mean()
-        st.line_chart(daily_average[selected_columns])
+        daily_average = aggregations.daily_means(data_cube)
+        st.line_chart(downsample.downsample_frame(daily_average[selected_columns], downsample.DEFAULT_POINTS))
          # Penjelasan
         with st.expander("Lihat Penjelasan"):
             st.write("""
@@ -117,18 +153,19 @@ def air_pollution_daily_comparison(data):
                                 """
                         )
         
-def main_visualization(data):
+@profiling.profiled
+def main_visualization(data, data_cube, fingerprint):
     st.subheader("Perbandingan tingkat pulusi udara berdasarkan PM2.5 ")
     pilih_perbandingan_waktu = st.radio(
           "Pilih berdasarkan waktu",
           ("Per Hari","Per Bulan","Per Tahun")
       )
     if (pilih_perbandingan_waktu == "Per Hari"):
-        daily_air_pollution_comparison(data)
+        daily_air_pollution_comparison(data_cube, fingerprint)
     elif (pilih_perbandingan_waktu == "Per Bulan"):
-        monthly_air_pollution_comparison(data)
+        monthly_air_pollution_comparison(data, fingerprint)
     else:
-        yearly_air_pollution_comparison(data)
+        yearly_air_pollution_comparison(data_cube, fingerprint)
      # Penjelasan
     with st.expander("Lihat Penjelasan"):
         st.write(
@@ -136,7 +173,7 @@ def main_visualization(data):
             """
         )
     st.write('<hr>', unsafe_allow_html=True)
-    air_pollution_daily_comparison(data)
+    air_pollution_daily_comparison(data_cube)
 
 #pertanyaan 2        
 def air_pollutant_temperature_comparison(data):
@@ -150,7 +187,7 @@ def air_pollutant_temperature_comparison(data):
     ax.set_ylabel('Tingkat Polutan')
     ax.set_title('Perbandingan Tingkat SO2, NO2, dan O3 pada Hari dengan Suhu Tinggi dan Rendah')
     ax.legend(title='TEMP')
-    st.pyplot(fig)
+    tampilkan_pyplot('boxplot_suhu', fig)
 
     # Grafik Tingkat Polutan Udara vs Suhu
     st.title('Tingkat Polutan Udara vs Suhu')
@@ -159,45 +196,53 @@ def air_pollutant_temperature_comparison(data):
     ax.set_xlabel('Suhu (°C)')
     ax.set_ylabel('Tingkat PM2.5')
     ax.set_title('Tingkat Polutan Udara vs Suhu')
-    st.pyplot(fig)
+    tampilkan_pyplot('scatter_suhu', fig)
     
-# Filter data berdasarkan suhu
-def filter_data_by_temperature(data, temperature_threshold):
-    data_rendah = data[data['TEMP'] <= temperature_threshold]
-    data_tinggi = data[data['TEMP'] > temperature_threshold]
-    return data_rendah, data_tinggi
-
-# Hitung rata-rata tingkat SO2, NO2, dan O3
-def calculate_average_pollutants(data):
-    rata_rata_so2 = data['SO2'].mean()
-    rata_rata_no2 = data['NO2'].mean()
-    rata_rata_o3 = data['O3'].mean()
-    return rata_rata_so2, rata_rata_no2, rata_rata_o3
-
-def visualization_temp_air(data):
+# data diurutkan menurut suhu sekali per versi data; ambang mana pun cukup dengan binary search.
+# Strukturnya disimpan di dataset dan dibuang saat ada baris baru
+@profiling.profiled
+def get_sebaran_suhu(dataset):
+    return dataset.view('temperature')
+
+@profiling.profiled
+def visualization_temp_air(dataset, fingerprint):
     st.subheader('Tingkat SO2, NO2, dan O3 Sesuai Tinggi dan Rendah Suhu')
+    sebaran_suhu = get_sebaran_suhu(dataset)
     # Slider untuk memilih suhu batas
     temperature_threshold = st.slider('Pilih Suhu Batas', min_value=0, max_value=40, value=25, step=1)
     
-    # Filter data berdasarkan suhu
-    data_rendah, data_tinggi = filter_data_by_temperature(data, temperature_threshold)
-    
-    # Hitung rata-rata tingkat polutan
-    rata_rata_so2_rendah, rata_rata_no2_rendah, rata_rata_o3_rendah = calculate_average_pollutants(data_rendah)
-    rata_rata_so2_tinggi, rata_rata_no2_tinggi, rata_rata_o3_tinggi = calculate_average_pollutants(data_tinggi)
-    
-    # Buat grafik
-    fig, ax = plt.subplots()
-    ax.plot([0, 1], [rata_rata_so2_rendah, rata_rata_so2_tinggi], label='SO2')
-    ax.plot([0, 1], [rata_rata_no2_rendah, rata_rata_no2_tinggi], label='NO2')
-    ax.plot([0, 1], [rata_rata_o3_rendah, rata_rata_o3_tinggi], label='O3')
-
-    # Atur label
-    ax.set_xlabel('Suhu (°C)')
-    ax.set_ylabel('Tingkat Polutan Udara (μg/m³)')
-    ax.set_title('Tingkat Polutan Udara vs Suhu')
-    ax.legend()
-    st.pyplot(fig)
+    # grafik per suhu batas di-cache, sehingga setiap nilai slider hanya digambar sekali untuk semua sesi
+    def gambar_batas():
+        # Hitung rata-rata tingkat polutan di bawah dan di atas suhu batas
+        rata_rata_rendah, rata_rata_tinggi = sebaran_suhu.means(temperature_threshold)
+
+        # Buat grafik
+        fig, ax = plt.subplots()
+        for polutan in aggregations.TEMPERATURE_POLLUTANTS:
+            ax.plot([0, 1], [rata_rata_rendah[polutan], rata_rata_tinggi[polutan]], label=polutan)
+
+        # Atur label
+        ax.set_xlabel('Suhu (°C)')
+        ax.set_ylabel('Tingkat Polutan Udara (μg/m³)')
+        ax.set_title('Tingkat Polutan Udara vs Suhu')
+        ax.legend()
+        return fig
+    tampilkan_grafik('polutan_suhu', (temperature_threshold,), fingerprint, gambar_batas)
+
+    # kurva rata-rata untuk semua suhu batas 0-40 °C dalam satu perhitungan
+    def gambar():
+        ambang = np.arange(0, 41)
+        rendah, tinggi = sebaran_suhu.sweep(ambang)
+        fig, ax = plt.subplots(figsize=(10, 5))
+        for polutan, warna in zip(sebaran_suhu.columns, ('tab:blue', 'tab:orange', 'tab:green')):
+            ax.plot(ambang, rendah[polutan], color=warna, label=f'{polutan} (suhu <= batas)')
+            ax.plot(ambang, tinggi[polutan], color=warna, linestyle='--', label=f'{polutan} (suhu > batas)')
+        ax.set_xlabel('Suhu Batas (°C)')
+        ax.set_ylabel('Rata-rata Tingkat Polutan Udara (μg/m³)')
+        ax.set_title('Rata-rata SO2, NO2, dan O3 untuk Setiap Suhu Batas')
+        ax.legend(ncol=3, fontsize='small')
+        return fig
+    tampilkan_grafik('sweep_suhu', tuple(sebaran_suhu.columns), fingerprint, gambar)
     with st.expander("Lihat Penjelasan"):
             st.write("""
                         SO2: Sulfur Dioxide (Diosida Belerang): Gas yang dihasilkan dari pembakaran bahan bakar fosil yang mengandung belerang, yang dapat menyebabkan iritasi saluran pernapasan dan masalah kesehatan lainnya.
@@ -218,136 +263,143 @@ def visualization_temp_air(data):
 
 #Proses Tab 2
 # Sepanjang tahun / hari
-def Air_Pollution_Hourly_Umum(data, pollutant):
-    data['tanggal_jam'] = pd.to_datetime(data[['year', 'month', 'day']], format='%Y-%m-%d %H:%M:%S')
-    hourly_comparison = data.groupby('tanggal_jam')[pollutant].mean()
-    
-    # Visualisasi per jam
-    plt.figure(figsize=(20, 6))
-    plt.plot(hourly_comparison.index, hourly_comparison, label=pollutant)
-    plt.xlabel('Jam dalam Sehari')
-    plt.ylabel(f'Rata-rata Tingkat {pollutant}')
-    plt.title(f'Perbandingan Tingkat {pollutant} per Jam dalam Sehari')
-    plt.legend()
-    st.pyplot(plt)
+@profiling.profiled
+def Air_Pollution_Hourly_Umum(data_cube, pollutant, fingerprint):
+    def gambar():
+        hourly_comparison = data_cube.mean('day', pollutant)
+
+        # Visualisasi per jam
+        fig, ax = plt.subplots(figsize=(20, 6))
+        hourly_comparison = downsample.downsample(hourly_comparison, downsample.pixel_budget(fig))
+        ax.plot(hourly_comparison.index, hourly_comparison, label=pollutant)
+        ax.set_xlabel('Jam dalam Sehari')
+        ax.set_ylabel(f'Rata-rata Tingkat {pollutant}')
+        ax.set_title(f'Perbandingan Tingkat {pollutant} per Jam dalam Sehari')
+        ax.legend()
+        return fig
+    tampilkan_grafik('tren_umum', (pollutant,), fingerprint, gambar)
+
+# rentang waktu sembarang; jendela diambil dari kubus per jam lewat binary search
+@profiling.profiled
+def Air_Pollution_Window(data_cube, pollutant, start, end, keterangan, fingerprint):
+    def gambar():
+        hourly_comparison = aggregations.hourly_window(data_cube, start, end, pollutant)
+
+        # Visualisasi per jam
+        fig = plt.figure(figsize=(15, 6))
+        hourly_comparison = downsample.downsample(hourly_comparison, downsample.pixel_budget(fig)).to_frame()
+        plt.plot(hourly_comparison.index, hourly_comparison[pollutant], marker="o", markersize=5, label=pollutant)
+
+        plt.xlabel('Waktu')
+        plt.ylabel(f'Rata-rata Tingkat {pollutant}')
+        plt.title(f'Perbandingan Tingkat {pollutant} per jam dalam sehari selama {keterangan}')
+        plt.legend()
+        plt.grid(True, linestyle="--", alpha=0.7)
+        plt.xticks(rotation=45, ha="right")
+        plt.xlim(hourly_comparison.index.min(), hourly_comparison.index.max())
+        plt.gca().xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m-%d %H:%M:%S'))
+        plt.gca().set_ylim(bottom=0)  # Mengatur batas bawah sumbu y ke 0 agar tidak negatif
+        plt.tight_layout()
+        return fig
+    tampilkan_grafik('tren_rentang', (pollutant, str(start), str(end), keterangan), fingerprint, gambar)
 
 # satu tahun terakhir 
-def Air_Pollution_One_Year(data, pollutant):
-    tanggal_terakhir = data['tanggal_jam'].max()
-    tanggal_sebelumnya = tanggal_terakhir - pd.DateOffset(years=1)
-
-    # Filter data untuk satu tahun terakhir
-    data_one_year = data[(data['tanggal_jam'] >= tanggal_sebelumnya) & (data['tanggal_jam'] <= tanggal_terakhir)]
-    
-    # Perhitungan rata-rata tingkat polutan per jam dalam sehari
-    hourly_comparison_one_year = data_one_year.groupby(data_one_year['tanggal_jam']).mean()
-    
-    # Visualisasi per jam
-    plt.figure(figsize=(15, 6))
-    plt.plot(hourly_comparison_one_year.index, hourly_comparison_one_year[pollutant], marker="o", markersize=5, label=pollutant)
-
-    plt.xlabel('Waktu')
-    plt.ylabel(f'Rata-rata Tingkat {pollutant}')
-    plt.title(f'Perbandingan Tingkat {pollutant} per jam dalam sehari selama satu tahun terakhir')
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.xticks(rotation=45, ha="right")
-    plt.xlim(hourly_comparison_one_year.index.min(), hourly_comparison_one_year.index.max())
-    plt.gca().xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m-%d %H:%M:%S'))
-    plt.gca().set_ylim(bottom=0)  # Mengatur batas bawah sumbu y ke 0 agar tidak negatif
-    plt.tight_layout()
-    st.pyplot(plt)
+def Air_Pollution_One_Year(data_cube, pollutant, fingerprint):
+    _, tanggal_terakhir = data_cube.time_range('hour')
+    Air_Pollution_Window(data_cube, pollutant, tanggal_terakhir - pd.DateOffset(years=1), tanggal_terakhir,
+                         'satu tahun terakhir', fingerprint)
 # Satu tahun terakhir end
 
 # Satu bulan terakhir
-def Air_Pollution_Last_Month(data, pollutant):
-    bulan_terakhir = data['tanggal_jam'].max()
-    start_date = bulan_terakhir - pd.DateOffset(months=1)
-
-    data_one_month = data[(data['tanggal_jam'] >= start_date) & (data['tanggal_jam'] <= bulan_terakhir)]
-    
-    hourly_comparison_one_month = data_one_month.groupby(data_one_month['tanggal_jam']).mean()
-
-    # Visualisasi per jam
-    plt.figure(figsize=(15, 6))
-    plt.plot(hourly_comparison_one_month.index, hourly_comparison_one_month[pollutant], marker="o", markersize=5, label=pollutant)
-
-    plt.xlabel('Waktu')
-    plt.ylabel(f'Rata-rata Tingkat {pollutant}')
-    plt.title(f'Perbandingan Tingkat {pollutant} per jam dalam sehari selama satu bulan terakhir')
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.xticks(rotation=45, ha="right")
-    plt.xlim(hourly_comparison_one_month.index.min(), hourly_comparison_one_month.index.max())
-    plt.gca().xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m-%d %H:%M:%S'))
-    plt.gca().set_ylim(bottom=0)  # Mengatur batas bawah sumbu y ke 0 agar tidak negatif
-    plt.tight_layout()
-    st.pyplot(plt)
+def Air_Pollution_Last_Month(data_cube, pollutant, fingerprint):
+    _, bulan_terakhir = data_cube.time_range('hour')
+    Air_Pollution_Window(data_cube, pollutant, bulan_terakhir - pd.DateOffset(months=1), bulan_terakhir,
+                         'satu bulan terakhir', fingerprint)
 # Satu bulan terakhir end
     
 # testing
 def air_quality_regression(data):
-    X = data[['TEMP']]
-    y = data['PM2.5']
-    X = sm.add_constant(X)
-    model = sm.OLS(y, X)
-    results = model.fit()
-    return results.summary()
-
-def perform_clustering(data):
-    X = data[['TEMP', 'PRES', 'WSPM']]
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    kmeans = KMeans(n_clusters=3, random_state=0)
-    data['cluster'] = kmeans.fit_predict(X_scaled)
-    return data
-
-def visualisasi_clustering(data):
-    st.header("Hasil Clustering terhadap data yang digunakan")
-    data_with_cluster = perform_clustering(data)
-    st.write(data_with_cluster.tail(100))
-    # Buat objek plot untuk scatter plot
-    fig, ax = plt.subplots()
-
-    ax.set_xlabel('TEMP')
-    ax.set_ylabel('PRES')
-    ax.set_title('Hasil Clustering')
-
-    scatter = plt.scatter(data_with_cluster['TEMP'], data_with_cluster['PRES'], c=data_with_cluster['cluster'], cmap='viridis')
-
-    # legend
-    # legend1 = ax.legend(*scatter.legend_elements(), title="Clusters")
+    return regression.OLSStats(('TEMP',)).update(data).fit().summary()
 
-    legend_elements = scatter.legend_elements()[0]
+@profiling.profiled
+def perform_clustering(data, fingerprint, k=3, method='auto'):
+    # model dan label di-cache per (fitur, k, metode, fingerprint data); data masukan tidak diubah
+    hasil = clustering.fit_clusters(data, fingerprint, k=k, method=method)
+    return hasil.labels
 
-    # Mendefinisikan label klaster
-    cluster_labels = [f'Cluster {i}' for i in range(1, len(legend_elements) + 1)]
-
-    # Membuat legenda dengan label klaster yang baru dibuat
-    legend1 = ax.legend(handles=legend_elements, labels=cluster_labels, title="Clusters")
-
-    st.pyplot(fig)
+@profiling.profiled
+def visualisasi_clustering(data, fingerprint):
+    st.header("Hasil Clustering terhadap data yang digunakan")
+    with st.expander("Pengaturan Clustering"):
+        # sweep k dihitung pada sampel dan di-cache, hanya dijalankan jika diminta
+        if st.checkbox('Tampilkan inertia & silhouette untuk k = 2..8'):
+            sweep = clustering.sweep_k(data, fingerprint)
+            col1, col2 = st.columns(2)
+            col1.line_chart(sweep['inertia'])
+            col2.line_chart(sweep['silhouette'])
+            st.caption('Dihitung pada sampel acak 5000 baris')
+        k = st.slider('Jumlah Klaster (k)', 2, 8, 3)
+        metode = st.radio('Metode', ('auto', 'kmeans', 'minibatch'), horizontal=True)
+    labels = perform_clustering(data, fingerprint, k=k, method=metode)
+    data_with_cluster = data.tail(100).assign(cluster=labels[-100:])
+    st.write(data_with_cluster)
+    def gambar():
+        # Buat objek plot untuk scatter plot
+        fig, ax = plt.subplots()
+
+        ax.set_xlabel('TEMP')
+        ax.set_ylabel('PRES')
+        ax.set_title('Hasil Clustering')
+
+        scatter = ax.scatter(data['TEMP'], data['PRES'], c=labels, cmap='viridis')
+
+        # legend
+        # legend1 = ax.legend(*scatter.legend_elements(), title="Clusters")
+
+        legend_elements = scatter.legend_elements()[0]
+
+        # Mendefinisikan label klaster
+        cluster_labels = [f'Cluster {i}' for i in range(1, len(legend_elements) + 1)]
+
+        # Membuat legenda dengan label klaster yang baru dibuat
+        legend1 = ax.legend(handles=legend_elements, labels=cluster_labels, title="Clusters")
+        return fig
+    tampilkan_grafik('clustering', (k, metode), fingerprint, gambar)
     with st.expander("Penjelasaan Grafik Clusteringg"):
         st.write('Analisis clustering membantu mengelompokkan data kualitas udara berdasarkan atribut-atribut tertentu seperti suhu, tekanan udara, dan kecepatan angin. Melalui algoritma clustering, data dapat dikelompokkan menjadi beberapa klaster yang memiliki karakteristik yang serupa. Hal ini membantu dalam mengidentifikasi pola atau tren tersembunyi dalam data kualitas udara. Dengan melihat hasil clustering, kita dapat menemukan pola-pola baru yang mungkin tidak terlihat sebelumnya, dan hal ini membantu dalam pemahaman tentang faktor-faktor yang mempengaruhi kualitas udara. Selain itu, penerapan analisis regresi pada setiap klaster yang dihasilkan dapat memberikan wawasan tambahan tentang hubungan antara variabel-variabel tertentu dalam setiap kelompok.')
 
-def visualisasi_regresi(data):
+@profiling.profiled
+def visualisasi_regresi(data, ols_stats, fingerprint):
     st.header("Regresi Linier")
     st.write("Analisis regresi linier antara suhu (TEMP) dan PM2.5")
-    X = data[['TEMP']]
-    y = data['PM2.5']
-    X = sm.add_constant(X)
-    model = sm.OLS(y, X)
-    results = model.fit()
-
-    # Visualisasi regresi linier
-    plt.figure(figsize=(10, 6))
-    plt.scatter(data['TEMP'], data['PM2.5'], alpha=0.5, label ="Data Observasi")
-    plt.plot(data['TEMP'], results.predict(), color='red', label='Regresi Linier')
-    plt.xlabel('Suhu (TEMP)')
-    plt.ylabel('PM2.5')
-    plt.title('Regresi Linier antara Suhu dan PM2.5')
-    plt.legend()
-    st.pyplot(plt)
+    fitur = st.multiselect('Variabel cuaca', regression.FEATURES, default=['TEMP'])
+    if not fitur:
+        st.warning('Pilihlah setidaknya satu variabel cuaca')
+        return
+    # koefisien dan ringkasan dari matriks Gram per partisi, tanpa memindai data lagi
+    results = regression.combine(ols_stats).fit(fitur)
+
+    # Visualisasi regresi linier pada sampel titik observasi
+    def gambar():
+        sampel = data.sample(n=min(len(data), 5000), random_state=0)
+        fig, ax = plt.subplots(figsize=(10, 6))
+        if len(fitur) == 1:
+            ax.scatter(sampel[fitur[0]], sampel['PM2.5'], alpha=0.5, label ="Data Observasi")
+            x = sampel[fitur].agg(['min', 'max'])
+            ax.plot(x[fitur[0]], results.predict(x), color='red', label='Regresi Linier')
+            ax.set_xlabel(f'{fitur[0]}')
+            ax.set_title(f'Regresi Linier antara {fitur[0]} dan PM2.5')
+        else:
+            ax.scatter(results.predict(sampel), sampel['PM2.5'], alpha=0.5, label ="Data Observasi")
+            batas = [sampel['PM2.5'].min(), sampel['PM2.5'].max()]
+            ax.plot(batas, batas, color='red', label='Prediksi = Observasi')
+            ax.set_xlabel('Prediksi PM2.5 (' + ', '.join(fitur) + ')')
+            ax.set_title('Regresi Linier Berganda terhadap PM2.5')
+        ax.set_ylabel('PM2.5')
+        ax.legend()
+        return fig
+    tampilkan_grafik('regresi', tuple(fitur), fingerprint, gambar)
+    st.caption('Titik pada grafik adalah sampel acak 5000 observasi; model dihitung dari seluruh data')
     with st.expander("Penjelasaan Grafik Regresi Linear"):
         st.write('Grafik regresi linear menampilkan hubungan antara variabel suhu (TEMP) dan PM2.5. Dalam grafik ini, titik-titik merepresentasikan data pengamatan yang diamati. Garis merah menunjukkan pola atau tren umum dari data tersebut. Dengan melihat grafik, kita dapat mengidentifikasi arah dan kekuatan hubungan antara suhu dan tingkat PM2.5. Titik-titik yang berdekatan atau berkelompok menunjukkan kecenderungan di mana data cenderung berkumpul. Ini membantu kita memahami sebaran data serta pola umum dari hubungan antara suhu dan tingkat PM2.5.') 
 
@@ -357,33 +409,27 @@ def visualisasi_regresi(data):
 # testing end
 
 #Proses Tab 3
-def korelasiSO(data):
-
-    quest3 = data[['TEMP','PRES','WSPM','CO']]
-
-    plt.figure(figsize=(8, 5))
-    sns.heatmap(quest3.corr(), cmap='Blues', annot=True, fmt='.2f')
-    plt.suptitle("Korelasi kandungan CO", y=1.02)
-    plt.show()
-    st.pyplot(plt)
-
-def korelasiSO2(data):
-    quest4 = data[['TEMP','PRES','WSPM','SO2']]
-
-    plt.figure(figsize=(8, 5))
-    sns.heatmap(quest4.corr(), cmap='Blues', annot=True, fmt='.2f')
-    plt.suptitle("Korelasi kandungan SO2", y=1.02)
-    plt.show()
-    st.pyplot(plt)
-
-def korelasiNO2(data):
-    quest6 = data[['TEMP','PRES','WSPM','O3']]
-
-    plt.figure(figsize=(8, 5))
-    sns.heatmap(quest6.corr(), cmap='Blues', annot=True, fmt='.2f')
-    plt.suptitle("Korelasi kandungan O3", y=1.02)
-    plt.show()
-    st.pyplot(plt)
+# semua heatmap mengambil irisan dari matriks korelasi yang sama
+def heatmap_korelasi(matriks, judul):
+    fig, ax = plt.subplots(figsize=(max(8, 0.8 * len(matriks)), max(5, 0.6 * len(matriks))))
+    sns.heatmap(matriks, cmap='Blues', annot=True, fmt='.2f', ax=ax)
+    fig.suptitle(judul, y=1.02)
+    return fig
+
+@profiling.profiled
+def korelasiSO(korelasi, fingerprint):
+    quest3 = ['TEMP','PRES','WSPM','CO']
+    tampilkan_grafik('korelasi', tuple(quest3), fingerprint, lambda: heatmap_korelasi(korelasi.slice(quest3), "Korelasi kandungan CO"))
+
+@profiling.profiled
+def korelasiSO2(korelasi, fingerprint):
+    quest4 = ['TEMP','PRES','WSPM','SO2']
+    tampilkan_grafik('korelasi', tuple(quest4), fingerprint, lambda: heatmap_korelasi(korelasi.slice(quest4), "Korelasi kandungan SO2"))
+
+@profiling.profiled
+def korelasiNO2(korelasi, fingerprint):
+    quest6 = ['TEMP','PRES','WSPM','O3']
+    tampilkan_grafik('korelasi', tuple(quest6), fingerprint, lambda: heatmap_korelasi(korelasi.slice(quest6), "Korelasi kandungan O3"))
     with st.expander("See explanation"):
         st.write(
         """ 
@@ -399,25 +445,83 @@ def korelasiNO2(data):
         """
     )
 
+@profiling.profiled
+def korelasi_interaktif(korelasi, fingerprint):
+    # pilihan variabel/metode/kelompok hanya mengiris matriks yang sudah dihitung
+    st.subheader('Korelasi Variabel Pilihan')
+    kolom = st.multiselect('Pilih variabel', korelasi.columns, default=['PM2.5', 'CO', 'TEMP', 'PRES', 'WSPM'])
+    col1, col2 = st.columns(2)
+    metode = col1.radio('Metode korelasi', ('Pearson', 'Spearman'), horizontal=True).lower()
+    nama_kelompok = {'Semua data': None, 'Per bulan': 'month', 'Per musim': 'season'}
+    pilihan_kelompok = col2.selectbox('Kelompokkan', list(nama_kelompok))
+    pengelompokan = nama_kelompok[pilihan_kelompok]
+    kelompok = None
+    if pengelompokan is not None:
+        kelompok = st.select_slider('Bulan' if pengelompokan == 'month' else 'Musim', korelasi.groups(pengelompokan))
+    if len(kolom) < 2:
+        st.warning('Pilihlah setidaknya dua variabel')
+        return
+    judul = f"Korelasi {metode.capitalize()}" + ('' if kelompok is None else f" ({pilihan_kelompok.lower()}: {kelompok})")
+    tampilkan_grafik('korelasi_pilihan', (tuple(kolom), metode, pengelompokan, kelompok), fingerprint,
+                     lambda: heatmap_korelasi(korelasi.slice(kolom, metode, pengelompokan, kelompok), judul))
+
+# mawar angin dan polutan per arah x kecepatan angin dari akumulator dataset (tanpa memindai data)
+STATISTIK_ANGIN = {'Rata-rata': None, 'Median': 50, 'Persentil 90': 90}
+
+@profiling.profiled
+def mawar_angin(wind, fingerprint):
+    st.subheader('Arah Angin dan Tingkat Polusi')
+    def gambar_mawar():
+        frekuensi = wind.frequency(normalize=True) * 100
+        sudut = np.deg2rad(np.arange(len(frekuensi)) * 360 / len(frekuensi))
+        fig, ax = plt.subplots(figsize=(8, 7), subplot_kw={'projection': 'polar'})
+        ax.set_theta_zero_location('N')
+        ax.set_theta_direction(-1)
+        bawah = np.zeros(len(frekuensi))
+        for kelas, warna in zip(frekuensi.columns, sns.color_palette('viridis', len(frekuensi.columns))):
+            ax.bar(sudut, frekuensi[kelas], width=0.9 * 2 * np.pi / len(frekuensi), bottom=bawah, color=warna,
+                   label=f'{kelas} m/s')
+            bawah += frekuensi[kelas].to_numpy()
+        ax.set_xticks(sudut)
+        ax.set_xticklabels(frekuensi.index)
+        ax.set_title('Frekuensi Arah dan Kecepatan Angin (%)')
+        ax.legend(title='WSPM', loc='upper left', bbox_to_anchor=(1.1, 1))
+        return fig
+    tampilkan_grafik('mawar_angin', (), fingerprint, gambar_mawar)
+
+    polutan = st.selectbox('Polutan', wind.columns, key='mawar_polutan')
+    statistik = st.radio('Statistik', list(STATISTIK_ANGIN), horizontal=True, key='mawar_statistik')
+    def gambar_polutan():
+        persentil = STATISTIK_ANGIN[statistik]
+        tabel = wind.mean(polutan) if persentil is None else wind.percentile(polutan, persentil)
+        fig, ax = plt.subplots(figsize=(8, 7))
+        sns.heatmap(tabel, cmap='Reds', annot=True, fmt='.0f', ax=ax)
+        ax.set_xlabel('Kecepatan Angin (m/s)')
+        ax.set_ylabel('Arah Angin')
+        ax.set_title(f'{statistik} {polutan} per Arah dan Kecepatan Angin')
+        return fig
+    tampilkan_grafik('polutan_arah_angin', (polutan, statistik), fingerprint, gambar_polutan)
+    with st.expander('Penjelasan Arah Angin'):
+        st.write('Mawar angin menunjukkan seberapa sering angin bertiup dari tiap arah dan pada kecepatan berapa. '
+                 'Tabel di bawahnya menunjukkan tingkat polutan untuk setiap kombinasi arah dan kecepatan angin, '
+                 'sehingga terlihat arah angin mana yang membawa udara lebih tercemar. Median dan persentil '
+                 'dihitung dari histogram sehingga merupakan perkiraan.')
+
 #Proses Tab 4
-def pola_curah_hujan (data):
-    # Buat kolom 'bulan'
-    data['bulan'] = data['tanggal'].dt.strftime('%Y-%m')
-    # Perbandingan Per Bulan
-    monthly_comparison = data.groupby('bulan').mean()
-    # Ekstrak bulan dari kolom tanggal
-    data['bulan'] = data['tanggal'].dt.month
-    
-    # Perbandingan rata-rata curah hujan per bulan
-    monthly_rain_comparison = data.groupby('bulan')['RAIN'].mean()
-    
-    # Visualisasi pola musiman curah hujan
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=monthly_rain_comparison.index, y=monthly_rain_comparison)
-    plt.xlabel('Bulan')
-    plt.ylabel('Rata-rata Curah Hujan')
-    plt.title('Pola Musiman Curah Hujan')
-    st.pyplot(plt)
+@profiling.profiled
+def pola_curah_hujan (data_cube, fingerprint):
+    def gambar():
+        # Perbandingan rata-rata curah hujan per bulan (1-12) dari kubus bulanan
+        monthly_rain_comparison = aggregations.monthly_pattern(data_cube, 'RAIN')
+
+        # Visualisasi pola musiman curah hujan
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.barplot(x=monthly_rain_comparison.index, y=monthly_rain_comparison, ax=ax)
+        ax.set_xlabel('Bulan')
+        ax.set_ylabel('Rata-rata Curah Hujan')
+        ax.set_title('Pola Musiman Curah Hujan')
+        return fig
+    tampilkan_grafik('curah_hujan_bulanan', ('RAIN',), fingerprint, gambar)
     with st.expander("See explanation"):
         st.write(
     """Untuk menentukan tingkat polusi udara saya mengambil berdasarkan PM2.5. PM2.5 sebuah istilah yang digunakan untuk mengukur partikel halus di udara, yang memiliki diameter kurang dari atau sama dengan 2.5 mikrometer. Partikel ini dapat berasal dari berbagai sumber, termasuk emisi kendaraan bermotor, industri, pembakaran biomassa, dan debu.
@@ -426,17 +530,11 @@ def pola_curah_hujan (data):
         )
 
 #Proses Tab 5
-def perbedaan_polusi(data):
-    # Table tingkat polusi udara
-    data['tanggal'] = pd.to_datetime(data[['year', 'month', 'day']], format='%Y-%m-%d')
+@profiling.profiled
+def perbedaan_polusi(korelasi, data_cube, fingerprint):
+    # Table tingkat polusi udara (semua polutan sekaligus dari kubus tahunan)
     st.write('#### Tabel Tahun dan Rata-rata Tingkat Polusi Udara Pertahun')
-    yearly_pm25_avg = data.groupby(data['tanggal'].dt.year)['PM2.5'].mean().reset_index()
-    yearly_pm10_avg = data.groupby(data['tanggal'].dt.year)['PM10'].mean().reset_index()
-    yearly_co_avg = data.groupby(data['tanggal'].dt.year)['CO'].mean().reset_index()
-    yearly_no2_avg = data.groupby(data['tanggal'].dt.year)['NO2'].mean().reset_index()
-    yearly_so2_avg = data.groupby(data['tanggal'].dt.year)['SO2'].mean().reset_index()
-    yearly_o3_avg = data.groupby(data['tanggal'].dt.year)['O3'].mean().reset_index()
-    yearly_pm_avg = pd.merge(yearly_pm25_avg, pd.merge(yearly_pm10_avg, pd.merge(yearly_co_avg, pd.merge(yearly_no2_avg, pd.merge(yearly_so2_avg, yearly_o3_avg, on='tanggal', how='outer'), on='tanggal', how='outer'), on='tanggal', how='outer'), on='tanggal', how='outer'), on='tanggal', how='outer')
+    yearly_pm_avg = aggregations.yearly_means(data_cube).reset_index()
     yearly_pm_avg.columns = ['Tahun', 'Rata-rata PM2.5', 'Rata-rata PM10', 'Rata-rata CO', 'Rata-rata NO2', 'Rata-rata SO2', 'Rata-rata O3']
 
     yearly_pm_avg = yearly_pm_avg.applymap(lambda x: '{:.0f}'.format(x) if isinstance(x, (int, float)) else x)
@@ -467,14 +565,16 @@ def perbedaan_polusi(data):
         )
 
     st.subheader('Grafik Perbedaan Tingkat Polusi')
-    # Analisis korelasi
-    correlation_matrix = data[['PM2.5', 'TEMP', 'PRES', 'WSPM']].corr()
+    def gambar():
+        # Analisis korelasi
+        correlation_matrix = korelasi.slice(['PM2.5', 'TEMP', 'PRES', 'WSPM'])
 
-    # Visualisasi matriks korelasi menggunakan heatmap
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt='.2f', linewidths=.5, ax=ax)
-    plt.title('Matriks Korelasi antara Variabel Cuaca dan PM2.5')
-    st.pyplot(plt)
+        # Visualisasi matriks korelasi menggunakan heatmap
+        fig, ax = plt.subplots(figsize=(10, 8))
+        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt='.2f', linewidths=.5, ax=ax)
+        ax.set_title('Matriks Korelasi antara Variabel Cuaca dan PM2.5')
+        return fig
+    tampilkan_grafik('korelasi_cuaca_pm25', ('PM2.5', 'TEMP', 'PRES', 'WSPM'), fingerprint, gambar)
 
     with st.expander("Lihat Penjelasan"):
         st.write(
@@ -492,7 +592,8 @@ def perbedaan_polusi(data):
         )
 
 #Proses Tab 6   
-def Prediksi_PM25(data, model_type='Linear Regression', dataset_size=0.8):
+@profiling.profiled
+def Prediksi_PM25(data, fingerprint, stasiun, model_type='Linear Regression', dataset_size=0.8):
     st.subheader('Konfigurasi Model dan Dataset')
 
     #pilih variabel cuaca yang akan digunakan untuk prediksi
@@ -505,51 +606,58 @@ def Prediksi_PM25(data, model_type='Linear Regression', dataset_size=0.8):
         return
     
     #widget untuk memilih model regresi
-    model_type = st.selectbox('Pilih Model Regresi', ['Linear Regression', 'Random Forest'])
+    model_type = st.selectbox('Pilih Model Regresi', list(models.MODEL_TYPES))
     if model_type == 'Linear Regression':
         st.caption('Penggunaan regresi linear memberikan pemahaman yang lebih sederhana dan interpretatif')
-    else:
+    elif model_type == 'Random Forest':
         st.caption('Penggunaan Regresi Hutan Acak memberikan prediksi yang lebih akurat dalam hubungan yang lebih kompleks dalam data')
+    else:
+        st.caption('Gradient boosting berbasis histogram: akurat dan jauh lebih cepat dilatih daripada hutan acak')
 
     #widget untuk mengatur ukuran dataset pengujian
     dataset_size = st.slider('Ukuran Dataset Pengujian', 0.1, 0.9, 0.8, step=0.05)
-    st.caption('Ukuran dataset sangat mempengaruhi dari hasil prediksi')
+    st.caption('Ukuran dataset sangat mempengaruhi dari hasil prediksi. Data pengujian adalah bagian akhir periode data')
 
     
     #pilih variabel target (misalnya, PM2.5)
     target = 'PM2.5'
-    #pisahkan data menjadi dataset latihan dan pengujian
-    X_train, X_test, y_train, y_test = train_test_split(data[features], data[target], test_size=dataset_size, random_state=42)
-    
-    #inisialisasi model
-    if model_type == 'Linear Regression':
-        model = LinearRegression()
-    else:
-        model = RandomForestRegressor()
-    
-    #latih model pada dataset latihan
-    model.fit(X_train, y_train)
-    
-    #lakukan prediksi pada dataset pengujian
-    y_pred = model.predict(X_test)
-    
+    #model diambil dari registry (memori/disk) per (fitur, model, ukuran uji, seed, data);
+    #jika belum ada, dilatih di thread latar belakang sehingga halaman tidak menunggu.
+    #Model dari versi data lama untuk stasiun yang sama dihapus setelah model baru tersimpan
+    registry = get_model_registry()
+    key = models.model_key(features, model_type, dataset_size, 42, fingerprint)
+    load_xy = lambda: urut_waktu(data, features, target)
+    hasil, job = registry.get_or_submit(key, load_xy, model_type, dataset_size, seed=42, features=features,
+                                        group=','.join(stasiun), version=data.index.max().isoformat())
+    if hasil is None:
+        if job.error is not None:
+            st.error(f'Pelatihan model gagal: {job.error}')
+            # pekerjaan yang gagal sudah dilepas registry; rerun berikutnya melatih ulang
+            st.button('Coba Lagi')
+        else:
+            st.progress(job.progress, text=f'Model {model_type} sedang dilatih di latar belakang ({job.progress:.0%})')
+            st.button('Perbarui Status')
+        return
+
     #hitung Mean Squared Error sebagai metrik evaluasi
-    mse = mean_squared_error(y_test, y_pred)
+    mse = hasil['mse']
     st.write(f'Mean Squared Error: {mse}')
-
-    # Visualisasi hasil prediksi
-    fig, ax = plt.subplots(figsize=(10, 6))
-    #plot data aktual
-    ax.scatter(X_test[features[0]], y_test, label='Actual', alpha=0.8, color='lightblue')
-    # Plot data prediksi
-    ax.scatter(X_test[features[0]], y_pred, label='Predicted', alpha=0.5, color='lightcoral')
-    #atur label
-    ax.set_xlabel('(' + ', '.join(features)+')')
-    ax.set_ylabel('Tingkat PM2.5')
-    ax.set_title('Prediksi Tingkat PM2.5 Berdasarkan ' + ', '.join(features))
-    ax.legend()
-    
-    st.pyplot(fig)
+    st.caption(f'Model tersimpan untuk prediksi batch: `python predict.py --model {key} --input <file>`')
+
+    # Visualisasi hasil prediksi; kunci model sudah mencakup fitur, jenis model dan data
+    def gambar():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        #plot data aktual (sampel data uji yang disimpan di artefak)
+        ax.scatter(hasil['X_sample'][:, 0], hasil['y_sample'], label='Actual', alpha=0.8, color='lightblue')
+        # Plot data prediksi
+        ax.scatter(hasil['X_sample'][:, 0], hasil['y_pred_sample'], label='Predicted', alpha=0.5, color='lightcoral')
+        #atur label
+        ax.set_xlabel('(' + ', '.join(features)+')')
+        ax.set_ylabel('Tingkat PM2.5')
+        ax.set_title('Prediksi Tingkat PM2.5 Berdasarkan ' + ', '.join(features))
+        ax.legend()
+        return fig
+    tampilkan_grafik('prediksi_pm25', (key,), fingerprint, gambar)
 
     with st.expander('Penjelasan Tingkat Prediksi PM2.5'):
         st.write("Prediksi tingkat PM2.5 dapat dilakukan dengan parameter TEMP, DEWP, dan WSPM. Bukan hanya itu, untuk memprediksi tingkat PM2.5 dapat menggunakan"
@@ -562,153 +670,357 @@ def Prediksi_PM25(data, model_type='Linear Regression', dataset_size=0.8):
     st.caption("DEWP : Dew Point (Titik Embun)")
     st.caption("WSPM : Wetland Surface Water Model (Aliran & Tinggi Air)")
 
+    st.write('<hr>', unsafe_allow_html=True)
+    evaluasi_model(data, features, fingerprint)
+
+def urut_waktu(data, features, target='PM2.5'):
+    # (X, y) berurutan waktu; data beberapa stasiun disusun per stasiun sehingga perlu diurutkan
+    data = data[features + [target]]
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index(kind='stable')
+    return data[features].to_numpy(dtype='float64'), data[target].to_numpy(dtype='float64')
+
+@profiling.profiled
+def evaluasi_model(data, features, fingerprint):
+    st.subheader('Evaluasi Model (Validasi Silang Deret Waktu)')
+    st.caption(f'TimeSeriesSplit {evaluation.N_SPLITS} fold: setiap model dilatih pada data masa lalu dan diuji pada periode sesudahnya. '
+               'Linear Regression, Random Forest dan HistGradientBoosting dengan beberapa kombinasi hyperparameter dijalankan paralel.')
+    evaluator = get_evaluator()
+    key = models.model_key(features, 'evaluasi', 0, 42, fingerprint)
+    job = evaluator.job(key)
+    if job is None:
+        if st.button('Jalankan Evaluasi'):
+            job = evaluator.submit(key, lambda: urut_waktu(data, features), fingerprint, features)
+        else:
+            return
+    if job.error is not None:
+        st.error(f'Evaluasi gagal: {job.error}')
+    elif job.result is None:
+        st.progress(job.progress, text=f'Evaluasi berjalan di latar belakang ({job.progress:.0%})')
+        st.button('Perbarui Status Evaluasi')
+    else:
+        folds, papan = job.result
+        st.dataframe(papan.style.format({'rmse': '{:.2f}', 'mse': '{:.1f}', 'mse_std': '{:.1f}', 'mae': '{:.2f}',
+                                         'fit_s': '{:.3f}', 'predict_us_per_row': '{:.2f}'}))
+        terbaik, termurah = papan.iloc[0], papan.sort_values('predict_us_per_row').iloc[0]
+        st.write(f"Paling akurat: **{terbaik['model']}** ({terbaik['params']}), RMSE {terbaik['rmse']:.2f}. "
+                 f"Prediksi termurah: **{termurah['model']}**, {termurah['predict_us_per_row']:.2f} µs per baris.")
+        with st.expander('Hasil per fold'):
+            st.dataframe(folds)
+
+
+#Tab
+# hanya tab yang aktif yang dijalankan; hasil komputasinya di-cache sehingga
+# interaksi di satu tab tidak menghitung ulang tab lain
+#Proses Tab 7
+# rata-rata bergerak dan pelampauan baku mutu dari mesin rolling dataset (di-cache per polutan)
+WARNA_AQI = ['#00e400', '#ffff00', '#ff7e00', '#ff0000', '#99004c', '#7e0023']
+
+@profiling.profiled
+def pelampauan_baku_mutu(engine, fingerprint):
+    col1, col2 = st.columns(2)
+    polutan = col1.selectbox('Polutan', list(rolling.WINDOWS), key='rolling_polutan')
+    standar = col2.selectbox('Baku Mutu', list(rolling.STANDARDS), key='rolling_standar')
+    ambang = rolling.STANDARDS[standar][polutan]
+    jendela = rolling.WINDOWS[polutan]
+    ringkasan = engine.summary(polutan, ambang)
+    episode = ringkasan['episodes']
+
+    st.write(f'Ambang rata-rata {jendela} jam {polutan} menurut {standar}: **{ambang:g} µg/m³**')
+    kolom = st.columns(4)
+    kolom[0].metric('Jam di Atas Ambang', f"{ringkasan['hours']:,}",
+                    help=f"dari {ringkasan['valid_hours']:,} jam dengan rata-rata {jendela} jam yang sah")
+    kolom[1].metric('Hari Melampaui', f"{ringkasan['days']:,}")
+    kolom[2].metric('Jumlah Episode', f'{len(episode):,}')
+    kolom[3].metric('Episode Terpanjang (jam)', f"{episode['length'].max() if len(episode) else 0:,}")
+
+    def gambar_deret():
+        deret = engine.mean(polutan)
+        fig, ax = plt.subplots(figsize=(15, 6))
+        deret = downsample.downsample(deret, downsample.pixel_budget(fig), method='minmax')
+        ax.plot(deret.index, deret, linewidth=0.8, label=f'Rata-rata {jendela} jam')
+        ax.axhline(ambang, color='red', linestyle='--', label=f'Ambang {standar}')
+        ax.fill_between(deret.index, deret, ambang, where=deret > ambang, interpolate=True, color='red', alpha=0.3)
+        ax.set_xlabel('Waktu')
+        ax.set_ylabel(f'{polutan} (µg/m³)')
+        ax.set_title(f'Rata-rata Bergerak {jendela} Jam {polutan}')
+        ax.legend()
+        return fig
+    tampilkan_grafik('rolling_pelampauan', (polutan, standar), fingerprint, gambar_deret)
+
+    def gambar_kategori():
+        kategori = ringkasan['categories']
+        fig, ax = plt.subplots(figsize=(10, 5))
+        ax.bar(kategori.index, kategori, color=WARNA_AQI, edgecolor='black')
+        ax.set_ylabel('Jumlah Jam')
+        ax.set_title(f'Jumlah Jam per Kategori AQI ({polutan} rata-rata {jendela} jam)')
+        plt.xticks(rotation=20, ha='right')
+        return fig
+    tampilkan_grafik('rolling_kategori_aqi', (polutan,), fingerprint, gambar_kategori)
+
+    st.subheader('Episode Pelampauan Terpanjang')
+    st.dataframe(episode.nlargest(10, 'length').rename(columns={
+        'start': 'Mulai', 'end': 'Selesai', 'length': 'Durasi (jam)', 'peak': 'Puncak (µg/m³)'}).round(1), hide_index=True)
+    with st.expander('Penjelasan Pelampauan'):
+        st.write('Rata-rata bergerak dihitung dari rata-rata per jam semua stasiun terpilih dan dianggap sah jika '
+                 'minimal 75% jam dalam jendelanya berdata. Hari melampaui adalah hari dengan rata-rata bergerak '
+                 'tertinggi di atas ambang (untuk O3: rata-rata 8 jam maksimum harian), dan episode adalah rangkaian '
+                 'jam berturut-turut di atas ambang. Kategori AQI mengikuti batas HJ 633-2012.')
+
+@profiling.profiled
+def tab_1(dataset, dataset_fingerprint):
+    data_cube = dataset.cube
+    data_clean = cleaning_data(dataset)
+    st.markdown("**Nama : Muhammad Farid Nurrahman**")
+    st.markdown("**Nim : 10122256**")
+    st.write('')
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **1. Bagaimana perbandingan tingkat polusi udara perhari,perbulan dan pertahun?**
+                - **2. Apakah tingkat SO2, NO2, dan O3 lebih tinggi pada hari dengan suhu tinggi atau rendah?**
+                """)
+    st.write('')
+    main_visualization(data_clean, data_cube, dataset_fingerprint)
+    st.write('<hr>', unsafe_allow_html=True)
+    visualization_temp_air(dataset, dataset_fingerprint)
+
+@profiling.profiled
+def tab_2(dataset, dataset_fingerprint):
+    data_cube = dataset.cube
+    data_clean = cleaning_data(dataset)
+    data_clean_hourly = cleaning_data_hourly(dataset)
+    st.markdown("**Nama : Erwin Hafiz Triadi**")
+    st.markdown("**Nim : 10122269**")
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **1. Bagaimana tren kualitas udara berdasarkan PM2.5, PM10, SO2, NO2, CO, dan O3 selama periode waktu tertentu?**
+                - **2. Penerapan Clustering & Analisis Regresi terhadap informasi no-1 dan tren yang tercipta**
+                """)
+    st.write('')
+    st.write("Data yang Digunakan di Aotizhongxin")
+    st.write(data_clean.tail(50))
+    st.header("Overview tren sepanjang waktu")
+    Air_Pollution_Hourly_Umum(data_cube,"PM10", dataset_fingerprint)
+    with st.expander("Penjelasan Tingkat PM10 per Jam dalam Sehari Sepanjang waktu") :
+      st.write('Grafik di atas menampilkan perubahan tingkat PM10 dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola kenaikan dan penurunan tingkat PM10 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi PM10 bervariasi selama periode waktu tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian PM10 penting untuk mengambil tindakan yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.') 
+    st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
+    Air_Pollution_Hourly_Umum(data_cube,"PM2.5", dataset_fingerprint)
+    with st.expander("Penjelasan Tingkat PM2.5 per Jam dalam Sehari Sepanjang waktu") :
+      st.write('Grafik di atas memberikan gambaran tentang perubahan tingkat PM2.5 dalam udara sepanjang waktu dalam satu hari. Dari grafik tersebut, kita dapat mengidentifikasi pola tren, baik peningkatan maupun penurunan, dalam tingkat PM2.5 dari jam ke jam selama satu hari. Informasi ini membantu dalam pemahaman tentang fluktuasi harian tingkat PM2.5, yang dapat berkorelasi dengan aktivitas manusia, kondisi cuaca, dan faktor-faktor lingkungan lainnya. Dengan memahami tren harian ini, kita dapat mengambil langkah-langkah yang sesuai untuk mengelola kualitas udara dan menjaga kesehatan masyarakat.')
+    st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
+    Air_Pollution_Hourly_Umum(data_cube,"SO2", dataset_fingerprint)
+    with st.expander("Penjelasan Tingkat SO2(Sulfur dioksida) per Jam dalam Sehari Sepanjang waktu") :
+      st.write('Grafik di atas menunjukkan perubahan tingkat sulfur dioksida (SO2) dalam udara selama periode satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat SO2 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi SO2 berubah selama periode tertentu dalam satu hari. Perubahan ini bisa dipengaruhi oleh aktivitas manusia seperti pembakaran bahan bakar fosil, industri, dan transportasi, serta faktor alam seperti aktivitas gunung berapi. Memahami tren harian SO2 penting untuk mengidentifikasi sumber polusi dan mengambil langkah-langkah untuk mengurangi dampaknya terhadap kualitas udara dan kesehatan manusia.')
+    st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
+    Air_Pollution_Hourly_Umum(data_cube,"O3", dataset_fingerprint)
+    with st.expander("Penjelasan Tingkat O3(Ozon) per Jam dalam Sehari Sepanjang waktu") :
+      st.write('Grafik di atas menggambarkan perubahan tingkat ozon (O3) dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat ozon dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi ozon berubah selama periode tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian ozon penting untuk mengambil langkah-langkah yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.')
+    st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
+    Air_Pollution_Hourly_Umum(data_cube,"NO2", dataset_fingerprint)
+    with st.expander("Penjelasan Tingkat NO2(Nitrogen Dioksida) per Jam dalam Sehari Sepanjang waktu") :
+      st.write('Grafik di atas menggambarkan perubahan tingkat nitrogen dioksida (NO2) dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat NO2 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi NO2 berubah selama periode tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian NO2 penting untuk mengambil langkah-langkah yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.')
+    st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
+    st.subheader("Pilih perbandingan")
+    pilih_perbandingan2 = st.radio(
+          "Pilihan perbandingan",
+          ("Satu Tahun Terakhir","Satu Bulan Terakhir","Rentang Tanggal")
+      )
 
-df_Data = load_data("https://raw.githubusercontent.com/MFaridN/UAS_PDSD/main/PRSA_Data_Aotizhongxin_20130301-20170228.csv")
-data_clean = cleaning_data (df_Data)
-data_clean_wd = cleaning_data_wd (df_Data)
-data_clean_hourly = cleaning_data_hourly(data_clean)
+    if pilih_perbandingan2 == "Satu Tahun Terakhir":
+            st.header("Satu Tahun Terakhir")
+            st.write("Pada grafik di bawah ini merupakan perbandingan tren antar jenis polutan dalam waktu 1 (satu) tahun terakhir dari data yang digunakan")
+            Air_Pollution_One_Year(data_cube,"PM10", dataset_fingerprint)
+            Air_Pollution_One_Year(data_cube,"PM2.5", dataset_fingerprint)
+            Air_Pollution_One_Year(data_cube,"SO2", dataset_fingerprint)
+            Air_Pollution_One_Year(data_cube,"O3", dataset_fingerprint)
+            Air_Pollution_One_Year(data_cube,"NO2", dataset_fingerprint)
+
+    elif pilih_perbandingan2 == "Satu Bulan Terakhir":
+            st.header("Satu Bulan Terakhir")
+            st.write("Pada grafik di bawah ini merupakan perbandingan tren antar jenis polutan dalam waktu 1 (satu) bulan terakhir dari data yang digunakan (sepanjang waktu)")
+            Air_Pollution_Last_Month(data_cube,"PM10", dataset_fingerprint)
+            Air_Pollution_Last_Month(data_cube,"PM2.5", dataset_fingerprint)
+            Air_Pollution_Last_Month(data_cube,"SO2", dataset_fingerprint)
+            Air_Pollution_Last_Month(data_cube,"O3", dataset_fingerprint)
+            Air_Pollution_Last_Month(data_cube,"NO2", dataset_fingerprint)
+
+    elif pilih_perbandingan2 == "Rentang Tanggal":
+            st.header("Rentang Tanggal")
+            awal_data, akhir_data = data_cube.time_range('hour')
+            rentang = st.date_input("Pilih rentang tanggal", (akhir_data.date() - pd.Timedelta(days=30), akhir_data.date()),
+                                    min_value=awal_data.date(), max_value=akhir_data.date())
+            if len(rentang) != 2:
+                st.info('Pilih tanggal awal dan akhir')
+            else:
+                # tanggal akhir inklusif sampai jam terakhir hari itu
+                start, end = pd.Timestamp(rentang[0]), pd.Timestamp(rentang[1]) + pd.Timedelta(hours=23)
+                keterangan = f'{rentang[0]} s.d. {rentang[1]}'
+                for pollutant in ["PM10", "PM2.5", "SO2", "O3", "NO2"]:
+                    Air_Pollution_Window(data_cube, pollutant, start, end, keterangan, dataset_fingerprint)
+
+    visualisasi_clustering(data_clean_hourly, dataset_fingerprint)
+    visualisasi_regresi(data_clean_hourly, dataset.ols, dataset_fingerprint)
+
+@profiling.profiled
+def tab_3(dataset, dataset_fingerprint):
+    st.markdown("**Nama :  Mochammad Syahrul Almugni Yusup**")
+    st.markdown("**Nim : 10122244**")
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **1. Bagaimana perbandingan tingkat polusi udara perharinya?**
+                """)
+    st.write('')
+    korelasi = get_korelasi(dataset)
+    korelasiSO(korelasi, dataset_fingerprint)
+    korelasiSO2(korelasi, dataset_fingerprint)
+    korelasiNO2(korelasi, dataset_fingerprint)
+    st.write('<hr>', unsafe_allow_html=True)
+    korelasi_interaktif(korelasi, dataset_fingerprint)
+    st.write('<hr>', unsafe_allow_html=True)
+    mawar_angin(dataset.wind, dataset_fingerprint)
 
-with st.sidebar:
-    selected = option_menu('Menu', ['Dashboard','Profile'],
-                           icons=["easel2", "graph-up"],
-                           menu_icon="cast",
-                           default_index=0)
-    
+@profiling.profiled
+def tab_4(dataset, dataset_fingerprint):
+    data_cube = dataset.cube
+    st.markdown("**Nama : Fikkry Ihza Fachrezi**")
+    st.markdown("**Nim : 10122510**")
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **Apakah ada perbedaan dalam tingkat polusi udara antara bulan-bulan tertentu atau jam-jam tertentu dalam sehari?**
+                """)
+    st.write('')
+    st.subheader('Perbedaan Tingkat Polusi')
+    perbedaan_polusi(get_korelasi(dataset), data_cube, dataset_fingerprint)
+
+@profiling.profiled
+def tab_5(dataset, dataset_fingerprint):
+    data_cube = dataset.cube
+    st.markdown("**Nama : Win Termulo Nova**")
+    st.markdown("**Nim : 10122273**")
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **Bagaimana pola musiman curah hujan memengaruhi kualitas udara**
+                """)
+    st.write('')
+    st.subheader('Pola Musiman Curah Hujan')
+    pola_curah_hujan (data_cube, dataset_fingerprint)
+
+@profiling.profiled
+def tab_6(dataset, dataset_fingerprint):
+    data_clean = cleaning_data(dataset)
+    st.markdown("**Nama : Muhammad Pradipta Waskitha**")
+    st.markdown("**Nim : 10122265**")
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **Bisakah Memprediksi tingkat PM2.5 Dengan Parameter TEMP,DEWP, dan WSPM?**
+                """)
+    st.write('')
+    Prediksi_PM25(data_clean, dataset_fingerprint, dataset.stations)
+
+@profiling.profiled
+def tab_7(dataset, dataset_fingerprint):
+    st.markdown("""
+                ### Informasi yang ingin disampaikan
+                - **Seberapa sering dan seberapa lama kualitas udara melampaui baku mutu PM2.5, PM10 dan O3?**
+                """)
+    st.write('')
+    st.subheader('Rata-rata Bergerak dan Pelampauan Baku Mutu')
+    pelampauan_baku_mutu(dataset.rolling, dataset_fingerprint)
+
+TABS = {
+    "TAB 1": tab_1,
+    "TAB 2": tab_2,
+    "TAB 3": tab_3,
+    "TAB 4": tab_4,
+    "TAB 5": tab_5,
+    "TAB 6": tab_6,
+    "TAB 7": tab_7,
+}
+
+def tampilkan_halaman():
+    with st.sidebar:
+        selected = option_menu('Menu', ['Dashboard','Profile'],
+                               icons=["easel2", "graph-up"],
+                               menu_icon="cast",
+                               default_index=0)
+        manifest, _ = storage.ensure_partitions(storage.DEFAULT_SOURCE)
+        daftar_stasiun = sorted(manifest)
+        stasiun = st.multiselect('Pilih Stasiun', daftar_stasiun, default=daftar_stasiun[:1])
+
+    if not stasiun:
+        st.warning('Pilihlah setidaknya satu **stasiun**')
+        return
+
+    csv_fingerprint = storage.sources_fingerprint(storage.discover_sources(storage.DEFAULT_SOURCE))
+    with profiling.stage('load_data', cached=True) as tahap:
+        # urutan pilihan tidak memengaruhi data; kunci cache memakai urutan tetap agar tidak ada salinan ganda
+        df_Data = load_data(storage.dataset_fingerprint(csv_fingerprint, stasiun), tuple(sorted(stasiun)), manifest)
+        tahap['rows'] = len(df_Data.clean)
+    with profiling.stage('refresh'):
+        df_Data.refresh(manifest)
+    dataset_fingerprint = df_Data.fingerprint
+    data_clean_wd = cleaning_data_wd (df_Data)
     
-if (selected == 'Dashboard') :
-    st.header(f"Analisis Kualitas Udara")
-    st.write('Menggunakan Data Kota Aotizhongxin')
-    st.write(data_clean_wd.drop(columns=['No']).head(100))
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["TAB 1", "TAB 2", "TAB 3", "TAB 4", "TAB 5","TAB 6"])
-
-    with tab1:
-        st.markdown("**Nama : Muhammad Farid Nurrahman**")
-        st.markdown("**Nim : 10122256**")
-        st.write('')
-        st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **1. Bagaimana perbandingan tingkat polusi udara perhari,perbulan dan pertahun?**
-                    - **2. Apakah tingkat SO2, NO2, dan O3 lebih tinggi pada hari dengan suhu tinggi atau rendah?**
-                    """)
-        st.write('')
-        main_visualization(data_clean)
-        st.write('<hr>', unsafe_allow_html=True)
-        visualization_temp_air(data_clean)
-        
-    with tab2:
-        st.markdown("**Nama : Erwin Hafiz Triadi**")
-        st.markdown("**Nim : 10122269**")
-        st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **1. Bagaimana tren kualitas udara berdasarkan PM2.5, PM10, SO2, NO2, CO, dan O3 selama periode waktu tertentu?**
-                    - **2. Penerapan Clustering & Analisis Regresi terhadap informasi no-1 dan tren yang tercipta**
-                    """)
-        st.write('')
-        st.write("Data yang Digunakan di Aotizhongxin")
-        st.write(data_clean.tail(50))
-        st.header("Overview tren sepanjang waktu")
-        Air_Pollution_Hourly_Umum(data_clean,"PM10")
-        with st.expander("Penjelasan Tingkat PM10 per Jam dalam Sehari Sepanjang waktu") :
-          st.write('Grafik di atas menampilkan perubahan tingkat PM10 dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola kenaikan dan penurunan tingkat PM10 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi PM10 bervariasi selama periode waktu tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian PM10 penting untuk mengambil tindakan yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.') 
-        st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
-        Air_Pollution_Hourly_Umum(data_clean,"PM2.5")
-        with st.expander("Penjelasan Tingkat PM2.5 per Jam dalam Sehari Sepanjang waktu") :
-          st.write('Grafik di atas memberikan gambaran tentang perubahan tingkat PM2.5 dalam udara sepanjang waktu dalam satu hari. Dari grafik tersebut, kita dapat mengidentifikasi pola tren, baik peningkatan maupun penurunan, dalam tingkat PM2.5 dari jam ke jam selama satu hari. Informasi ini membantu dalam pemahaman tentang fluktuasi harian tingkat PM2.5, yang dapat berkorelasi dengan aktivitas manusia, kondisi cuaca, dan faktor-faktor lingkungan lainnya. Dengan memahami tren harian ini, kita dapat mengambil langkah-langkah yang sesuai untuk mengelola kualitas udara dan menjaga kesehatan masyarakat.')
-        st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
-        Air_Pollution_Hourly_Umum(data_clean,"SO2")
-        with st.expander("Penjelasan Tingkat SO2(Sulfur dioksida) per Jam dalam Sehari Sepanjang waktu") :
-          st.write('Grafik di atas menunjukkan perubahan tingkat sulfur dioksida (SO2) dalam udara selama periode satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat SO2 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi SO2 berubah selama periode tertentu dalam satu hari. Perubahan ini bisa dipengaruhi oleh aktivitas manusia seperti pembakaran bahan bakar fosil, industri, dan transportasi, serta faktor alam seperti aktivitas gunung berapi. Memahami tren harian SO2 penting untuk mengidentifikasi sumber polusi dan mengambil langkah-langkah untuk mengurangi dampaknya terhadap kualitas udara dan kesehatan manusia.')
-        st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
-        Air_Pollution_Hourly_Umum(data_clean,"O3")
-        with st.expander("Penjelasan Tingkat O3(Ozon) per Jam dalam Sehari Sepanjang waktu") :
-          st.write('Grafik di atas menggambarkan perubahan tingkat ozon (O3) dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat ozon dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi ozon berubah selama periode tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian ozon penting untuk mengambil langkah-langkah yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.')
-        st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
-        Air_Pollution_Hourly_Umum(data_clean,"NO2")
-        with st.expander("Penjelasan Tingkat NO2(Nitrogen Dioksida) per Jam dalam Sehari Sepanjang waktu") :
-          st.write('Grafik di atas menggambarkan perubahan tingkat nitrogen dioksida (NO2) dalam udara selama periode waktu satu hari. Dari grafik tersebut, kita dapat melihat pola naik turunnya tingkat NO2 dari jam ke jam sepanjang hari. Informasi ini membantu kita memahami bagaimana konsentrasi NO2 berubah selama periode tertentu dalam satu hari. Perubahan ini dapat dipengaruhi oleh berbagai faktor, termasuk aktivitas manusia, kondisi cuaca, dan pola pergerakan udara. Memahami tren harian NO2 penting untuk mengambil langkah-langkah yang diperlukan guna menjaga kualitas udara dan kesehatan masyarakat.')
-        st.write('<hr>', unsafe_allow_html=True) #hr Garis Pemisah
-        st.subheader("Pilih perbandingan")
-        pilih_perbandingan2 = st.radio(
-              "Pilihan perbandingan",
-              ("Satu Tahun Terakhir","Satu Bulan Terakhir")
-          )
-      
-        if pilih_perbandingan2 == "Satu Tahun Terakhir":
-                st.header("Satu Tahun Terakhir")
-                st.write("Pada grafik di bawah ini merupakan perbandingan tren antar jenis polutan dalam waktu 1 (satu) tahun terakhir dari data yang digunakan")
-                Air_Pollution_One_Year(data_clean_hourly,"PM10")
-                Air_Pollution_One_Year(data_clean_hourly,"PM2.5")
-                Air_Pollution_One_Year(data_clean_hourly,"SO2")
-                Air_Pollution_One_Year(data_clean_hourly,"O3")
-                Air_Pollution_One_Year(data_clean_hourly,"NO2")
-
-        elif pilih_perbandingan2 == "Satu Bulan Terakhir":
-                st.header("Satu Bulan Terakhir")
-                st.write("Pada grafik di bawah ini merupakan perbandingan tren antar jenis polutan dalam waktu 1 (satu) bulan terakhir dari data yang digunakan (sepanjang waktu)")
-                Air_Pollution_Last_Month(data_clean_hourly,"PM10")
-                Air_Pollution_Last_Month(data_clean_hourly,"PM2.5")
-                Air_Pollution_Last_Month(data_clean_hourly,"SO2")
-                Air_Pollution_Last_Month(data_clean_hourly,"O3")
-                Air_Pollution_Last_Month(data_clean_hourly,"NO2")
-
-        visualisasi_clustering(data_clean_hourly)
-        visualisasi_regresi(data_clean_hourly)
+    if (selected == 'Dashboard') :
+        st.header(f"Analisis Kualitas Udara")
+        st.write('Menggunakan Data Stasiun ' + ', '.join(stasiun))
+        st.write(data_clean_wd.drop(columns=['No']).head(100))
+        tab_aktif = st.radio('Tab', list(TABS), horizontal=True, key='tab_aktif', label_visibility='collapsed')
+        TABS[tab_aktif](df_Data, dataset_fingerprint)
         
-    with tab3:
-        st.markdown("**Nama :  Mochammad Syahrul Almugni Yusup**")
-        st.markdown("**Nim : 10122244**")
+    elif (selected == 'Profile') :
+        st.header('Proyek Analisis Data: Air Quality Dataset')
         st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **1. Bagaimana perbandingan tingkat polusi udara perharinya?**
+                    ### Kelompok : IF7- Numpy
+                    **Anggota :**
+                    - **10122244 - MOCHAMMAD SYAHRUL ALMUGNI YUSUP**
+                    - **10122256 - MUHAMMAD FARID NURRAHMAN**
+                    - **10122265 - MUHAMMAD PRADIPTA WASKITHA**
+                    - **10122269 - ERWIN HAFIZ TRIADI**
+                    - **10122269 - ERWIN HAFIZ TRIADI**
+                    - **10122273 - WIN TERMULO NOVA**
+                    - **10122510 - FIKKRY IHZA FACHREZI**
                     """)
-        st.write('')
-        korelasiSO(data_clean)
-        korelasiSO2(data_clean)
-        korelasiNO2(data_clean)
-        
-    with tab4:
-        st.markdown("**Nama : Fikkry Ihza Fachrezi**")
-        st.markdown("**Nim : 10122510**")
-        st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **Apakah ada perbedaan dalam tingkat polusi udara antara bulan-bulan tertentu atau jam-jam tertentu dalam sehari?**
-                    """)
-        st.write('')
-        st.subheader('Perbedaan Tingkat Polusi')
-        perbedaan_polusi(data_clean)
 
-    with tab5:
-        st.markdown("**Nama : Win Termulo Nova**")
-        st.markdown("**Nim : 10122273**")
-        st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **Bagaimana pola musiman curah hujan memengaruhi kualitas udara**
-                    """)
-        st.write('')
-        st.subheader('Pola Musiman Curah Hujan')
-        pola_curah_hujan (data_clean)
-    
-    with tab6:
-        st.markdown("**Nama : Muhammad Pradipta Waskitha**")
-        st.markdown("**Nim : 10122265**")
-        st.markdown("""
-                    ### Informasi yang ingin disampaikan
-                    - **Bisakah Memprediksi tingkat PM2.5 Dengan Parameter TEMP,DEWP, dan WSPM?**
-                    """)
-        st.write('')
-        Prediksi_PM25(data_clean)
-        
-elif (selected == 'Profile') :
-    st.header('Proyek Analisis Data: Air Quality Dataset')
-    st.markdown("""
-                ### Kelompok : IF7- Numpy
-                **Anggota :**
-                - **10122244 - MOCHAMMAD SYAHRUL ALMUGNI YUSUP**
-                - **10122256 - MUHAMMAD FARID NURRAHMAN**
-                - **10122265 - MUHAMMAD PRADIPTA WASKITHA**
-                - **10122269 - ERWIN HAFIZ TRIADI**
-                - **10122269 - ERWIN HAFIZ TRIADI**
-                - **10122273 - WIN TERMULO NOVA**
-                - **10122510 - FIKKRY IHZA FACHREZI**
-                """)
-   
\ No newline at end of file
+def rekam_cprofile():
+    st.session_state['rekam_cprofile'] = True
+
+def panel_debug(profiler):
+    # panel opsional di sidebar: tabel tahap rerun terakhir, ekspor JSON lines dan hasil cProfile
+    with st.sidebar:
+        st.write('<hr>', unsafe_allow_html=True)
+        if not st.checkbox('Mode debug (profiling)', key='debug_profiling') or profiler is None:
+            return
+        tahap = pd.DataFrame(profiler.records)
+        if tahap.empty:
+            return
+        tahap['stage'] = ['  ' * depth + nama for depth, nama in zip(tahap['depth'], tahap['stage'])]
+        st.caption(f"Total rerun: {tahap.loc[tahap['depth'] == 0, 'wall_ms'].sum():.0f} ms")
+        st.dataframe(tahap[['stage', 'wall_ms', 'rows', 'mem_delta_mb', 'cache']].round(2), hide_index=True)
+        st.download_button('Unduh JSON lines', profiler.to_jsonl(), file_name=f'profil-{profiler.run_id}.jsonl')
+        st.button('Rekam cProfile satu rerun', on_click=rekam_cprofile)
+        if 'hasil_cprofile' in st.session_state:
+            with st.expander('Hasil cProfile'):
+                st.text(st.session_state['hasil_cprofile'])
+
+def main():
+    # profiling hanya aktif jika mode debug dinyalakan; tanpa itu stage() tidak melakukan apa pun
+    if not st.session_state.get('debug_profiling'):
+        tampilkan_halaman()
+        panel_debug(None)
+        return
+    profiler = profiling.Profiler()
+    with profiling.activate(profiler):
+        if st.session_state.pop('rekam_cprofile', False):
+            with profiling.capture() as hasil:
+                tampilkan_halaman()
+            st.session_state['hasil_cprofile'] = hasil[0]
+        else:
+            tampilkan_halaman()
+    profiler.export()
+    panel_debug(profiler)
+   
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Uji beban multi-sesi untuk dashboard
+#
+# Menjalankan server Streamlit headless (atau memakai server yang sudah berjalan
+# lewat --url), lalu membuka N sesi websocket bersamaan. Setiap sesi meminta
+# rerun awal lalu berpindah ke setiap tab seperti browser; latensi diukur dari
+# pesan rerun sampai server mengirim script_finished. Untuk tiap jumlah sesi
+# dicatat p50/p95/maks latensi, rerun per detik dan RSS server, lalu disimpan
+# sebagai JSON.
+#
+# Contoh:
+#   python loadtest.py --sessions 1 2 4 8
+#   python loadtest.py --url ws://localhost:8501 --sessions 16 --rounds 3
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from analytics import storage
+
+OUTPUT_DIR = os.path.join(storage.CACHE_DIR, 'loadtest')
+# label radio pemilih tab (key='tab_aktif') di dashboard.tampilkan_halaman
+TAB_LABEL = 'Tab'
+
+
+def start_server(port):
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'dashboard.py', '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        cwd=storage.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f'Server Streamlit tidak siap di port {port}')
+
+
+def rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return None
+
+
+class Session:
+    # satu sesi browser: websocket ke /_stcore/stream dan state widget yang dikirim tiap rerun
+    def __init__(self, url):
+        self.url = url.rstrip('/') + '/_stcore/stream'
+        self.ws = None
+        self.tab_id = None
+        self.tabs = []
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url)
+
+    async def rerun(self, tab=None):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        if tab is not None:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=self.tab_id, int_value=tab))
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise RuntimeError('Koneksi websocket ditutup server')
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and self.tab_id is None:
+                self._find_tabs(forward.delta)
+            elif kind == 'script_finished':
+                return time.perf_counter() - start
+
+    def _find_tabs(self, delta):
+        if delta.WhichOneof('type') != 'new_element' or delta.new_element.WhichOneof('type') != 'radio':
+            return
+        radio = delta.new_element.radio
+        if radio.label == TAB_LABEL:
+            self.tab_id, self.tabs = radio.id, list(radio.options)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+async def run_session(url, rounds):
+    # rerun awal + setiap tab sebanyak `rounds` putaran -> latensi tiap rerun (detik)
+    session = Session(url)
+    await session.connect()
+    try:
+        latencies = [await session.rerun()]
+        if session.tab_id is None:
+            raise RuntimeError(f'Radio {TAB_LABEL!r} tidak ditemukan di halaman')
+        for _ in range(rounds):
+            for tab in range(len(session.tabs)):
+                latencies.append(await session.rerun(tab))
+        return latencies
+    finally:
+        session.close()
+
+
+async def run_level(url, sessions, rounds):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_session(url, rounds) for _ in range(sessions)))
+    wall = time.perf_counter() - start
+    latencies = np.concatenate(results) * 1e3
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'max_ms': float(latencies.max()),
+        'wall_s': wall,
+        'reruns_per_s': len(latencies) / wall,
+    }
+
+
+def run(url, levels, rounds, server_pid=None):
+    # satu sesi pemanasan mengisi cache bersama (dataset, kubus, grafik, model) lebih dulu
+    warmup = asyncio.run(run_level(url, 1, 1))
+    print(f'pemanasan: {warmup["reruns"]} rerun, maks {warmup["max_ms"]:.0f} ms')
+    baseline_rss = rss_mb(server_pid) if server_pid else None
+    results = []
+    for sessions in levels:
+        stats = asyncio.run(run_level(url, sessions, rounds))
+        if server_pid:
+            stats['server_rss_mb'] = rss_mb(server_pid)
+            stats['server_rss_delta_mb'] = stats['server_rss_mb'] - baseline_rss
+        results.append(stats)
+        rss = f'  RSS {stats["server_rss_delta_mb"]:+.1f} MB' if server_pid else ''
+        print(f'{sessions:>4} sesi  {stats["reruns"]:>5} rerun  p50 {stats["p50_ms"]:>8.1f} ms  '
+              f'p95 {stats["p95_ms"]:>8.1f} ms  {stats["reruns_per_s"]:>6.2f} rerun/s{rss}')
+    return warmup, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Uji beban dashboard dengan banyak sesi bersamaan')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8], help='jumlah sesi bersamaan')
+    parser.add_argument('--rounds', type=int, default=2, help='putaran perpindahan semua tab per sesi')
+    parser.add_argument('--url', help='server yang sudah berjalan, misal ws://localhost:8501 (bawaan: jalankan sendiri)')
+    parser.add_argument('--port', type=int, default=8599, help='port server yang dijalankan uji beban')
+    parser.add_argument('--output', help='file JSON hasil (bawaan: .cache/loadtest/<waktu>.json)')
+    args = parser.parse_args()
+
+    server = None if args.url else start_server(args.port)
+    try:
+        url = args.url or f'ws://localhost:{args.port}'
+        warmup, results = run(url, args.sessions, args.rounds, server.pid if server else None)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    output = args.output or os.path.join(OUTPUT_DIR, f'{stamp}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'meta': {'timestamp': stamp, 'url': url, 'rounds': args.rounds, 'cpus': os.cpu_count()},
+                   'warmup': warmup, 'results': results}, f, indent=2)
+    print(f'\nHasil disimpan di {output}')
+
+
+if __name__ == '__main__':
+    main()
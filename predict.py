@@ -0,0 +1,68 @@
+# Prediksi PM2.5 batch dari model tersimpan, tanpa Streamlit
+#
+# Memuat model sekali (kunci/path dari ModelRegistry, bawaan: model terbaru),
+# membaca baris fitur dari CSV atau .npy, memprediksi per batch dan menulis
+# hasilnya. Latensi p50/p99 per batch dan throughput dicetak di akhir.
+#
+# Contoh:
+#   python predict.py --input fitur.csv --output prediksi.csv
+#   python predict.py --model <kunci> --input fitur.npy --batch-size 5000
+#   python predict.py --bench 100000
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics import inference
+
+# rata-rata kasar tiap variabel cuaca untuk baris sintetis mode --bench
+BENCH_MEANS = {'TEMP': 13.0, 'PRES': 1010.0, 'DEWP': 2.0, 'WSPM': 1.8, 'RAIN': 0.0}
+
+
+def read_features(path, features):
+    if path.endswith('.npy'):
+        return np.load(path)
+    return pd.read_csv(path, usecols=features)[features].to_numpy(dtype='float64')
+
+
+def batches(X, batch_size):
+    for start in range(0, len(X), batch_size):
+        yield X[start:start + batch_size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prediksi PM2.5 batch dari model tersimpan')
+    parser.add_argument('--model', help='kunci model atau path .joblib (bawaan: model terbaru)')
+    parser.add_argument('--features', nargs='+', help='nama fitur jika artefak tidak menyimpannya')
+    parser.add_argument('--input', help='CSV dengan kolom fitur atau file .npy (n x fitur)')
+    parser.add_argument('--output', help='CSV hasil prediksi (bawaan: stdout)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='jumlah baris per batch')
+    parser.add_argument('--bench', type=int, metavar='N', help='ukur latensi dengan N baris acak, tanpa input')
+    args = parser.parse_args()
+    if not args.input and not args.bench:
+        parser.error('berikan --input atau --bench')
+
+    try:
+        predictor = inference.Predictor.load(args.model or inference.latest_model(), args.features)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    if args.bench:
+        rng = np.random.default_rng(0)
+        means = [BENCH_MEANS.get(feature, 0.0) for feature in predictor.features]
+        X = rng.normal(means, 5.0, size=(args.bench, len(predictor.features)))
+    else:
+        X = read_features(args.input, predictor.features)
+
+    y = np.concatenate(list(predictor.predict_batches(batches(X, args.batch_size))))
+    if args.input:
+        hasil = pd.DataFrame(X, columns=predictor.features).assign(**{'PM2.5_pred': y})
+        hasil.to_csv(args.output or sys.stdout, index=False)
+    stats = predictor.stats()
+    print(json.dumps({'model_type': predictor.model_type, 'features': predictor.features, **stats}, indent=2),
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+# Generator laporan batch tanpa Streamlit
+#
+# Menjalankan analisis yang sama dengan dashboard (tabel polutan tahunan,
+# matriks korelasi, pola curah hujan bulanan, ringkasan OLS dan plot klaster)
+# untuk daftar pekerjaan (stasiun, periode) secara paralel di process pool.
+# Hasil ditulis ke <output>/<stasiun>/<periode>/. Data tiap stasiun dibaca
+# dan dibersihkan sekali di proses induk lalu diwarisi worker (fork); pekerjaan
+# yang kunci masukannya (isi partisi stasiun itu sampai akhir periode) tidak
+# berubah sejak run sebelumnya dilewati.
+#
+# Contoh:
+#   python report.py --periods all 2016 2017-01:2017-02
+#   python report.py --stations Aotizhongxin --workers 2 --force
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from analytics import aggregations, cleaning, clustering, correlation, regression, storage
+from analytics.cube import AggregateCube
+
+OUTPUT_DIR = os.path.join(storage.CACHE_DIR, 'reports')
+# naikkan jika isi/format laporan berubah agar semua pekerjaan dibuat ulang
+REPORT_VERSION = 1
+CORRELATION_COLUMNS = ['PM2.5', 'CO', 'SO2', 'O3', 'TEMP', 'PRES', 'WSPM']
+
+# data bersih per stasiun; diisi di proses induk sebelum pool dibuat
+_datasets = {}
+
+
+def parse_period(text):
+    # 'all', '2016', '2016-03' atau 'awal:akhir' (tanggal pandas) -> (label, awal, akhir)
+    if text == 'all':
+        return 'all', None, None
+    if ':' in text:
+        start, end = text.split(':', 1)
+        return text.replace(':', '_'), pd.Timestamp(start), _period_end(end)
+    return text, pd.Timestamp(text), _period_end(text)
+
+
+def _period_end(text):
+    # akhir periode inklusif: '2016' -> akhir 2016, '2016-03' -> akhir Maret 2016
+    return pd.Period(text).end_time
+
+
+def _dataset(manifest, station):
+    if station not in _datasets:
+        _datasets[station] = cleaning.clean_dataset(storage.load_partitions(manifest, [station]))
+    return _datasets[station]
+
+
+def job_key(station, period, fingerprint):
+    return hashlib.sha1(f'{station}|{period}|{fingerprint}|v{REPORT_VERSION}'.encode()).hexdigest()
+
+
+def period_fingerprint(manifest, station, period):
+    # hanya partisi stasiun itu sampai tahun akhir periode: forward fill membawa nilai dari
+    # tahun sebelumnya, tetapi baris yang lebih baru dari periode tidak memengaruhi laporannya
+    _, _, end = parse_period(period)
+    years = None if end is None else [year for year in manifest[station] if year <= end.year]
+    return storage.station_fingerprint(manifest, station, years)
+
+
+def _job_dir(output, station, label):
+    return os.path.join(output, station, label)
+
+
+def _is_current(job_dir, key):
+    try:
+        with open(os.path.join(job_dir, 'job.json')) as f:
+            return json.load(f)['key'] == key
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _save_figure(fig, path):
+    fig.savefig(path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
+
+
+def write_report(data, job_dir, key):
+    os.makedirs(job_dir, exist_ok=True)
+    data_cube = AggregateCube.from_frame(data)
+    data_clean = cleaning.numeric_view(data)
+    data_hourly = cleaning.hourly_view(data)
+
+    aggregations.yearly_means(data_cube).to_csv(os.path.join(job_dir, 'yearly.csv'))
+
+    corr = correlation.correlation_matrix(data_clean, CORRELATION_COLUMNS)
+    corr.to_csv(os.path.join(job_dir, 'correlation.csv'))
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(corr, cmap='Blues', annot=True, fmt='.2f', ax=ax)
+    ax.set_title('Matriks Korelasi')
+    _save_figure(fig, os.path.join(job_dir, 'correlation.png'))
+
+    rain = aggregations.monthly_pattern(data_cube, 'RAIN')
+    rain.to_csv(os.path.join(job_dir, 'rain_monthly.csv'))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=rain.index, y=rain.values, ax=ax)
+    ax.set_xlabel('Bulan')
+    ax.set_ylabel('Rata-rata Curah Hujan')
+    ax.set_title('Pola Musiman Curah Hujan')
+    _save_figure(fig, os.path.join(job_dir, 'rain_monthly.png'))
+
+    with open(os.path.join(job_dir, 'ols.txt'), 'w') as f:
+        f.write(regression.OLSStats(('TEMP',)).update(data_hourly).fit().summary())
+
+    labels = clustering.fit_clusters(data_hourly, key).labels
+    fig, ax = plt.subplots()
+    scatter = ax.scatter(data_hourly['TEMP'], data_hourly['PRES'], c=labels, cmap='viridis')
+    legend_elements = scatter.legend_elements()[0]
+    ax.legend(handles=legend_elements, labels=[f'Cluster {i}' for i in range(1, len(legend_elements) + 1)],
+              title='Clusters')
+    ax.set_xlabel('TEMP')
+    ax.set_ylabel('PRES')
+    ax.set_title('Hasil Clustering')
+    _save_figure(fig, os.path.join(job_dir, 'clusters.png'))
+
+    # job.json ditulis terakhir: keberadaannya menandakan laporan lengkap
+    with open(os.path.join(job_dir, 'job.json'), 'w') as f:
+        json.dump({'key': key, 'rows': len(data), 'start': str(data.index.min()),
+                   'end': str(data.index.max())}, f, indent=2)
+
+
+def run_job(manifest, station, period, job_dir, key):
+    start_time = time.perf_counter()
+    _, start, end = parse_period(period)
+    data = _dataset(manifest, station)
+    if start is not None:
+        data = data.loc[start:end]
+    if data.empty:
+        raise ValueError(f'Tidak ada data {station} untuk periode {period}')
+    write_report(data, job_dir, key)
+    return time.perf_counter() - start_time
+
+
+def plan_jobs(manifest, stations, periods, output, force=False):
+    # -> (pekerjaan yang perlu dijalankan, pekerjaan yang dilewati)
+    pending, skipped = [], []
+    for station in stations:
+        for period in periods:
+            label, _, _ = parse_period(period)
+            job_dir = _job_dir(output, station, label)
+            key = job_key(station, period, period_fingerprint(manifest, station, period))
+            job = (station, period, job_dir, key)
+            if not force and _is_current(job_dir, key):
+                skipped.append(job)
+            else:
+                pending.append(job)
+    return pending, skipped
+
+
+def run(stations=None, periods=('all',), output=OUTPUT_DIR, workers=None, force=False, manifest=None):
+    if manifest is None:
+        manifest, _ = storage.ensure_partitions(storage.DEFAULT_SOURCE)
+    stations = sorted(manifest) if not stations else list(stations)
+    pending, skipped = plan_jobs(manifest, stations, periods, output, force)
+    for station, period, _, _ in skipped:
+        print(f'lewati   {station} {period} (tidak berubah)')
+    if not pending:
+        return []
+
+    # baca dan bersihkan tiap stasiun sekali; worker hasil fork berbagi memori ini
+    for station in sorted({job[0] for job in pending}):
+        _dataset(manifest, station)
+
+    failures = []
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(run_job, manifest, *job): job for job in pending}
+        for future in as_completed(futures):
+            station, period, job_dir, _ = futures[future]
+            try:
+                elapsed = future.result()
+                print(f'selesai  {station} {period} -> {job_dir} ({elapsed:.1f} s)')
+            except Exception:
+                failures.append(futures[future])
+                print(f'gagal    {station} {period}\n{traceback.format_exc()}', file=sys.stderr)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Laporan batch kualitas udara per stasiun dan periode')
+    parser.add_argument('--stations', nargs='+', help='stasiun yang diproses (bawaan: semua)')
+    parser.add_argument('--periods', nargs='+', default=['all'],
+                        help="periode: 'all', tahun (2016), bulan (2016-03) atau 'awal:akhir'")
+    parser.add_argument('--output', default=OUTPUT_DIR, help='direktori hasil (bawaan: .cache/reports)')
+    parser.add_argument('--workers', type=int, help='jumlah proses worker (bawaan: jumlah CPU)')
+    parser.add_argument('--force', action='store_true', help='jalankan ulang meskipun masukan tidak berubah')
+    args = parser.parse_args()
+    for period in args.periods:
+        try:
+            parse_period(period)
+        except ValueError as exc:
+            parser.error(f'periode tidak valid: {period} ({exc})')
+    manifest, _ = storage.ensure_partitions(storage.DEFAULT_SOURCE)
+    missing = [station for station in args.stations or [] if station not in manifest]
+    if missing:
+        parser.error(f'stasiun tidak ada di penyimpanan: {", ".join(missing)} (tersedia: {", ".join(sorted(manifest))})')
+
+    failures = run(args.stations, args.periods, args.output, args.workers, args.force, manifest)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Data sintetis bertipe penyimpanan untuk pengujian jalur inkremental
+#
+# Dua stasiun dengan awal berbeda yang melintasi batas tahun, nilai kosong
+# acak dan satu celah panjang, sehingga forward fill, partisi (stasiun, tahun)
+# dan jendela yang tidak lengkap ikut teruji.
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import cleaning, storage
+
+HOURS = 3000
+
+
+def make_raw(stations=('A', 'B'), hours=HOURS, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, station in enumerate(stations):
+        index = pd.date_range('2016-12-20', periods=hours, freq='h') + pd.Timedelta(hours=37 * i)
+        frame = pd.DataFrame({'No': np.arange(1, hours + 1), 'year': index.year, 'month': index.month,
+                              'day': index.day, 'hour': index.hour})
+        for col in storage.POLLUTANTS:
+            frame[col] = rng.lognormal(4.0, 0.8, hours)
+        for col in storage.WEATHER:
+            frame[col] = rng.normal(10.0, 5.0, hours)
+        frame['WSPM'] = frame['WSPM'].abs() / 2
+        frame['wd'] = rng.choice(storage.WIND_DIRECTIONS, hours)
+        for col in storage.POLLUTANTS + storage.WEATHER + ['wd']:
+            frame.loc[rng.random(hours) < 0.05, col] = np.nan
+        # celah panjang: jendela rata-rata bergerak di sekitarnya tidak sah
+        frame.loc[500 + 200 * i:540 + 200 * i, storage.POLLUTANTS] = np.nan
+        frame['station'] = station
+        frames.append(frame)
+    return storage.type_rows(pd.concat(frames, ignore_index=True))
+
+
+def split_by_time(data, n=7, seed=1):
+    # potongan berurutan waktu dengan ukuran tidak sama; baris satu jam tidak pernah terbelah
+    data = data.sort_index(kind='stable')
+    hours = data.index.unique()
+    cuts = np.sort(np.random.default_rng(seed).choice(np.arange(1, len(hours)), n - 1, replace=False))
+    bounds = [hours[0]] + list(hours[cuts]) + [hours[-1] + pd.Timedelta(hours=1)]
+    return [data[(data.index >= lo) & (data.index < hi)] for lo, hi in zip(bounds, bounds[1:])]
+
+
+@pytest.fixture(scope='session')
+def raw():
+    return make_raw()
+
+
+@pytest.fixture(scope='session')
+def clean(raw):
+    return cleaning.clean_dataset(raw)
@@ -0,0 +1,18 @@
+import pandas as pd
+
+from analytics import cleaning
+from conftest import split_by_time
+
+
+def by_station(data):
+    return data.set_index('station', append=True).sort_index()
+
+
+def test_clean_append_matches_full_clean(raw):
+    # forward fill melintasi batas append memakai baris bersih terakhir tiap stasiun
+    chunks = split_by_time(raw)
+    parts = [cleaning.clean_dataset(chunks[0])]
+    for chunk in chunks[1:]:
+        last_rows = pd.concat(parts).groupby('station', observed=True).tail(1)
+        parts.append(cleaning.clean_append(last_rows, chunk))
+    pd.testing.assert_frame_equal(by_station(pd.concat(parts)), by_station(cleaning.clean_dataset(raw)))
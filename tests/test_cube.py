@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from analytics.cube import GRAINS, AggregateCube
+from conftest import split_by_time
+
+
+def test_append_matches_full_build(clean):
+    chunks = split_by_time(clean)
+    cube = AggregateCube.from_frame(chunks[0])
+    for chunk in chunks[1:]:
+        cube.append(chunk)
+    full = AggregateCube.from_frame(clean)
+    for grain in GRAINS:
+        pd.testing.assert_frame_equal(cube.tables[grain], full.tables[grain], check_exact=False, rtol=1e-6,
+                                      check_freq=False)
+
+
+def test_out_of_order_station_chunks(clean):
+    # potongan stasiun lain boleh dimulai lebih awal dari periode terakhir kubus
+    stations = [part for _, part in clean.groupby('station', observed=True)]
+    cube = AggregateCube.from_frame(stations[1])
+    cube.append(stations[0])
+    full = AggregateCube.from_frame(clean)
+    for grain in GRAINS:
+        assert cube.tables[grain].index.is_monotonic_increasing
+        pd.testing.assert_frame_equal(cube.tables[grain], full.tables[grain], check_exact=False, rtol=1e-6,
+                                      check_freq=False)
+
+
+def test_window_mean_matches_mask(clean):
+    cube = AggregateCube.from_frame(clean)
+    start, end = pd.Timestamp('2017-01-15 05:00'), pd.Timestamp('2017-02-02 17:00')
+    window = clean.loc[(clean.index >= start) & (clean.index <= end), 'PM2.5'].astype('float64')
+    expected = window.groupby(window.index).mean()
+    np.testing.assert_allclose(cube.window_mean('hour', start, end, 'PM2.5'), expected, rtol=1e-6)
@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import downsample
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_gaps_are_kept(method):
+    index = pd.date_range('2016-01-01', periods=10000, freq='h')
+    series = pd.Series(np.sin(np.arange(10000) / 50), index=index)
+    series.iloc[3000:3500] = np.nan
+    # celah lebih sempit dari satu titik keluaran tidak terlihat, jadi tidak dipertahankan
+    series.iloc[100] = np.nan
+    result = downsample.downsample(series, 500, method)
+    assert list(result.index[result.isna()]) == [index[3000]]
+    assert result.notna().sum() <= 500
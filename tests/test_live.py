@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import correlation, live, storage
+from analytics.cube import GRAINS
+from conftest import split_by_time
+
+
+def build(monkeypatch, raw):
+    monkeypatch.setattr(storage, 'load_partitions', lambda manifest, stations: raw)
+    return live.LiveDataset({}, ['A', 'B'], 'fp')
+
+
+@pytest.fixture
+def datasets(monkeypatch, raw):
+    # dataset yang menerima baris baru bertahap (termasuk append satu baris) dan dataset yang dibangun sekali
+    start = raw.index.min() + pd.Timedelta(hours=200)
+    initial, rest = raw[raw.index < start], raw[raw.index >= start]
+    chunks = split_by_time(rest)
+    chunks = [chunks[0].iloc[:1], chunks[0].iloc[1:]] + chunks[1:]
+
+    dataset = build(monkeypatch, initial)
+    for chunk in chunks:
+        # tampilan dan struktur diminta di antara append agar jalur pembaruan ikut teruji
+        for name in list(live.VIEWS) + list(live.STRUCTURES):
+            dataset.view(name)
+        dataset.view('correlation').matrix('pearson', 'month', 12)
+        dataset.view('correlation').matrix('spearman')
+        assert dataset.append(chunk) == len(chunk)
+    return dataset, build(monkeypatch, pd.concat([initial, *chunks]))
+
+
+def test_views_match_fresh_build(datasets):
+    dataset, fresh = datasets
+    pd.testing.assert_frame_equal(dataset.clean, fresh.clean)
+    for name in live.VIEWS:
+        pd.testing.assert_frame_equal(dataset.view(name), fresh.view(name))
+    for grain in GRAINS:
+        pd.testing.assert_frame_equal(dataset.cube.tables[grain], fresh.cube.tables[grain], check_exact=False,
+                                      rtol=1e-6, check_freq=False)
+
+
+def test_structures_match_fresh_build(datasets):
+    dataset, fresh = datasets
+    thresholds = np.arange(-5, 30)
+    for got, expected in zip(dataset.view('temperature').sweep(thresholds), fresh.view('temperature').sweep(thresholds)):
+        pd.testing.assert_frame_equal(got, expected, check_exact=False, rtol=1e-9)
+
+    engine, expected = dataset.view('correlation'), correlation.CorrelationEngine(fresh.clean)
+    for method in correlation.METHODS:
+        for by in correlation.GROUPINGS:
+            groups = [None] if by is None else correlation.group_keys(fresh.clean.index, by).unique()
+            for group in groups:
+                pd.testing.assert_frame_equal(engine.matrix(method, by, group), expected.matrix(method, by, group),
+                                              check_exact=False, rtol=1e-9, atol=1e-12)
+
+
+def test_projections_share_buffer(datasets):
+    # tampilan kolom tidak menyalin data frame bersih
+    dataset, _ = datasets
+    for name in live.VIEWS:
+        assert np.shares_memory(dataset.view(name)['PM2.5'].to_numpy(), dataset.clean['PM2.5'].to_numpy())
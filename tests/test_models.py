@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from analytics import models
+
+
+def xy(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 2))
+    return X, X @ [2.0, -1.0] + rng.normal(scale=0.1, size=rows)
+
+
+def test_failed_job_is_retried(tmp_path):
+    registry = models.ModelRegistry(str(tmp_path))
+    calls = []
+
+    def load_xy():
+        calls.append(None)
+        if len(calls) == 1:
+            raise MemoryError('sementara')
+        return xy()
+
+    _, job = registry.get_or_submit('k', load_xy, 'Linear Regression', 0.2)
+    with pytest.raises(MemoryError):
+        job.future.result()
+    # galat dikembalikan sekali, lalu pekerjaan dilepas
+    assert registry.submit('k', load_xy, 'Linear Regression', 0.2) is job
+    _, retry = registry.get_or_submit('k', load_xy, 'Linear Regression', 0.2)
+    assert retry is not job
+    retry.future.result()
+    artifact, _ = registry.get_or_submit('k', load_xy, 'Linear Regression', 0.2)
+    assert artifact['n_test'] == 40 and len(calls) == 2
+
+
+def test_save_leaves_no_temp_files(tmp_path):
+    registry = models.ModelRegistry(str(tmp_path))
+    X, y = xy()
+    registry._save('k', models.train_model(X, y, 'Linear Regression', 0.2), group='A', version='2017')
+    assert sorted(os.listdir(tmp_path)) == ['k.joblib', 'k.json']
@@ -0,0 +1,39 @@
+import numpy as np
+
+from analytics import regression
+from conftest import split_by_time
+
+
+def test_partition_stats_append_matches_full(clean):
+    chunks = split_by_time(clean)
+    stats = regression.partition_stats(chunks[0])
+    for chunk in chunks[1:]:
+        regression.merge_partition_stats(stats, regression.partition_stats(chunk))
+    full = regression.partition_stats(clean)
+    assert stats.keys() == full.keys()
+    for key, part in full.items():
+        np.testing.assert_allclose(stats[key].xtx, part.xtx, rtol=1e-9)
+        np.testing.assert_allclose(stats[key].xty, part.xty, rtol=1e-9)
+        assert stats[key].n == part.n
+
+
+def test_partition_stats_without_station(clean):
+    # tanpa kolom station: satu partisi per tahun dengan stasiun None
+    stats = regression.partition_stats(clean.drop(columns=['station']))
+    years = sorted(set(clean.index.year))
+    assert sorted(stats) == [(None, year) for year in years]
+    by_station = regression.partition_stats(clean)
+    for year in years:
+        expected = regression.combine(by_station, years=[year])
+        np.testing.assert_allclose(stats[(None, year)].xtx, expected.xtx, rtol=1e-9)
+        assert stats[(None, year)].n == expected.n
+
+
+def test_gram_fit_matches_least_squares(clean):
+    fit = regression.combine(regression.partition_stats(clean)).fit(['TEMP', 'DEWP'])
+    # baris yang dipakai: semua kandidat fitur dan target terisi
+    rows = clean[regression.FEATURES + [regression.TARGET]].astype('float64').dropna()
+    X = np.column_stack([np.ones(len(rows)), rows[['TEMP', 'DEWP']].to_numpy()])
+    beta, *_ = np.linalg.lstsq(X, rows[regression.TARGET].to_numpy(), rcond=None)
+    np.testing.assert_allclose(fit.params.to_numpy(), beta, rtol=1e-8)
+    assert fit.nobs == len(rows)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import rolling
+from conftest import split_by_time
+
+
+def pandas_rolling(clean, column):
+    hourly = clean[column].astype('float64').groupby(clean.index.floor('h')).mean().asfreq('h')
+    window = rolling.WINDOWS[column]
+    return hourly.rolling(window, min_periods=rolling.min_hours(window)).mean()
+
+
+@pytest.mark.parametrize('column', list(rolling.WINDOWS))
+def test_mean_and_daily_max_match_pandas(clean, column):
+    engine = rolling.RollingEngine().update(clean)
+    expected = pandas_rolling(clean, column)
+    np.testing.assert_allclose(engine.mean(column), expected, rtol=1e-9, equal_nan=True)
+    assert engine.mean(column).index.equals(expected.index)
+    daily = engine.daily_max(column)
+    np.testing.assert_allclose(daily, expected.resample('D').max().reindex(daily.index), rtol=1e-9, equal_nan=True)
+
+
+def test_staggered_appends_match_full_build(clean):
+    full = rolling.RollingEngine().update(clean)
+    engine = rolling.RollingEngine()
+    # stasiun B lebih dulu, lalu sisanya berurutan waktu: grid harus bisa bergeser ke awal
+    stations = dict(list(clean.groupby('station', observed=True)))
+    engine.update(stations['B'].iloc[1000:1500])
+    rest = pd.concat([stations['A'], stations['B'].iloc[:1000], stations['B'].iloc[1500:]])
+    for chunk in split_by_time(rest):
+        engine.update(chunk)
+        # deret yang sudah di-cache harus ikut diperbarui, bukan dihitung ulang dari awal
+        for column in rolling.WINDOWS:
+            engine.mean(column)
+            engine.daily_max(column)
+    for column in rolling.WINDOWS:
+        pd.testing.assert_series_equal(engine.mean(column), full.mean(column), rtol=1e-9)
+        pd.testing.assert_series_equal(engine.daily_max(column), full.daily_max(column), rtol=1e-9)
+        pd.testing.assert_series_equal(engine.hourly(column), full.hourly(column), rtol=1e-9)
+
+
+def test_episodes():
+    index = pd.date_range('2017-01-01', periods=10, freq='h')
+    series = pd.Series([80, 90, 70, np.nan, 100, 120, 110, 10, 76, 75], index=index, dtype='float64')
+    found = rolling.episodes(series, 75)
+    assert found['length'].tolist() == [2, 3, 1]
+    assert found['peak'].tolist() == [90, 120, 76]
+    assert found['start'].tolist() == [index[0], index[4], index[8]]
+    assert found['end'].tolist() == [index[1], index[6], index[8]]
+
+
+def test_summary_counts(clean):
+    engine = rolling.RollingEngine().update(clean)
+    threshold = rolling.STANDARDS['WHO 2021']['PM2.5']
+    summary = engine.summary('PM2.5', threshold)
+    means = pandas_rolling(clean, 'PM2.5')
+    assert summary['hours'] == (means > threshold).sum()
+    assert summary['days'] == (means.resample('D').max() > threshold).sum()
+    assert summary['categories'].sum() == means.notna().sum()
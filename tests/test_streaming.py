@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import clustering, regression, streaming, windrose
+from analytics.cube import AggregateCube
+from conftest import split_by_time
+
+
+def partition_order(raw):
+    # seperti streaming.iter_partitions: per tahun, lalu per stasiun
+    keys = [raw.index.year, raw['station'].astype(str)]
+    return [part for _, part in raw.groupby(keys, sort=True)]
+
+
+@pytest.fixture(scope='module', params=['time', 'partition'])
+def result(request, raw):
+    chunks = split_by_time(raw) if request.param == 'time' else partition_order(raw)
+    return streaming.stream_aggregate(iter(chunks))
+
+
+def test_cube_matches_in_memory(result, clean):
+    full = AggregateCube.from_frame(clean)
+    for grain in streaming.STREAM_GRAINS:
+        pd.testing.assert_frame_equal(result.cube.tables[grain], full.tables[grain], check_exact=False, rtol=1e-9,
+                                      check_freq=False)
+    assert result.rows == len(clean)
+
+
+def test_correlation_matches_in_memory(result, clean):
+    expected = clean[result.correlation.columns].astype('float64').corr()
+    np.testing.assert_allclose(result.correlation.matrix(), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_ols_and_wind_match_in_memory(result, clean):
+    expected = regression.OLSStats(('TEMP',)).update(clean)
+    np.testing.assert_allclose(result.ols.xtx, expected.xtx, rtol=1e-9)
+    np.testing.assert_allclose(result.ols.xty, expected.xty, rtol=1e-9)
+    np.testing.assert_array_equal(result.wind.hist, windrose.WindRose().update(clean).hist)
+
+
+def test_streaming_scaler_matches_in_memory(raw, clean):
+    from sklearn.preprocessing import StandardScaler
+
+    chunks = split_by_time(raw)
+    scaler, model = clustering.fit_clusters_streaming(lambda: streaming.forward_fill_chunks(iter(chunks)), k=3)
+    X = clean[list(clustering.FEATURES)].to_numpy(dtype='float64')
+    full = StandardScaler().fit(X[np.isfinite(X).all(axis=1)])
+    np.testing.assert_allclose(scaler.mean_, full.mean_, rtol=1e-9)
+    np.testing.assert_allclose(scaler.var_, full.var_, rtol=1e-9)
+    assert model.cluster_centers_.shape == (3, len(clustering.FEATURES))
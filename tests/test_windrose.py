@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from analytics import cleaning, windrose
+from conftest import make_raw, split_by_time
+
+
+def test_staggered_appends_match_full_build(clean):
+    full = windrose.WindRose().update(clean)
+    rose = windrose.WindRose()
+    for chunk in split_by_time(clean):
+        rose.update(chunk)
+    np.testing.assert_array_equal(rose.rows, full.rows)
+    np.testing.assert_array_equal(rose.count, full.count)
+    np.testing.assert_array_equal(rose.hist, full.hist)
+    np.testing.assert_allclose(rose.sum, full.sum, rtol=1e-12)
+
+
+def test_merge_matches_single_pass(clean):
+    chunks = split_by_time(clean, n=3)
+    merged = windrose.WindRose().update(chunks[0])
+    for chunk in chunks[1:]:
+        merged.merge(windrose.WindRose().update(chunk))
+    np.testing.assert_array_equal(merged.hist, windrose.WindRose().update(clean).hist)
+
+
+def test_mean_and_percentile_match_groupby():
+    # cukup banyak baris per sel agar median histogram bisa dibandingkan dengan median persis
+    clean = cleaning.clean_dataset(make_raw(hours=40000))
+    rose = windrose.WindRose().update(clean)
+    data = clean.dropna(subset=['wd', 'WSPM'])
+    speed = pd.cut(data['WSPM'], list(windrose.SPEED_EDGES) + [np.inf], right=False,
+                   labels=list(windrose.SPEED_LABELS))
+    grouped = data['PM2.5'].astype('float64').groupby([data['wd'], speed], observed=True)
+    mean = grouped.mean().unstack()
+    np.testing.assert_allclose(rose.mean('PM2.5').loc[mean.index, mean.columns], mean, rtol=1e-9, equal_nan=True)
+    # persentil dari histogram: galat sebatas lebar kelas (~2%)
+    median = grouped.median().unstack()
+    np.testing.assert_allclose(rose.percentile('PM2.5', 50).loc[median.index, median.columns], median,
+                               rtol=0.02, equal_nan=True)
+    assert rose.frequency().to_numpy().sum() == len(data)